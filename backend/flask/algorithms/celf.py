@@ -2,6 +2,7 @@ import sys
 import json
 import os
 import heapq
+import hashlib
 import logging
 import numpy as np
 import time
@@ -14,11 +15,18 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'm
 
 # importam modelele de difuzie
 try:
-    from propagation_models import OptimizedLinearThresholdModel, IndependentCascadeModel
+    from propagation_models import OptimizedLinearThresholdModel, IndependentCascadeModel, LiveEdgeCoins, nodes_activated_by
     print("[DEBUG] Successfully pre-imported propagation_models", file=sys.stderr)
 except ImportError as e:
     print(f"[DEBUG] Failed to pre-import propagation_models: {e}", file=sys.stderr)
 
+from time_budget import TimeBudget, FULL, FALLBACK, lowest_fidelity
+from checkpoint import (
+    checkpoint_path, save_checkpoint, load_checkpoint, remove_checkpoint,
+    capture_rng_state, restore_rng_state, CheckpointTimer
+)
+from rng_streams import resolve_seed, stream_generator, simulation_keys, keys_identity, STAGE_STREAM
+
 def setup_logging():
     log_dir = os.path.join(os.path.dirname(__file__), 'logs')
     os.makedirs(log_dir, exist_ok=True)
@@ -52,19 +60,43 @@ class CELFNode:
 
 mc_cache = {}
 
+# starea finala CELF pentru fiecare model, refolosita pentru alte valori ale lui k
+WARM_START_DIR = os.path.join(os.path.dirname(__file__), 'seed_cache')
+WARM_START_MAX_BYTES = int(os.environ.get("CELF_WARM_START_MAX_BYTES", 512 * 1024 * 1024))
+WARM_START_MAX_AGE = float(os.environ.get("CELF_WARM_START_MAX_AGE_DAYS", 7)) * 24 * 3600
+
+def trim_warm_start_dir():
+    """Stergem starile mai vechi decat WARM_START_MAX_AGE si, peste WARM_START_MAX_BYTES,
+    pe cele folosite cel mai demult (la citire le actualizam mtime-ul)"""
+    files = [
+        os.path.join(WARM_START_DIR, name)
+        for name in os.listdir(WARM_START_DIR)
+        if name.startswith('celf_') and name.endswith('_state.ckpt')
+    ]
+    files.sort(key=os.path.getmtime, reverse=True)
+    now = time.time()
+    used = 0
+    for path in files:
+        used += os.path.getsize(path)
+        if used > WARM_START_MAX_BYTES or now - os.path.getmtime(path) > WARM_START_MAX_AGE:
+            os.unlink(path)
+
 def monte_carlo_simulation(
     model,
     nodes: Set[Union[str, int]],
     seed_nodes: List[Union[str, int]],
     num_simulations: int = 10,
-    max_steps: int = 5
+    max_steps: int = 5,
+    keys=None
 ) -> float:
-    key = (frozenset(seed_nodes), num_simulations, max_steps)
+    key = (frozenset(seed_nodes), num_simulations, max_steps, keys_identity(keys))
     if key in mc_cache:
         return mc_cache[key]
 
     total_spread = 0
-    for _ in range(num_simulations):
+    for simulation in range(num_simulations):
+        # fiecare simulare are monedele ei, derivate din samanta rularii
+        coins = LiveEdgeCoins(keys[simulation]) if keys is not None else None
         activated = set(seed_nodes)
         current_frontier = set(seed_nodes)
 
@@ -72,7 +104,7 @@ def monte_carlo_simulation(
             if not current_frontier:
                 break
 
-            newly_activated = set(model.propagate(list(current_frontier))) - activated
+            newly_activated = set(model.propagate(list(current_frontier), rng=coins)) - activated
             if not newly_activated:
                 break
 
@@ -86,35 +118,81 @@ def monte_carlo_simulation(
     return avg_spread
 
 def batch_evaluate_nodes(args):
-    model, nodes, seed_set, candidates, num_simulations, max_steps = args
+    model, nodes, seed_set, candidates, num_simulations, max_steps, random_seed, common, batch_index = args
 
+    # cheile depind doar de samanta si de pozitia in lot, nu de starea mostenita prin fork
     results = []
-    baseline_key = (frozenset(seed_set), num_simulations, max_steps)
-    baseline_spread = mc_cache.get(baseline_key)
-    if baseline_spread is None:
-        baseline_spread = monte_carlo_simulation(model, nodes, seed_set, num_simulations, max_steps)
+    baseline_spread = monte_carlo_simulation(
+        model, nodes, seed_set, num_simulations, max_steps,
+        simulation_keys(random_seed, num_simulations, common, 0, batch_index, 0)
+    )
 
-    for node in candidates:
+    for position, node in enumerate(candidates):
         if node in seed_set:
             continue
         candidate_seeds = seed_set + [node]
-        spread = monte_carlo_simulation(model, nodes, candidate_seeds, num_simulations, max_steps)
+        spread = monte_carlo_simulation(
+            model, nodes, candidate_seeds, num_simulations, max_steps,
+            simulation_keys(random_seed, num_simulations, common, 0, batch_index, position + 1)
+        )
         marginal_gain = spread - baseline_spread
         results.append((node, marginal_gain))
 
     return results
 
+def batch_evaluate_indexed(indexed_args):
+    batch_index, args = indexed_args
+    return batch_index, batch_evaluate_nodes(args)
+
+# heap-ul CELF salvat compact, ca array-uri paralele
+def pack_queue(celf_queue):
+    return {
+        "node_ids": np.array([node.node_id for node in celf_queue]),
+        "marginal_gains": np.array([node.marginal_gain for node in celf_queue], dtype=np.float64),
+        "last_checked": np.array([node.last_checked for node in celf_queue], dtype=np.int32)
+    }
+
+def unpack_queue(packed):
+    celf_queue = []
+    for node_id, gain, last_checked in zip(
+        packed["node_ids"].tolist(), packed["marginal_gains"].tolist(), packed["last_checked"].tolist()
+    ):
+        celf_node = CELFNode(node_id, gain)
+        celf_node.last_checked = last_checked
+        celf_queue.append(celf_node)
+    heapq.heapify(celf_queue)
+    return celf_queue
+
+def fill_stages(stages, seed_set, cumulative_activated, k, fidelity):
+    # completam etapele ramase dupa oprirea anticipata
+    for fill_iter in range(len(stages), k):
+        stages.append({
+            "stage": fill_iter + 1,
+            "selected_nodes": seed_set.copy(),
+            "propagated_nodes": list(cumulative_activated),
+            "total_activated": len(cumulative_activated),
+            "marginal_gain": 0.0,
+            "evaluations": 0,
+            "fidelity": fidelity
+        })
+    return stages
+
 def celf(
     nodes: List[Union[str, int]],
     edges: List[Tuple[Union[str, int], Union[str, int]]],
     model,
-    params: Dict[str, Union[int, float]]
+    params: Dict[str, Union[int, float]],
+    candidates: List[Union[str, int]] = None
 ) -> List[Dict[str, Union[int, List[Union[str, int]], str]]]:
 
     start_time = time.time()
     logging.info("Starting optimized CELF algorithm")
 
-    k = max(1, min(params.get('seedSize', 10), len(nodes)))
+    # candidatii pentru seed set (implicit toate nodurile)
+    if candidates is None:
+        candidates = nodes
+
+    k = max(1, min(params.get('seedSize', 10), len(candidates)))
     max_steps = max(1, min(params.get('maxSteps', 5), 20))
     num_simulations = params.get('numSimulations', 50)
     num_processes = min(params.get('numProcesses', mp.cpu_count()), mp.cpu_count())
@@ -125,7 +203,11 @@ def celf(
     trend_window = 4  # ultimele N câștiguri marginale de analizat
     stagnation_threshold = len(nodes) * min_marginal_gain_fraction
 
-    logging.info(f"Parameters: k={k}, num_simulations={num_simulations}, max_steps={max_steps}, processes={num_processes}")
+    # numere aleatoare comune: toti candidatii sunt simulati pe aceleasi arce vii
+    random_seed = resolve_seed(params)
+    common_random_numbers = params.get('commonRandomNumbers', True)
+
+    logging.info(f"Parameters: k={k}, num_simulations={num_simulations}, max_steps={max_steps}, processes={num_processes}, seed={random_seed}")
 
     seed_set = []
     stages = []
@@ -133,26 +215,183 @@ def celf(
     celf_queue = []
     nodes_set = set(nodes)
 
-    batch_size = max(1, len(nodes) // (num_processes * 2))
-    node_batches = [nodes[i:i+batch_size] for i in range(0, len(nodes), batch_size)]
-
-    with mp.Pool(processes=num_processes) as pool:
-        batch_args = [(model, nodes_set, seed_set, batch, num_simulations, max_steps) for batch in node_batches]
-        batch_results = pool.map(batch_evaluate_nodes, batch_args)
+    # modul anytime: evaluarea initiala trebuie sa incapa in bugetul de timp
+    budget = TimeBudget(params.get('timeBudgetMs'), num_simulations, start_time)
+    initial_simulations = num_simulations
+    initial_fidelity = FULL
+    if budget.enabled:
+        probe_start = time.time()
+        monte_carlo_simulation(
+            model, nodes_set, [candidates[0]], 1, max_steps, simulation_keys(random_seed, 1, common_random_numbers, 0)
+        )
+        seconds_per_simulation = time.time() - probe_start
 
-    for batch_result in batch_results:
-        for node_id, gain in batch_result:
-            celf_node = CELFNode(node_id, gain)
-            heapq.heappush(celf_queue, celf_node)
+        initial_simulations, limit, initial_fidelity = budget.initial_pass_plan(
+            seconds_per_simulation, len(candidates), num_processes
+        )
+        if limit < len(candidates):
+            # pastram doar candidatii cu gradul cel mai mare
+            degrees = {}
+            for u, v in edges:
+                degrees[u] = degrees.get(u, 0) + 1
+                degrees[v] = degrees.get(v, 0) + 1
+            candidates = sorted(candidates, key=lambda n: degrees.get(n, 0), reverse=True)[:max(k, limit)]
+
+        logging.info(f"Time budget {budget.budget:.2f}s: initial pass with {initial_simulations} simulations over {len(candidates)} candidates ({initial_fidelity})")
+
+    # checkpoint-uri periodice, pentru reluarea rularilor lungi
+    candidates_digest = hashlib.md5(json.dumps(candidates, default=str).encode()).hexdigest()
+    checkpoint_file = None
+    if params.get('checkpoint', True):
+        checkpoint_file = checkpoint_path(
+            'celf', model, params, k, num_simulations, max_steps, candidates_digest, params.get('randomSeed')
+        )
+    timer = CheckpointTimer(checkpoint_file, params.get('checkpointInterval', 60))
+    resumed = load_checkpoint(checkpoint_file) if params.get('resume', True) else None
+
+    # warm start: o rulare precedenta pe acelasi model cu alt k
+    warm_file = None
+    model_id = getattr(model, '_model_id', None)
+    if params.get('warmStart', True) and model_id:
+        settings_digest = hashlib.md5(
+            json.dumps([num_simulations, max_steps, candidates_digest, params.get('randomSeed')]).encode()
+        ).hexdigest()[:16]
+        warm_file = os.path.join(WARM_START_DIR, f'celf_{model_id}_{settings_digest}_state.ckpt')
+    warm = load_checkpoint(warm_file) if warm_file and not resumed else None
+    if warm and warm.get("reached_fidelity") != FULL:
+        # stari salvate inainte sa retinem fidelitatea; nu stim daca alegerile au fost complete
+        warm = None
+    if warm:
+        os.utime(warm_file)
+
+    if warm and (len(warm["seed_set"]) >= k or warm["early_stop"]):
+        # k mai mic (sau oprire anticipata): raspundem direct prin feliere
+        stages = [dict(stage) for stage in warm["stages"][:k]]
+        seed_set = warm["seed_set"][:k]
+        if len(stages) < k:
+            fill_stages(stages, seed_set, warm["cumulative_activated"].tolist(), k, warm["initial_fidelity"])
+        if stages:
+            stages[0]["random_seed"] = warm.get("random_seed", random_seed)
+        logging.info(f"Answered k={k} from warm-start state with {len(warm['seed_set'])} seeds")
+        return stages
+    if warm:
+        logging.info(f"Warm-starting CELF from {len(warm['seed_set'])} previously selected seeds")
+        resumed = warm
+
+    # la reluare continuam cu aceeasi samanta, ca estimarile salvate sa ramana comparabile
+    if resumed:
+        random_seed = resumed.get("random_seed", random_seed)
+    stage_rng = stream_generator(random_seed, STAGE_STREAM)
 
     baseline_spread = 0
     total_nodes = len(nodes)
     early_stop = False
+    start_iteration = 0
+    # cea mai mica fidelitate a vreunei estimari din coada; doar starile complete sunt refolosite
+    reached_fidelity = initial_fidelity
+
+    if resumed and resumed["phase"] == "selection":
+        celf_queue = unpack_queue(resumed["queue"])
+        seed_set = resumed["seed_set"]
+        stages = resumed["stages"]
+        cumulative_activated = set(resumed["cumulative_activated"].tolist())
+        baseline_spread = resumed["baseline_spread"]
+        initial_fidelity = resumed["initial_fidelity"]
+        reached_fidelity = resumed.get("reached_fidelity", initial_fidelity)
+        start_iteration = resumed["iteration"]
+        # etapele urmatoare continua fluxul de trace-uri exact de unde a ramas
+        restore_rng_state(stage_rng, resumed["rng_state"])
+        logging.info(f"Resumed CELF from checkpoint at stage {start_iteration + 1} with {len(celf_queue)} queued nodes")
+    else:
+        # loturi mai mici cand salvam checkpoint-uri, ca progresul sa fie salvat des
+        # la fel cu buget de timp, ca termenul limita sa fie verificat des intre loturi
+        num_batches = max(num_processes * 2, 16) if timer.enabled or budget.enabled else num_processes * 2
+        batch_size = max(1, len(candidates) // num_batches)
+        node_batches = [candidates[i:i+batch_size] for i in range(0, len(candidates), batch_size)]
+        batch_args = [
+            (model, nodes_set, seed_set, batch, initial_simulations, max_steps, random_seed, common_random_numbers, i)
+            for i, batch in enumerate(node_batches)
+        ]
+
+        # impartirea pe loturi depinde de numProcesses si de buget, iar cheile simularilor depind de
+        # indicele lotului; un checkpoint cu alta impartire nu se potriveste cu loturile de acum
+        layout = [batch_size, len(node_batches), initial_simulations]
+
+        # loturile deja evaluate inainte de o intrerupere nu se mai simuleaza
+        batch_results = {}
+        if resumed and resumed["phase"] == "initial":
+            if resumed.get("layout") == layout:
+                batch_results = resumed["batch_results"]
+                logging.info(f"Resumed CELF initial pass with {len(batch_results)}/{len(batch_args)} batches done")
+            else:
+                logging.info(f"Ignoring CELF checkpoint with batch layout {resumed.get('layout')}, current layout is {layout}")
+        pending = [(i, args) for i, args in enumerate(batch_args) if i not in batch_results]
+
+        def record(indexed_results):
+            for batch_index, batch_result in indexed_results:
+                batch_results[batch_index] = batch_result
+                if timer.due():
+                    timer.save({
+                        "phase": "initial",
+                        "layout": layout,
+                        "batch_results": batch_results,
+                        "random_seed": random_seed
+                    })
+                # planul vine dintr-o singura simulare de proba; daca loturile sunt mai scumpe decat
+                # s-a estimat, ne oprim la jumatatea bugetului si pastram candidatii evaluati pana aici
+                if budget.fidelity() != FULL:
+                    return
+
+        # fara pool cand rulam intr-un singur proces (ex: in worker-ii altui pool)
+        if num_processes > 1:
+            with mp.Pool(processes=num_processes) as pool:
+                record(pool.imap_unordered(batch_evaluate_indexed, pending))
+        else:
+            record(map(batch_evaluate_indexed, pending))
+
+        for batch_index in sorted(batch_results):
+            for node_id, gain in batch_results[batch_index]:
+                celf_node = CELFNode(node_id, gain)
+                heapq.heappush(celf_queue, celf_node)
+
+        if len(batch_results) < len(batch_args):
+            # candidatii neevaluati raman in coada, la coada ei, ca sa avem oricum k seed-uri;
+            # last_checked = -1 ii face sa fie evaluati daca ajung in varf si mai e timp
+            cutoff_fidelity = budget.fidelity()
+            initial_fidelity = lowest_fidelity(initial_fidelity, cutoff_fidelity)
+            reached_fidelity = lowest_fidelity(reached_fidelity, cutoff_fidelity)
+            for batch_index, batch in enumerate(node_batches):
+                if batch_index not in batch_results:
+                    for node_id in batch:
+                        celf_node = CELFNode(node_id)
+                        celf_node.last_checked = -1
+                        heapq.heappush(celf_queue, celf_node)
+            logging.info(f"Initial pass stopped at the time budget after {len(batch_results)}/{len(batch_args)} batches ({cutoff_fidelity})")
+
+    def selection_state(next_iteration):
+        return {
+            "phase": "selection",
+            "queue": pack_queue(celf_queue),
+            "seed_set": seed_set,
+            "stages": stages,
+            "cumulative_activated": np.array(list(cumulative_activated)),
+            "baseline_spread": baseline_spread,
+            "initial_fidelity": initial_fidelity,
+            "reached_fidelity": reached_fidelity,
+            "iteration": next_iteration,
+            "random_seed": random_seed,
+            "rng_state": capture_rng_state(stage_rng)
+        }
+
+    # evaluarea initiala e partea cea mai scumpa, o salvam imediat
+    if not resumed or resumed["phase"] == "initial":
+        timer.save(selection_state(0))
 
-    for iteration in range(k):
+    for iteration in range(start_iteration, k):
         recent_gains = []
         evaluation_count = 0
         best_node = None
+        stage_fidelity = initial_fidelity if iteration == 0 else FULL
 
         while celf_queue:
             evaluation_count += 1
@@ -165,8 +404,20 @@ def celf(
                 best_node = current_node
                 break
 
+            fidelity = budget.fidelity()
+            stage_fidelity = lowest_fidelity(stage_fidelity, fidelity)
+            reached_fidelity = lowest_fidelity(reached_fidelity, fidelity)
+            if fidelity == FALLBACK:
+                # termenul a expirat: alegem varful cozii dupa ultimul castig cunoscut
+                best_node = current_node
+                break
+
             candidate_seeds = seed_set + [current_node.node_id]
-            candidate_spread = monte_carlo_simulation(model, nodes_set, candidate_seeds, num_simulations, max_steps)
+            simulations = budget.simulations(fidelity)
+            candidate_spread = monte_carlo_simulation(
+                model, nodes_set, candidate_seeds, simulations, max_steps,
+                simulation_keys(random_seed, simulations, common_random_numbers, iteration + 1, evaluation_count)
+            )
 
             current_node.marginal_gain = candidate_spread - baseline_spread
             current_node.last_checked = iteration
@@ -181,12 +432,7 @@ def celf(
 
         seed_set.append(best_node.node_id)
 
-        activated = set(seed_set)
-        for _ in range(max_steps):
-            newly_activated = set(model.propagate(list(activated))) - activated
-            if not newly_activated:
-                break
-            activated.update(newly_activated)
+        activated = set(nodes_activated_by(model, model.trace(seed_set, max_steps, rng=stage_rng), max_steps))
 
         previous_total = len(cumulative_activated)
         cumulative_activated.update(activated)
@@ -199,14 +445,17 @@ def celf(
         if len(recent_gains) > trend_window:
                 recent_gains.pop(0)
 
+        # in modul anytime garantam k seed-uri, fara oprire anticipata
+        allow_early_stop = not budget.enabled
+
         # Condiție 1: acoperire satisfăcătoare
-        if new_total / total_nodes >= coverage_threshold:
+        if allow_early_stop and new_total / total_nodes >= coverage_threshold:
             logging.info(f"Stopping early: reached {new_total}/{total_nodes} ({(new_total / total_nodes) * 100:.2f}%) coverage")
             early_stop = True
             break
 
         # Condiție 2: stagnare în câștig marginal după perioada de "grace"
-        if iteration + 1 >= grace_period and all(g < stagnation_threshold for g in recent_gains):
+        if allow_early_stop and iteration + 1 >= grace_period and all(g < stagnation_threshold for g in recent_gains):
             logging.info(f"Stopping early: marginal gain stagnant over last {trend_window} stages")
             early_stop = True
             break
@@ -218,7 +467,8 @@ def celf(
             "propagated_nodes": list(cumulative_activated),
             "total_activated": new_total,
             "marginal_gain": best_node.marginal_gain,
-            "evaluations": evaluation_count
+            "evaluations": evaluation_count,
+            "fidelity": stage_fidelity
         }
         stages.append(stage_data)
 
@@ -229,18 +479,30 @@ def celf(
             f"Evaluations: {evaluation_count}/{len(nodes)}"
         )
 
+        if timer.due():
+            timer.save(selection_state(iteration + 1))
+
+
+    # salvam starea pentru cereri viitoare cu alt k pe acelasi model, doar daca toate estimarile
+    # au avut fidelitate completa; alegerile degradate de bugetul de timp nu se refolosesc
+    if warm_file and reached_fidelity == FULL:
+        warm_state = selection_state(len(seed_set))
+        warm_state["early_stop"] = early_stop
+        try:
+            save_checkpoint(warm_file, warm_state)
+            trim_warm_start_dir()
+        except Exception as e:
+            logging.warning(f"Failed to save warm-start state: {str(e)}")
+    elif warm_file:
+        logging.info(f"Not saving warm-start state: estimates reached {reached_fidelity} fidelity")
 
     if early_stop:
-        for fill_iter in range(iteration + 1, k):
-            stage_data = {
-                "stage": fill_iter + 1,
-                "selected_nodes": seed_set.copy(),
-                "propagated_nodes": list(cumulative_activated),
-                "total_activated": len(cumulative_activated),
-                "marginal_gain": 0.0,
-                "evaluations": 0
-            }
-            stages.append(stage_data)
+        fill_stages(stages, seed_set, cumulative_activated, k, stage_fidelity)
+
+    if stages:
+        stages[0]["random_seed"] = random_seed
+
+    remove_checkpoint(checkpoint_file)
 
     runtime = time.time() - start_time
     logging.info(f"CELF completed in {runtime:.2f} seconds")
@@ -1,6 +1,7 @@
 import sys
 import json
 import os
+import hashlib
 from typing import List, Dict, Set, Tuple, Union
 from collections import defaultdict, deque
 import dill
@@ -9,11 +10,15 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'm
 
 # importam modelele de difuzie
 try:
-    from propagation_models import OptimizedLinearThresholdModel, IndependentCascadeModel
+    from propagation_models import OptimizedLinearThresholdModel, IndependentCascadeModel, nodes_activated_by
     print("[DEBUG] Successfully pre-imported propagation_models", file=sys.stderr)
 except ImportError as e:
     print(f"[DEBUG] Failed to pre-import propagation_models: {e}", file=sys.stderr)
 
+from rng_streams import resolve_seed, stream_generator, STAGE_STREAM
+
+# scorurile depind doar de graf, deci le refolosesc toate rularile pe aceeasi retea
+CENTRALITY_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'seed_cache')
 
 def calculate_betweenness_centrality(
     nodes: List[Union[str, int]],
@@ -65,6 +70,36 @@ def calculate_betweenness_centrality(
     
     return betweenness
 
+def cached_betweenness_centrality(
+    nodes: List[Union[str, int]],
+    edges: List[Tuple[Union[str, int], Union[str, int]]],
+    use_cache: bool = True
+) -> Dict[Union[str, int], float]:
+    if not use_cache:
+        return calculate_betweenness_centrality(nodes, edges)
+
+    digest = hashlib.md5(json.dumps([nodes, edges]).encode()).hexdigest()
+    cache_file = os.path.join(CENTRALITY_CACHE_DIR, f'centrality_{digest}.json')
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'r') as f:
+                scores = json.load(f)
+            if len(scores) == len(nodes):
+                return dict(zip(nodes, scores))
+        except Exception as e:
+            print(f"[DEBUG] Failed to load centrality cache {cache_file}: {e}", file=sys.stderr)
+
+    betweenness = calculate_betweenness_centrality(nodes, edges)
+    try:
+        os.makedirs(CENTRALITY_CACHE_DIR, exist_ok=True)
+        tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump([betweenness[node] for node in nodes], f)
+        os.replace(tmp_file, cache_file)
+    except Exception as e:
+        print(f"[DEBUG] Failed to save centrality cache: {e}", file=sys.stderr)
+    return betweenness
+
 def centrality_heuristic_algorithm(
     nodes: List[Union[str, int]],
     edges: List[Tuple[Union[str, int], Union[str, int]]],
@@ -76,30 +111,31 @@ def centrality_heuristic_algorithm(
     k = max(1, min(params.get('seedSize', 10), len(nodes)))
     max_steps = max(1, min(params.get('maxSteps', 5), 20))
 
-    betweenness = calculate_betweenness_centrality(nodes, edges)
+    betweenness = cached_betweenness_centrality(nodes, edges, params.get('centralityCache', True))
     
-    sorted_nodes = sorted(betweenness.keys(), key=lambda x: betweenness[x], reverse=True)
+    # egalitatile se rup dupa pozitia in nodes, la fel cu sau fara cache
+    position = {node: i for i, node in enumerate(nodes)}
+    sorted_nodes = sorted(nodes, key=lambda node: (-betweenness[node], position[node]))
     seed_nodes = sorted_nodes[:k]
+    random_seed = resolve_seed(params)
 
     stages = [{
         "stage": 1,
         "selected_nodes": seed_nodes,
         "propagated_nodes": seed_nodes,
         "total_activated": len(seed_nodes),
-        "centrality_scores": {n: betweenness[n] for n in seed_nodes}
+        "centrality_scores": {n: betweenness[n] for n in seed_nodes},
+        "random_seed": random_seed
     }]
 
-    A = set(seed_nodes)
+    activation_steps = model.trace(seed_nodes, max_steps - 1, rng=stream_generator(random_seed, STAGE_STREAM))
     for step in range(2, max_steps + 1):
-        try:
-            A = set(model.propagate(A))
-            stages.append({
-                "stage": step,
-                "propagated_nodes": list(A),
-                "total_activated": len(A)
-            })
-        except Exception as e:
-            break
+        A = nodes_activated_by(model, activation_steps, step - 1)
+        stages.append({
+            "stage": step,
+            "propagated_nodes": A,
+            "total_activated": len(A)
+        })
 
     return stages
 
@@ -0,0 +1,87 @@
+import os
+import json
+import time
+import zlib
+import pickle
+import hashlib
+import logging
+import tempfile
+
+CHECKPOINT_DIR = os.path.join(os.path.dirname(__file__), 'checkpoints')
+# v2: rng_state e starea fluxului de etape, nu a generatoarelor globale
+CHECKPOINT_VERSION = 2
+
+def checkpoint_path(algorithm, model, params, *fields):
+    """Fisierul de checkpoint pentru o rulare, identificata prin model si parametrii relevanti"""
+    base = params.get('cacheKey') or getattr(model, '_model_id', None) or 'default'
+    digest = hashlib.md5(json.dumps([base, *fields], default=str).encode()).hexdigest()[:16]
+    return os.path.join(CHECKPOINT_DIR, f'{algorithm}_{digest}.ckpt')
+
+def save_checkpoint(path, state):
+    """Scriere atomica: pickle comprimat intr-un fisier temporar, apoi os.replace"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    payload = zlib.compress(
+        pickle.dumps({"version": CHECKPOINT_VERSION, "state": state}, protocol=pickle.HIGHEST_PROTOCOL),
+        6
+    )
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def load_checkpoint(path):
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            data = pickle.loads(zlib.decompress(f.read()))
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable checkpoint {path}: {str(e)}")
+        return None
+    if data.get("version") != CHECKPOINT_VERSION:
+        return None
+    return data["state"]
+
+def remove_checkpoint(path):
+    if path and os.path.exists(path):
+        os.unlink(path)
+
+def capture_rng_state(rng):
+    """Starea unui Generator (ex: fluxul STAGE_STREAM), ca reluarea sa continue aceleasi trageri"""
+    return rng.bit_generator.state
+
+def restore_rng_state(rng, rng_state):
+    rng.bit_generator.state = rng_state
+
+class CheckpointTimer:
+    """Decide cand scriem un nou checkpoint (la fiecare `interval` secunde)"""
+
+    def __init__(self, path, interval):
+        self.path = path
+        self.interval = interval
+        self.last_save = time.time()
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def due(self):
+        return self.enabled and time.time() - self.last_save >= self.interval
+
+    def save(self, state):
+        if not self.enabled:
+            return
+        try:
+            save_checkpoint(self.path, state)
+            self.last_save = time.time()
+        except Exception as e:
+            logging.warning(f"Failed to write checkpoint {self.path}: {str(e)}")
@@ -1,6 +1,7 @@
 import sys
 import json
 import os
+import time
 import logging
 import numpy as np
 import multiprocessing as mp
@@ -10,10 +11,17 @@ import dill
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models')))
 
 try:
-    from propagation_models import OptimizedLinearThresholdModel, IndependentCascadeModel
+    from propagation_models import OptimizedLinearThresholdModel, IndependentCascadeModel, LiveEdgeCoins, nodes_activated_by
 except ImportError as e:
     print(f"[DEBUG] Failed to import propagation_models: {e}", file=sys.stderr)
 
+from time_budget import TimeBudget, FULL, FALLBACK
+from checkpoint import (
+    checkpoint_path, load_checkpoint, remove_checkpoint,
+    capture_rng_state, restore_rng_state, CheckpointTimer
+)
+from rng_streams import resolve_seed, stream_generator, simulation_keys, keys_identity, STAGE_STREAM, SAMPLING_STREAM
+
 def setup_logging():
     log_dir = os.path.join(os.path.dirname(__file__), 'logs')
     os.makedirs(log_dir, exist_ok=True)
@@ -25,14 +33,14 @@ def setup_logging():
     )
     return log_file
 
-def run_single_simulation(model, seed_nodes):
+def run_single_simulation(model, seed_nodes, coins=None):
     current_seed = seed_nodes.copy()
     activated = set(current_seed)
     newly_activated = set(current_seed)
 
     while newly_activated:
         current_seed = list(newly_activated)
-        newly_activated = set(model.propagate(current_seed)) - activated
+        newly_activated = set(model.propagate(current_seed, rng=coins)) - activated
         activated.update(newly_activated)
 
     return len(activated)
@@ -44,32 +52,38 @@ def monte_carlo_simulation(
     model,
     nodes: Set[Union[str, int]],
     seed_nodes: List[Union[str, int]],
-    num_simulations: int = 10
+    num_simulations: int = 10,
+    keys=None
 ) -> float:
-    cache_key = (tuple(sorted(seed_nodes)), num_simulations)
+    cache_key = (tuple(sorted(seed_nodes)), num_simulations, keys_identity(keys))
     if cache_key in monte_carlo_cache:
         return monte_carlo_cache[cache_key]
 
-    spreads = [run_single_simulation(model, seed_nodes) for _ in range(num_simulations)]
+    spreads = [
+        run_single_simulation(model, seed_nodes, LiveEdgeCoins(keys[i]) if keys is not None else None)
+        for i in range(num_simulations)
+    ]
     result = np.mean(spreads)
     monte_carlo_cache[cache_key] = result
     return result
 
 # evaluam nodurile in batch-uri pt eficienta
 def batch_evaluate_nodes(args):
-    model, nodes, seed_set, candidate_nodes, num_simulations = args
+    model, nodes, seed_set, candidate_nodes, num_simulations, random_seed, common, stream = args
     results = []
-    for node in candidate_nodes:
+    for position, node in enumerate(candidate_nodes):
         candidate_seeds = seed_set + [node]
-        influence = monte_carlo_simulation(model, set(nodes), candidate_seeds, num_simulations)
+        keys = simulation_keys(random_seed, num_simulations, common, *stream, position)
+        influence = monte_carlo_simulation(model, set(nodes), candidate_seeds, num_simulations, keys)
         results.append((node, influence))
     return results
 
 # validam nodul ales dintr-un seed set precedent prin simulari
 def evaluate_previous_node(args):
-    model, nodes, partial_seed_set, node, num_simulations = args
+    model, nodes, partial_seed_set, node, num_simulations, random_seed, common, stream = args
     candidate_seeds = partial_seed_set + [node]
-    influence = monte_carlo_simulation(model, set(nodes), candidate_seeds, num_simulations)
+    keys = simulation_keys(random_seed, num_simulations, common, *stream)
+    influence = monte_carlo_simulation(model, set(nodes), candidate_seeds, num_simulations, keys)
     return (node, influence)
 
 # var globala pentru a pastra seed set-uri anterioare
@@ -97,17 +111,62 @@ def greedy_influence_maximization(
     grace_period = 3  # număr minim de etape înainte de a permite oprirea
     trend_window = 3  # ultimele N câștiguri marginale de analizat
     stagnation_threshold = len(nodes) * min_marginal_gain_fraction
-    logging.info(f"Beginning seed selection for {len(nodes)} nodes, target {k} seeds")
+
+    # numere aleatoare comune: toti candidatii sunt simulati pe aceleasi arce vii
+    random_seed = resolve_seed(params)
+    common_random_numbers = params.get('commonRandomNumbers', True)
+    logging.info(f"Beginning seed selection for {len(nodes)} nodes, target {k} seeds (seed={random_seed})")
     logging.info(f"Using {num_processes} processes for node evaluation")
+
+    # modul anytime: fidelitatea estimarilor scade pe masura ce se apropie termenul limita
+    budget = TimeBudget(params.get('timeBudgetMs'), num_simulations)
+    known_influence = {}
+    node_degrees = {}
+    for u, v in edges:
+        node_degrees[u] = node_degrees.get(u, 0) + 1
+        node_degrees[v] = node_degrees.get(v, 0) + 1
+    seconds_per_simulation = None
+    if budget.enabled and nodes:
+        # costul unei simulari, ca sa putem planifica prima etapa
+        probe_start = time.time()
+        run_single_simulation(
+            model, [nodes[0]], LiveEdgeCoins(simulation_keys(random_seed, 1, common_random_numbers, 0)[0])
+        )
+        seconds_per_simulation = time.time() - probe_start
     
     # verificare daca exista seed set-uri anterioare pt simularea curenta
     seed_set = []
     start_stage = 0
     cumulative_activated = set()
     stages = []
+
+    # checkpoint-uri periodice, pentru reluarea rularilor lungi
+    checkpoint_file = None
+    if params.get('checkpoint', True):
+        checkpoint_file = checkpoint_path(
+            'greedy', model, params, run_id, k, num_simulations, max_steps, params.get('randomSeed')
+        )
+    timer = CheckpointTimer(checkpoint_file, params.get('checkpointInterval', 60))
+    resumed = load_checkpoint(checkpoint_file) if params.get('resume', True) else None
+
+    if resumed:
+        # reluam exact de la ultima etapa salvata, fara validari suplimentare
+        seed_set = resumed["seed_set"]
+        stages = resumed["stages"]
+        cumulative_activated = set(resumed["cumulative_activated"].tolist())
+        recent_gains = resumed["recent_gains"]
+        known_influence = resumed["known_influence"]
+        random_seed = resumed.get("random_seed", random_seed)
+        start_stage = len(stages)
+        logging.info(f"Resumed greedy run from checkpoint at stage {start_stage + 1}")
     
+    stage_rng = stream_generator(random_seed, STAGE_STREAM)
+    if resumed:
+        # etapele urmatoare continua fluxul de trace-uri exact de unde a ramas
+        restore_rng_state(stage_rng, resumed["rng_state"])
+
     # folosim rezultatele precedente doar in urma validarilor
-    if run_id in previous_seed_sets:
+    if not resumed and run_id in previous_seed_sets:
         prev_stages = previous_seed_sets[run_id]
         logging.info(f"Found previous seed sets for run {run_id} with {len(prev_stages)} stages")
         
@@ -118,13 +177,30 @@ def greedy_influence_maximization(
                     
                 prev_seed = prev_stages[stage]['selected_nodes'][-1]
                 partial_seed_set = seed_set.copy()
+
+                # fara timp pentru validare, refolosim direct selectia precedenta
+                fidelity = budget.fidelity()
+                if fidelity != FULL:
+                    seed_set.append(prev_seed)
+                    activated = set(nodes_activated_by(model, model.trace(seed_set, max_steps, rng=stage_rng), max_steps))
+                    cumulative_activated = activated
+                    stages.append({
+                        "stage": stage + 1,
+                        "selected_nodes": seed_set.copy(),
+                        "propagated_nodes": list(cumulative_activated),
+                        "total_activated": len(cumulative_activated),
+                        "marginal_gain": prev_stages[stage]['marginal_gain'],
+                        "fidelity": fidelity
+                    })
+                    logging.info(f"Reused previous node {prev_seed} for stage {stage+1} without validation ({fidelity})")
+                    continue
                 
                 logging.info(f"Validating stage {stage+1}: Evaluating previous node {prev_seed}")
                 
                 # selectam noduri pentru a compara cu selectia precedenta
                 remaining_nodes = set(nodes) - set(partial_seed_set + [prev_seed])
                 validation_set = list(remaining_nodes)
-                np.random.shuffle(validation_set)
+                stream_generator(random_seed, SAMPLING_STREAM, stage).shuffle(validation_set)
                 validation_set = validation_set[:validation_candidates]
                 
                 # adaugam selectia in setul de validare
@@ -132,8 +208,9 @@ def greedy_influence_maximization(
                 
                 # evaluam candidatii
                 args_list = [
-                    (model, nodes, partial_seed_set, node, validation_simulations)
-                    for node in validation_set
+                    (model, nodes, partial_seed_set, node, validation_simulations,
+                     random_seed, common_random_numbers, (stage + 1, 0, position))
+                    for position, node in enumerate(validation_set)
                 ]
                 
                 validation_results = pool.map(evaluate_previous_node, args_list)
@@ -161,12 +238,7 @@ def greedy_influence_maximization(
                 seed_set.append(best_node)
                 
                 # calculam nodurile activate de nodul selectat
-                activated = set(seed_set)
-                for _ in range(max_steps):
-                    newly_activated = set(model.propagate(list(activated))) - activated
-                    if not newly_activated:
-                        break
-                    activated.update(newly_activated)
+                activated = set(nodes_activated_by(model, model.trace(seed_set, max_steps, rng=stage_rng), max_steps))
                 
                 cumulative_activated = activated
                 
@@ -176,7 +248,8 @@ def greedy_influence_maximization(
                     "selected_nodes": seed_set.copy(),
                     "propagated_nodes": list(cumulative_activated),
                     "total_activated": len(cumulative_activated),
-                    "marginal_gain": best_influence
+                    "marginal_gain": best_influence,
+                    "fidelity": FULL
                 }
                 stages.append(stage_data)
                 
@@ -195,28 +268,51 @@ def greedy_influence_maximization(
     with mp.Pool(processes=num_processes) as pool:
             for stage in range(start_stage, k):
                 logging.info(f"Starting stage {stage+1}/{k}")
-                node_batches = create_node_batches(remaining_nodes, num_processes * 2)
-
-                args_list = [
-                    (model, nodes, seed_set, batch, num_simulations)
-                    for batch in node_batches
-                ]
-
-                batch_results = pool.map(batch_evaluate_nodes, args_list)
-                all_results = [item for batch in batch_results for item in batch]
-                if not all_results:
+                if not remaining_nodes:
                     break
 
-                max_node, max_influence = max(all_results, key=lambda x: x[1])
+                fidelity = budget.affordable_fidelity(
+                    budget.fidelity(), seconds_per_simulation, len(remaining_nodes), k, k - stage, num_processes
+                )
+
+                if fidelity == FULL:
+                    stage_candidates = remaining_nodes
+                else:
+                    # candidatii cei mai promitatori dupa ultima estimare (sau dupa grad)
+                    ranked = sorted(
+                        remaining_nodes,
+                        key=lambda n: (known_influence.get(n, -1), node_degrees.get(n, 0)),
+                        reverse=True
+                    )
+                    stage_candidates = ranked[:budget.candidate_limit(len(ranked), k, fidelity)]
+
+                if fidelity == FALLBACK:
+                    # termenul a expirat: fara simulari noi
+                    max_node = ranked[0]
+                    max_influence = known_influence.get(max_node, 0)
+                else:
+                    stage_simulations = budget.simulations(fidelity)
+                    node_batches = create_node_batches(stage_candidates, num_processes * 2)
+
+                    args_list = [
+                        (model, nodes, seed_set, batch, stage_simulations,
+                         random_seed, common_random_numbers, (stage + 1, batch_index + 1))
+                        for batch_index, batch in enumerate(node_batches)
+                    ]
+
+                    evaluation_start = time.time()
+                    batch_results = pool.map(batch_evaluate_nodes, args_list)
+                    all_results = [item for batch in batch_results for item in batch]
+                    if not all_results:
+                        break
+                    seconds_per_simulation = (time.time() - evaluation_start) * num_processes / (len(all_results) * stage_simulations)
+                    known_influence.update(all_results)
+
+                    max_node, max_influence = max(all_results, key=lambda x: x[1])
                 seed_set.append(max_node)
                 remaining_nodes.remove(max_node)
 
-                activated = set(seed_set)
-                for _ in range(max_steps):
-                    newly_activated = set(model.propagate(list(activated))) - activated
-                    if not newly_activated:
-                        break
-                    activated.update(newly_activated)
+                activated = set(nodes_activated_by(model, model.trace(seed_set, max_steps, rng=stage_rng), max_steps))
 
                 prev_total = len(cumulative_activated)
                 cumulative_activated.update(activated)
@@ -228,7 +324,8 @@ def greedy_influence_maximization(
                     "selected_nodes": seed_set.copy(),
                     "propagated_nodes": list(cumulative_activated),
                     "total_activated": total_activated,
-                    "marginal_gain": marginal_gain
+                    "marginal_gain": marginal_gain,
+                    "fidelity": fidelity
                 }
                 stages.append(stage_data)
 
@@ -239,6 +336,21 @@ def greedy_influence_maximization(
                 if len(recent_gains) > trend_window:
                     recent_gains.pop(0)
 
+                if timer.due():
+                    timer.save({
+                        "seed_set": seed_set,
+                        "stages": stages,
+                        "cumulative_activated": np.array(list(cumulative_activated)),
+                        "recent_gains": recent_gains,
+                        "known_influence": known_influence,
+                        "random_seed": random_seed,
+                        "rng_state": capture_rng_state(stage_rng)
+                    })
+
+                # in modul anytime garantam k seed-uri, fara oprire anticipata
+                if budget.enabled:
+                    continue
+
                 # Condiție 1: acoperire satisfăcătoare
                 if total_activated / len(nodes) >= coverage_threshold:
                     logging.info(f"Stopping early: reached {total_activated}/{len(nodes)} ({(total_activated / len(nodes))*100:.2f}%) coverage")
@@ -258,11 +370,17 @@ def greedy_influence_maximization(
                 "selected_nodes": last_stage["selected_nodes"].copy(),
                 "propagated_nodes": last_stage["propagated_nodes"].copy(),
                 "total_activated": last_stage["total_activated"],
-                "marginal_gain": 0  # Nicio îmbunătățire nouă
+                "marginal_gain": 0,  # Nicio îmbunătățire nouă
+                "fidelity": last_stage.get("fidelity", FULL)
             }
             stages.append(duplicated_stage)
             logging.info(f"Filled stage {stage+1} with previous results due to early stopping")
 
+    remove_checkpoint(checkpoint_file)
+
+    if stages:
+        stages[0]["random_seed"] = random_seed
+
     # salvam seed set-urile pentru o utilizare viitoare
     previous_seed_sets[run_id] = stages
     
@@ -279,7 +397,8 @@ def greedy_influence_maximization(
                     "selected_nodes": stage["selected_nodes"],
                     "propagated_nodes": stage["propagated_nodes"],
                     "total_activated": stage["total_activated"],
-                    "marginal_gain": stage["marginal_gain"]
+                    "marginal_gain": stage["marginal_gain"],
+                    "fidelity": stage.get("fidelity", FULL)
                 })
             json.dump(json_data, f)
         logging.info(f"Saved seed set results to {cache_file}")
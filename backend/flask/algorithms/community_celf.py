@@ -0,0 +1,207 @@
+import sys
+import json
+import os
+import math
+import time
+import logging
+import numpy as np
+import multiprocessing as mp
+from typing import List, Dict, Tuple, Union
+import dill
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models')))
+
+# importam modelele de difuzie
+try:
+    from propagation_models import OptimizedLinearThresholdModel, IndependentCascadeModel, build_csr
+    print("[DEBUG] Successfully pre-imported propagation_models", file=sys.stderr)
+except ImportError as e:
+    print(f"[DEBUG] Failed to pre-import propagation_models: {e}", file=sys.stderr)
+
+from celf import celf, mc_cache
+from rng_streams import resolve_seed
+
+# partea din bugetul de timp data CELF-ului pe comunitati; restul ramane pentru trecerea globala
+COMMUNITY_BUDGET_SHARE = 0.5
+
+def setup_logging():
+    log_dir = os.path.join(os.path.dirname(__file__), 'logs')
+    os.makedirs(log_dir, exist_ok=True)
+    log_file = os.path.join(log_dir, 'community_celf.log')
+
+    logging.basicConfig(
+        filename=log_file,
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        filemode='w'
+    )
+
+    return log_file
+
+def label_propagation(indptr, indices, max_iter=30, seed=None):
+    """Detectie de comunitati prin propagarea etichetelor, vectorizat pe CSR"""
+    rng = np.random.default_rng(seed)
+    num_nodes = len(indptr) - 1
+    labels = np.arange(num_nodes, dtype=np.int64)
+    rows = np.repeat(np.arange(num_nodes, dtype=np.int64), np.diff(indptr))
+
+    for _ in range(max_iter):
+        # numaram etichetele vecinilor pentru fiecare nod
+        pair_keys = rows * num_nodes + labels[indices]
+        unique_keys, counts = np.unique(pair_keys, return_counts=True)
+        key_nodes = unique_keys // num_nodes
+        key_labels = unique_keys % num_nodes
+
+        # zgomot mic pentru departajarea aleatoare a egalitatilor
+        scores = counts + rng.random(len(counts)) * 0.5
+        order = np.lexsort((-scores, key_nodes))
+        key_nodes = key_nodes[order]
+        key_labels = key_labels[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = key_nodes[1:] != key_nodes[:-1]
+        best_nodes = key_nodes[first]
+        best_labels = key_labels[first]
+
+        changed = best_labels != labels[best_nodes]
+        if not changed.any():
+            break
+
+        # actualizam doar jumatate din noduri ca sa evitam oscilatiile
+        update = changed & (rng.random(len(best_nodes)) < 0.5)
+        labels[best_nodes[update]] = best_labels[update]
+
+    _, labels = np.unique(labels, return_inverse=True)
+    return labels
+
+def partition_nodes(nodes, edges, min_community_size=5, seed=None):
+    indptr, indices = build_csr(nodes, edges)
+    labels = label_propagation(indptr, indices, seed=seed)
+
+    communities = {}
+    for idx, label in enumerate(labels):
+        communities.setdefault(int(label), []).append(nodes[idx])
+
+    # comunitatile mici sunt grupate intr-o singura partitie
+    partitions = []
+    residual = []
+    for members in communities.values():
+        if len(members) >= min_community_size:
+            partitions.append(members)
+        else:
+            residual.extend(members)
+    if residual:
+        partitions.append(residual)
+
+    partitions.sort(key=len, reverse=True)
+    return partitions
+
+# fiecare worker primeste doar modelul restrans la comunitatea sa
+def select_community_seeds(args):
+    sub_model, community_nodes, community_k, params = args
+    sub_params = dict(params)
+    sub_params['seedSize'] = community_k
+    sub_params['numProcesses'] = 1
+    sub_params['checkpoint'] = False
+
+    stages = celf(community_nodes, sub_model.edges, sub_model, sub_params)
+    if not stages:
+        return []
+    return stages[-1]['selected_nodes']
+
+def community_celf(
+    nodes: List[Union[str, int]],
+    edges: List[Tuple[Union[str, int], Union[str, int]]],
+    model,
+    params: Dict[str, Union[int, float]]
+) -> List[Dict[str, Union[int, List[Union[str, int]], str]]]:
+
+    logging.info("Starting community-partitioned CELF algorithm")
+
+    k = max(1, min(params.get('seedSize', 10), len(nodes)))
+    num_processes = min(params.get('numProcesses', mp.cpu_count()), mp.cpu_count())
+    min_community_size = params.get('minCommunitySize', 5)
+    oversampling = params.get('candidateOversampling', 2)
+
+    # bugetul acopera toata rularea, nu fiecare apel celf() in parte
+    start_time = time.time()
+    budget_ms = params.get('timeBudgetMs')
+
+    # aceeasi samanta pentru partitionare si CELF-ul pe comunitati
+    random_seed = resolve_seed(params)
+    community_params = {**params, 'randomSeed': random_seed}
+    community_params.pop('timeBudgetMs', None)
+
+    partitions = partition_nodes(nodes, edges, min_community_size, random_seed)
+    logging.info(f"Found {len(partitions)} partitions (largest: {len(partitions[0]) if partitions else 0} nodes)")
+
+    # numarul de candidati pe comunitate e proportional cu dimensiunea ei; submodelele sunt
+    # construite toate dintr-o trecere prin arce
+    tasks = []
+    for members, sub_model in zip(partitions, model.subgraphs(partitions)):
+        community_k = min(len(members), max(1, math.ceil(oversampling * k * len(members) / len(nodes))))
+        task_params = community_params
+        if budget_ms:
+            # partile sunt proportionale cu comunitatea si insumate nu depasesc partea comunitatilor,
+            # chiar daca ar rula una dupa alta
+            phase_ms = max(0.0, budget_ms * COMMUNITY_BUDGET_SHARE - (time.time() - start_time) * 1000)
+            task_params = {**community_params, 'timeBudgetMs': max(1.0, phase_ms * len(members) / len(nodes))}
+        tasks.append((sub_model, members, community_k, task_params))
+
+    with mp.Pool(processes=max(1, num_processes)) as pool:
+        community_results = pool.map(select_community_seeds, tasks, chunksize=1)
+
+    candidates = list(dict.fromkeys(node for selected in community_results for node in selected))
+    logging.info(f"Merging {len(candidates)} community candidates with a global CELF pass")
+
+    # rezultatele din worker-i nu sunt valabile pe graful complet
+    mc_cache.clear()
+    global_params = params
+    if budget_ms:
+        global_params = {**params, 'timeBudgetMs': max(1.0, budget_ms - (time.time() - start_time) * 1000)}
+    stages = celf(nodes, edges, model, global_params, candidates=candidates)
+
+    if stages:
+        stages[0]["num_communities"] = len(partitions)
+        stages[0]["num_candidates"] = len(candidates)
+        stages[0]["community_seed"] = random_seed
+
+    return stages
+
+if __name__ == "__main__":
+    try:
+        log_file = setup_logging()
+
+        if len(sys.argv) != 5:
+            raise ValueError("Usage: python community_celf.py <nodes_file_path> <edges_file_path> <model_file_path> <params_file_path>")
+
+        with open(sys.argv[1], 'r') as nodes_file:
+            nodes = json.load(nodes_file)
+
+        with open(sys.argv[2], 'r') as edges_file:
+            edges = json.load(edges_file)
+
+        with open(sys.argv[3], 'rb') as model_file:
+            model = dill.load(model_file)
+
+        model_id = getattr(model, '_model_id', None)
+
+        with open(sys.argv[4], 'r') as params_file:
+            params = json.load(params_file)
+
+        if not isinstance(nodes, list) or not isinstance(edges, list):
+            raise ValueError("Nodes and edges must be lists")
+
+        stages = community_celf(nodes, edges, model, params)
+
+        output = {
+            "stages": stages,
+            "model_id": model_id
+        }
+
+        print(json.dumps(output))
+
+    except Exception as e:
+        logging.error(f"Error: {str(e)}", exc_info=True)
+        import traceback
+        traceback.print_exc(file=sys.stderr)
+        sys.exit(1)
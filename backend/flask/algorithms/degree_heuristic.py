@@ -8,11 +8,13 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'm
 
 #importam modelelor de difuzie
 try:
-    from propagation_models import OptimizedLinearThresholdModel, IndependentCascadeModel
+    from propagation_models import OptimizedLinearThresholdModel, IndependentCascadeModel, nodes_activated_by
     print("[DEBUG] Successfully pre-imported propagation_models", file=sys.stderr)
 except ImportError as e:
     print(f"[DEBUG] Failed to pre-import propagation_models: {e}", file=sys.stderr)
 
+from rng_streams import resolve_seed, stream_generator, STAGE_STREAM
+
 def degree_heuristic_algorithm(
     nodes: List[Union[str, int]],
     edges: List[Tuple[Union[str, int], Union[str, int]]],
@@ -34,26 +36,27 @@ def degree_heuristic_algorithm(
     sorted_nodes = sorted(node_degrees.keys(), key=lambda x: node_degrees[x], reverse=True)
     seed_nodes = sorted_nodes[:k]
 
-    
+    # selectia e determinista; samanta conteaza doar pentru propagarea afisata
+    random_seed = resolve_seed(params)
+
     stages = [{
         "stage": 1,
         "selected_nodes": seed_nodes,
         "propagated_nodes": seed_nodes,
         "total_activated": len(seed_nodes),
-        "average_degree": sum(node_degrees[n] for n in seed_nodes)/len(seed_nodes) if seed_nodes else 0
+        "average_degree": sum(node_degrees[n] for n in seed_nodes)/len(seed_nodes) if seed_nodes else 0,
+        "random_seed": random_seed
     }]
 
-    active_nodes = set(seed_nodes)
+    # o singura propagare; etapa `step` contine nodurile activate pana la pasul step - 1
+    activation_steps = model.trace(seed_nodes, max_steps - 1, rng=stream_generator(random_seed, STAGE_STREAM))
     for step in range(2, max_steps + 1):
-        try:
-            active_nodes = set(model.propagate(active_nodes))
-            stages.append({
-                "stage": step,
-                "propagated_nodes": list(active_nodes),
-                "total_activated": len(active_nodes)
-            })
-        except Exception as e:
-            break
+        active_nodes = nodes_activated_by(model, activation_steps, step - 1)
+        stages.append({
+            "stage": step,
+            "propagated_nodes": active_nodes,
+            "total_activated": len(active_nodes)
+        })
 
     return stages
 
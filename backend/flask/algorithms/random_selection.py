@@ -1,7 +1,6 @@
 import sys
 import json
 import os
-import random
 import dill
 from typing import List, Dict, Set, Tuple, Union
 
@@ -9,12 +8,14 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'm
 
 # importam modelelor de difuzie
 try:
-    from propagation_models import OptimizedLinearThresholdModel, IndependentCascadeModel
+    from propagation_models import OptimizedLinearThresholdModel, IndependentCascadeModel, nodes_activated_by
     debug_msg = "[DEBUG] Successfully pre-imported propagation_models"
     print(debug_msg, file=sys.stderr)
 except ImportError as e:
     print(f"[DEBUG] Failed to pre-import propagation_models: {e}", file=sys.stderr)
 
+from rng_streams import resolve_seed, stream_generator, STAGE_STREAM, SAMPLING_STREAM
+
 def random_selection_algorithm(
     nodes: List[Union[str, int]],
     edges: List[Tuple[Union[str, int], Union[str, int]]],
@@ -26,26 +27,26 @@ def random_selection_algorithm(
     k = max(1, min(params.get('seedSize', 10), len(nodes)))
     max_steps = max(1, min(params.get('maxSteps', 5), 20))
 
-    seed_nodes = random.sample(nodes, k) if nodes else []
+    random_seed = resolve_seed(params)
+    sampling_rng = stream_generator(random_seed, SAMPLING_STREAM)
+    seed_nodes = [nodes[i] for i in sampling_rng.choice(len(nodes), k, replace=False)] if nodes else []
     
     stages = [{
         "stage": 1,
         "selected_nodes": seed_nodes,
         "propagated_nodes": seed_nodes,
-        "total_activated": len(seed_nodes)
+        "total_activated": len(seed_nodes),
+        "random_seed": random_seed
     }]
     
-    active_nodes = set(seed_nodes)
+    activation_steps = model.trace(seed_nodes, max_steps - 1, rng=stream_generator(random_seed, STAGE_STREAM))
     for step in range(2, max_steps + 1):
-        try:
-            active_nodes = set(model.propagate(active_nodes))
-            stages.append({
-                "stage": step,
-                "propagated_nodes": list(active_nodes),
-                "total_activated": len(active_nodes)
-            })
-        except Exception as e:
-            break
+        active_nodes = nodes_activated_by(model, activation_steps, step - 1)
+        stages.append({
+            "stage": step,
+            "propagated_nodes": active_nodes,
+            "total_activated": len(active_nodes)
+        })
     
     return stages
 
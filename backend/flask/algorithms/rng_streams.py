@@ -0,0 +1,41 @@
+import hashlib
+import numpy as np
+
+# fluxurile independente derivate din samanta unei rulari
+SIMULATION_STREAM = 0
+BATCH_STREAM = 1
+STAGE_STREAM = 2
+SAMPLING_STREAM = 3
+
+def resolve_seed(params):
+    """Samanta rularii: cea primita in parametri sau una noua, raportata in rezultat"""
+    seed = params.get('randomSeed')
+    if seed is None:
+        # ramane sub 2^53 ca sa poata fi citita exact si din JavaScript
+        seed = int(np.random.SeedSequence().generate_state(1, np.uint64)[0] >> np.uint64(11))
+    return int(seed)
+
+def seed_sequence(seed, *stream):
+    # acelasi copil pe care l-ar da SeedSequence.spawn, dar adresat direct prin cale
+    return np.random.SeedSequence(seed, spawn_key=tuple(stream))
+
+def stream_generator(seed, *stream):
+    return np.random.default_rng(seed_sequence(seed, *stream))
+
+def simulation_keys(seed, num_simulations, common=True, *stream):
+    """Cheile monedelor pentru fiecare simulare Monte Carlo a unei evaluari.
+
+    Cu numere aleatoare comune toate evaluarile folosesc aceleasi chei, deci candidatii
+    sunt comparati pe aceleasi arce vii; altfel fiecare evaluare are fluxul ei."""
+    if common:
+        sequence = seed_sequence(seed, SIMULATION_STREAM)
+    else:
+        sequence = seed_sequence(seed, BATCH_STREAM, *stream)
+    return sequence.generate_state(max(1, num_simulations), np.uint64)
+
+def keys_identity(keys):
+    """Identitatea cheilor unei evaluari, pentru cache-urile de estimari: cu numere aleatoare
+    comune e aceeasi la fiecare apel, fara ele fiecare evaluare are estimarea ei"""
+    if keys is None:
+        return None
+    return hashlib.md5(np.ascontiguousarray(keys).tobytes()).hexdigest()
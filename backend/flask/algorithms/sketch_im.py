@@ -0,0 +1,330 @@
+import sys
+import json
+import os
+import heapq
+import hashlib
+import logging
+import time
+import numpy as np
+from typing import List, Dict, Tuple, Union
+import dill
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models')))
+
+# importam modelele de difuzie
+try:
+    from propagation_models import OptimizedLinearThresholdModel, IndependentCascadeModel, nodes_activated_by, sampled_model, LIVE_EDGE_LT
+    print("[DEBUG] Successfully pre-imported propagation_models", file=sys.stderr)
+except ImportError as e:
+    print(f"[DEBUG] Failed to pre-import propagation_models: {e}", file=sys.stderr)
+
+from rng_streams import resolve_seed, seed_sequence, stream_generator, STAGE_STREAM, SAMPLING_STREAM
+
+SKETCH_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'sketch_cache')
+SKETCH_CACHE_MAX_BYTES = int(os.environ.get("SKETCH_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+SKETCH_CACHE_MAX_AGE = float(os.environ.get("SKETCH_CACHE_MAX_AGE_DAYS", 7)) * 24 * 3600
+
+def trim_sketch_cache_dir():
+    """Stergem indecsii mai vechi decat SKETCH_CACHE_MAX_AGE si, peste SKETCH_CACHE_MAX_BYTES,
+    pe cei folositi cel mai demult (la citire le actualizam mtime-ul)"""
+    files = [
+        os.path.join(SKETCH_CACHE_DIR, name)
+        for name in os.listdir(SKETCH_CACHE_DIR)
+        if name.endswith('_sketches.npz')
+    ]
+    files.sort(key=os.path.getmtime, reverse=True)
+    now = time.time()
+    used = 0
+    for path in files:
+        used += os.path.getsize(path)
+        if used > SKETCH_CACHE_MAX_BYTES or now - os.path.getmtime(path) > SKETCH_CACHE_MAX_AGE:
+            os.unlink(path)
+
+def setup_logging():
+    log_dir = os.path.join(os.path.dirname(__file__), 'logs')
+    os.makedirs(log_dir, exist_ok=True)
+    log_file = os.path.join(log_dir, 'sketch_im.log')
+
+    logging.basicConfig(
+        filename=log_file,
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        filemode='w'
+    )
+
+    return log_file
+
+def sample_live_edges(model, indptr, indices, rows, weights, rng):
+    """Un graf live-edge: listele de predecesori vii pentru fiecare nod. Pentru LT e instanta
+    live-edge (praguri uniforme in [0, 1] la fiecare cascada), nu pragurile fixe ale modelului"""
+    num_nodes = len(indptr) - 1
+
+    if isinstance(model, OptimizedLinearThresholdModel):
+        # LT: fiecare nod v alege cel mult un vecin u cu probabilitatea w(u, v)
+        cumulative = np.cumsum(weights)
+        row_base = np.concatenate([[0.0], cumulative])[indptr[:-1]]
+        targets = row_base + rng.random(num_nodes)
+        chosen = np.searchsorted(cumulative, targets, side='right')
+        valid = chosen < indptr[1:]
+        live_src = indices[chosen[valid]]
+        live_dst = np.nonzero(valid)[0]
+    else:
+        # IC: fiecare arc u->v ramane viu cu probabilitatea p(u, v)
+        live = rng.random(len(indices)) < weights
+        live_src = indices[live]
+        live_dst = rows[live]
+
+    predecessors = [[] for _ in range(num_nodes)]
+    for u, v in zip(live_src.tolist(), live_dst.tolist()):
+        predecessors[v].append(u)
+    return predecessors
+
+class SketchIndex:
+    """Schite bottom-k combinate de accesibilitate (SKIM) peste instante live-edge"""
+
+    def __init__(self, node_indices, sketch_ptr, sketch_ranks, sketch_size, num_instances):
+        self.node_indices = node_indices
+        self.sketch_ptr = sketch_ptr
+        self.sketch_ranks = sketch_ranks
+        self.sketch_size = sketch_size
+        self.num_instances = num_instances
+
+    @classmethod
+    def build(cls, model, sketch_size=64, num_instances=64, seed=None):
+        rng = np.random.default_rng(seed)
+        # arcele de intrare ale fiecarui nod, cu ponderea/probabilitatea lor
+        indptr, indices, weights = model.incoming_csr()
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        num_nodes = len(model.nodes)
+
+        instances = [sample_live_edges(model, indptr, indices, rows, weights, rng) for _ in range(num_instances)]
+
+        # rang aleator pentru fiecare pereche (instanta, nod), procesate crescator
+        ranks = rng.random(num_nodes * num_instances)
+        order = np.argsort(ranks)
+        ranks = ranks.tolist()
+
+        sketches = [[] for _ in range(num_nodes)]
+        full_count = 0
+        for pair in order.tolist():
+            if full_count == num_nodes:
+                break
+            instance, source = divmod(pair, num_nodes)
+            # cine ajunge la o schita plina are si el schita plina
+            if len(sketches[source]) >= sketch_size:
+                continue
+
+            rank = ranks[pair]
+            predecessors = instances[instance]
+            visited = {source}
+            stack = [source]
+            while stack:
+                node = stack.pop()
+                sketches[node].append(rank)
+                if len(sketches[node]) == sketch_size:
+                    full_count += 1
+                for pred in predecessors[node]:
+                    if pred not in visited and len(sketches[pred]) < sketch_size:
+                        visited.add(pred)
+                        stack.append(pred)
+
+        sketch_ptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum([len(s) for s in sketches], out=sketch_ptr[1:])
+        sketch_ranks = np.fromiter((r for s in sketches for r in s), dtype=np.float64, count=int(sketch_ptr[-1]))
+
+        return cls(model.node_indices, sketch_ptr, sketch_ranks, sketch_size, num_instances)
+
+    def node_sketch(self, idx):
+        return self.sketch_ranks[self.sketch_ptr[idx]:self.sketch_ptr[idx + 1]]
+
+    def merge(self, *sketches):
+        merged = np.unique(np.concatenate(sketches))
+        return merged[:self.sketch_size]
+
+    def estimate(self, sketch):
+        # estimatorul bottom-k pentru numarul de perechi accesibile
+        if len(sketch) < self.sketch_size:
+            reachable = len(sketch)
+        else:
+            reachable = (self.sketch_size - 1) / sketch[self.sketch_size - 1]
+        return reachable / self.num_instances
+
+    def estimate_spread(self, seed_nodes):
+        indices = [self.node_indices[node] for node in seed_nodes if node in self.node_indices]
+        if not indices:
+            return 0.0
+        return self.estimate(self.merge(*[self.node_sketch(idx) for idx in indices]))
+
+    def greedy_seeds(self, k, candidates=None):
+        """Selectie greedy lazy dupa acoperirea estimata din schite"""
+        if candidates is None:
+            candidates = range(len(self.sketch_ptr) - 1)
+
+        heap = [(-self.estimate(self.node_sketch(idx)), idx, 0) for idx in candidates]
+        heapq.heapify(heap)
+
+        selected = []
+        current = np.empty(0)
+        current_spread = 0.0
+        for iteration in range(k):
+            while heap:
+                neg_gain, idx, last_checked = heapq.heappop(heap)
+                if last_checked == iteration:
+                    current = self.merge(current, self.node_sketch(idx))
+                    current_spread = self.estimate(current)
+                    selected.append((idx, -neg_gain, current_spread))
+                    break
+                gain = self.estimate(self.merge(current, self.node_sketch(idx))) - current_spread
+                heapq.heappush(heap, (-gain, idx, iteration))
+            else:
+                break
+
+        return selected
+
+    def save(self, path, model_hash):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp.npz'
+        np.savez_compressed(
+            tmp_path,
+            sketch_ptr=self.sketch_ptr,
+            sketch_ranks=self.sketch_ranks,
+            meta=np.array([self.sketch_size, self.num_instances]),
+            model_hash=np.array(model_hash)
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, model, model_hash):
+        with np.load(path) as data:
+            if str(data['model_hash']) != model_hash:
+                return None
+            sketch_size, num_instances = (int(x) for x in data['meta'])
+            return cls(model.node_indices, data['sketch_ptr'], data['sketch_ranks'], sketch_size, num_instances)
+
+def model_hash(model):
+    # schitele depind doar de ponderile arcelor, nu si de id-ul modelului
+    digest = hashlib.md5(type(model).__name__.encode())
+    for array in model.incoming_csr():
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+def get_sketch_index(model, params, random_seed):
+    sketch_size = params.get('sketchSize', 64)
+    num_instances = params.get('numInstances', 64)
+    cache_key = params.get('cacheKey')
+
+    cache_file = None
+    current_hash = None
+    if cache_key:
+        cache_file = os.path.join(SKETCH_CACHE_DIR, f'{cache_key}_{sketch_size}_{num_instances}_sketches.npz')
+        current_hash = model_hash(model)
+        if os.path.exists(cache_file):
+            try:
+                index = SketchIndex.load(cache_file, model, current_hash)
+                if index is not None:
+                    os.utime(cache_file)
+                    logging.info(f"Loaded sketch index from {cache_file}")
+                    return index
+            except Exception as e:
+                logging.warning(f"Failed to load sketch index {cache_file}: {str(e)}")
+
+    index = SketchIndex.build(model, sketch_size, num_instances, seed_sequence(random_seed, SAMPLING_STREAM))
+
+    if cache_file:
+        try:
+            index.save(cache_file, current_hash)
+            logging.info(f"Saved sketch index to {cache_file}")
+            trim_sketch_cache_dir()
+        except Exception as e:
+            logging.warning(f"Failed to save sketch index: {str(e)}")
+
+    return index
+
+def sketch_influence_maximization(
+    nodes: List[Union[str, int]],
+    edges: List[Tuple[Union[str, int], Union[str, int]]],
+    model,
+    params: Dict[str, Union[int, float]]
+) -> List[Dict[str, Union[int, List[Union[str, int]], str]]]:
+
+    logging.info("Starting sketch-based influence maximization")
+
+    # pentru LT selectia optimizeaza varianta live-edge, nu pragurile fixe ale modelului;
+    # spread-ul din etape e simulat totusi cu modelul real (model.trace)
+    selection_model = sampled_model(model)
+    if selection_model == LIVE_EDGE_LT:
+        logging.warning("SKIM samples the live-edge LT model (uniform [0, 1] thresholds redrawn per cascade), not the model's fixed thresholds")
+
+    k = max(1, min(params.get('seedSize', 10), len(nodes)))
+    max_steps = max(1, min(params.get('maxSteps', 5), 20))
+
+    random_seed = resolve_seed(params)
+    index = get_sketch_index(model, params, random_seed)
+    candidates = [model.node_indices[node] for node in nodes if node in model.node_indices]
+    selected = index.greedy_seeds(k, candidates)
+
+    stage_rng = stream_generator(random_seed, STAGE_STREAM)
+    seed_set = []
+    stages = []
+    cumulative_activated = set()
+    for iteration, (idx, gain, estimated_spread) in enumerate(selected):
+        seed_set.append(model.get_node_from_index(idx))
+
+        activated = set(nodes_activated_by(model, model.trace(seed_set, max_steps, rng=stage_rng), max_steps))
+        cumulative_activated.update(activated)
+
+        stages.append({
+            "stage": iteration + 1,
+            "selected_nodes": seed_set.copy(),
+            "propagated_nodes": list(cumulative_activated),
+            "total_activated": len(cumulative_activated),
+            "marginal_gain": gain,
+            "estimated_spread": estimated_spread
+        })
+
+        logging.info(f"Stage {iteration+1}: Selected {seed_set[-1]} (estimated spread={estimated_spread:.2f})")
+
+    if stages:
+        stages[0]["random_seed"] = random_seed
+        stages[0]["selection_model"] = selection_model
+
+    return stages
+
+if __name__ == "__main__":
+    try:
+        log_file = setup_logging()
+
+        if len(sys.argv) != 5:
+            raise ValueError("Usage: python sketch_im.py <nodes_file_path> <edges_file_path> <model_file_path> <params_file_path>")
+
+        with open(sys.argv[1], 'r') as nodes_file:
+            nodes = json.load(nodes_file)
+
+        with open(sys.argv[2], 'r') as edges_file:
+            edges = json.load(edges_file)
+
+        with open(sys.argv[3], 'rb') as model_file:
+            model = dill.load(model_file)
+
+        model_id = getattr(model, '_model_id', None)
+
+        with open(sys.argv[4], 'r') as params_file:
+            params = json.load(params_file)
+
+        if not isinstance(nodes, list) or not isinstance(edges, list):
+            raise ValueError("Nodes and edges must be lists")
+
+        stages = sketch_influence_maximization(nodes, edges, model, params)
+
+        output = {
+            "stages": stages,
+            "model_id": model_id
+        }
+
+        print(json.dumps(output))
+
+    except Exception as e:
+        logging.error(f"Error: {str(e)}", exc_info=True)
+        import traceback
+        traceback.print_exc(file=sys.stderr)
+        sys.exit(1)
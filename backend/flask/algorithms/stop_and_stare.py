@@ -0,0 +1,249 @@
+import sys
+import json
+import os
+import math
+import logging
+import numpy as np
+from typing import List, Dict, Tuple, Union
+import dill
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models')))
+
+# importam modelele de difuzie
+try:
+    from propagation_models import OptimizedLinearThresholdModel, IndependentCascadeModel, nodes_activated_by, sampled_model, LIVE_EDGE_LT
+    print("[DEBUG] Successfully pre-imported propagation_models", file=sys.stderr)
+except ImportError as e:
+    print(f"[DEBUG] Failed to pre-import propagation_models: {e}", file=sys.stderr)
+
+from rng_streams import resolve_seed, stream_generator, STAGE_STREAM, SAMPLING_STREAM
+
+def setup_logging():
+    log_dir = os.path.join(os.path.dirname(__file__), 'logs')
+    os.makedirs(log_dir, exist_ok=True)
+    log_file = os.path.join(log_dir, 'stop_and_stare.log')
+
+    logging.basicConfig(
+        filename=log_file,
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        filemode='w'
+    )
+
+    return log_file
+
+def upsilon(epsilon, delta):
+    """Numarul de esantioane din limita Chernoff folosita de SSA"""
+    return (2 + 2 * epsilon / 3) * math.log(1 / delta) / epsilon ** 2
+
+def log_binomial(n, k):
+    return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+class RRCollection:
+    """Seturi RR stocate compact: nodurile concatenate si pointeri catre fiecare set"""
+
+    def __init__(self, num_nodes):
+        self.num_nodes = num_nodes
+        self.sets = []
+
+    def extend(self, model, count, rng):
+        self.sets.extend(np.asarray(model.sample_rr_set(rng=rng), dtype=np.int64) for _ in range(count))
+
+    def __len__(self):
+        return len(self.sets)
+
+    def flatten(self, start, end):
+        chunk = self.sets[start:end]
+        lengths = np.fromiter((len(s) for s in chunk), dtype=np.int64, count=len(chunk))
+        set_ptr = np.zeros(len(chunk) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=set_ptr[1:])
+        flat = np.concatenate(chunk) if chunk else np.empty(0, dtype=np.int64)
+        return flat, set_ptr
+
+    def coverage(self, start, end, seed_indices):
+        """Cate seturi din intervalul dat intersecteaza seed set-ul"""
+        flat, set_ptr = self.flatten(start, end)
+        if len(flat) == 0:
+            return 0
+        is_seed = np.zeros(self.num_nodes, dtype=bool)
+        is_seed[seed_indices] = True
+        set_ids = np.repeat(np.arange(len(set_ptr) - 1), np.diff(set_ptr))
+        return int(np.unique(set_ids[is_seed[flat]]).size)
+
+    def max_coverage(self, start, end, k):
+        """Greedy max-coverage pe seturile RR din interval"""
+        flat, set_ptr = self.flatten(start, end)
+        num_sets = len(set_ptr) - 1
+        set_ids = np.repeat(np.arange(num_sets), np.diff(set_ptr))
+
+        # indexul invers: pentru fiecare nod, seturile in care apare
+        order = np.argsort(flat, kind='stable')
+        node_ptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(flat, minlength=self.num_nodes), out=node_ptr[1:])
+        node_sets = set_ids[order]
+
+        degree = np.bincount(flat, minlength=self.num_nodes).astype(np.int64)
+        covered = np.zeros(num_sets, dtype=bool)
+        seeds = []
+        gains = []
+
+        for _ in range(min(k, self.num_nodes)):
+            best = int(np.argmax(degree))
+            seeds.append(best)
+            gains.append(int(degree[best]))
+
+            containing = node_sets[node_ptr[best]:node_ptr[best + 1]]
+            newly_covered = containing[~covered[containing]]
+            covered[newly_covered] = True
+            if len(newly_covered):
+                members = np.concatenate([flat[set_ptr[s]:set_ptr[s + 1]] for s in newly_covered])
+                np.subtract.at(degree, members, 1)
+            degree[best] = -1
+
+        return seeds, gains, int(covered.sum())
+
+def stop_and_stare(
+    nodes: List[Union[str, int]],
+    edges: List[Tuple[Union[str, int], Union[str, int]]],
+    model,
+    params: Dict[str, Union[int, float]]
+) -> List[Dict[str, Union[int, List[Union[str, int]], str]]]:
+
+    logging.info("Starting D-SSA (dynamic Stop-and-Stare) algorithm")
+
+    # pentru LT selectia optimizeaza varianta live-edge, nu pragurile fixe ale modelului;
+    # spread-ul din etape e simulat totusi cu modelul real (model.trace)
+    selection_model = sampled_model(model)
+    if selection_model == LIVE_EDGE_LT:
+        logging.warning("D-SSA samples the live-edge LT model (uniform [0, 1] thresholds redrawn per cascade), not the model's fixed thresholds")
+
+    n = model.num_nodes
+    k = max(1, min(params.get('seedSize', 10), len(nodes)))
+    max_steps = max(1, min(params.get('maxSteps', 5), 20))
+    epsilon = params.get('epsilon', 0.1)
+    delta = params.get('delta', 1 / n)
+    max_rr_sets = params.get('maxRRSets', 200000)
+
+    # limitele teoretice din D-SSA
+    e_factor = 1 - 1 / math.e
+    upsilon_k = (2 + 2 * epsilon / 3) * (math.log(6 / delta) + log_binomial(n, k)) / epsilon ** 2
+    n_max = 8 * e_factor / (2 + 2 * epsilon / 3) * upsilon_k * n / k
+    initial_size = math.ceil(upsilon(epsilon, delta / 3))
+    t_max = max(1, math.ceil(math.log2(max(2, 2 * n_max / initial_size))))
+    lambda_1 = 1 + (1 + epsilon) * upsilon(epsilon, delta / (3 * t_max))
+    sample_cap = min(n_max, max_rr_sets)
+
+    logging.info(f"Parameters: k={k}, epsilon={epsilon}, delta={delta:.2e}, N_max={n_max:.0f}, cap={sample_cap:.0f}")
+
+    # seturile RR se extrag dintr-un singur flux, in ordine, deci esantionul depinde doar de samanta
+    random_seed = resolve_seed(params)
+    sampling_rng = stream_generator(random_seed, SAMPLING_STREAM)
+
+    rr_sets = RRCollection(n)
+    rr_sets.extend(model, 2 * initial_size, sampling_rng)
+
+    rounds = 0
+    converged = False
+    while True:
+        rounds += 1
+        half = len(rr_sets) // 2
+
+        # prima jumatate pentru selectie, a doua pentru verificare independenta
+        seeds, gains, covered = rr_sets.max_coverage(0, half, k)
+        estimated_spread = covered * n / half
+        verification_cover = rr_sets.coverage(half, len(rr_sets), seeds)
+
+        if verification_cover >= lambda_1:
+            verified_spread = verification_cover * n / (len(rr_sets) - half)
+            scale = half / initial_size
+            eps_1 = estimated_spread / verified_spread - 1
+            eps_2 = epsilon * math.sqrt(n * (1 + epsilon) / (scale * verified_spread))
+            eps_3 = epsilon * math.sqrt(
+                n * (1 + epsilon) * (e_factor - epsilon) / ((1 + epsilon / 3) * scale * verified_spread)
+            )
+            eps_t = (eps_1 + eps_2 + eps_1 * eps_2) * (e_factor - epsilon) + e_factor * eps_3
+
+            logging.info(f"Round {rounds}: |R|={len(rr_sets)}, estimate={estimated_spread:.2f}, verified={verified_spread:.2f}, eps_t={eps_t:.4f}")
+
+            if eps_t <= epsilon:
+                converged = True
+                break
+        else:
+            logging.info(f"Round {rounds}: |R|={len(rr_sets)}, verification coverage {verification_cover} below {lambda_1:.0f}")
+
+        if half >= sample_cap:
+            logging.info(f"Stopping at sample cap with {len(rr_sets)} RR sets")
+            break
+
+        # dublam esantionul pentru runda urmatoare
+        rr_sets.extend(model, len(rr_sets), sampling_rng)
+
+    stage_rng = stream_generator(random_seed, STAGE_STREAM)
+    seed_set = []
+    stages = []
+    cumulative_activated = set()
+    for iteration, (idx, gain) in enumerate(zip(seeds, gains)):
+        seed_set.append(model.get_node_from_index(idx))
+
+        activated = set(nodes_activated_by(model, model.trace(seed_set, max_steps, rng=stage_rng), max_steps))
+        cumulative_activated.update(activated)
+
+        stages.append({
+            "stage": iteration + 1,
+            "selected_nodes": seed_set.copy(),
+            "propagated_nodes": list(cumulative_activated),
+            "total_activated": len(cumulative_activated),
+            "marginal_gain": gain * n / half
+        })
+
+    if stages:
+        stages[0]["rr_sets"] = len(rr_sets)
+        stages[0]["selection_sets"] = half
+        stages[0]["verification_sets"] = len(rr_sets) - half
+        stages[0]["rounds"] = rounds
+        stages[0]["converged"] = converged
+        stages[0]["random_seed"] = random_seed
+        stages[0]["selection_model"] = selection_model
+
+    logging.info(f"D-SSA finished after {rounds} rounds with {len(rr_sets)} RR sets (converged={converged})")
+
+    return stages
+
+if __name__ == "__main__":
+    try:
+        log_file = setup_logging()
+
+        if len(sys.argv) != 5:
+            raise ValueError("Usage: python stop_and_stare.py <nodes_file_path> <edges_file_path> <model_file_path> <params_file_path>")
+
+        with open(sys.argv[1], 'r') as nodes_file:
+            nodes = json.load(nodes_file)
+
+        with open(sys.argv[2], 'r') as edges_file:
+            edges = json.load(edges_file)
+
+        with open(sys.argv[3], 'rb') as model_file:
+            model = dill.load(model_file)
+
+        model_id = getattr(model, '_model_id', None)
+
+        with open(sys.argv[4], 'r') as params_file:
+            params = json.load(params_file)
+
+        if not isinstance(nodes, list) or not isinstance(edges, list):
+            raise ValueError("Nodes and edges must be lists")
+
+        stages = stop_and_stare(nodes, edges, model, params)
+
+        output = {
+            "stages": stages,
+            "model_id": model_id
+        }
+
+        print(json.dumps(output))
+
+    except Exception as e:
+        logging.error(f"Error: {str(e)}", exc_info=True)
+        import traceback
+        traceback.print_exc(file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,94 @@
+import time
+
+# nivelurile de fidelitate ale estimarilor, de la cea mai precisa la cea mai ieftina
+FULL = "full"
+REDUCED = "reduced"
+MINIMAL = "minimal"
+FALLBACK = "fallback"
+
+FIDELITY_LEVELS = [FULL, REDUCED, MINIMAL, FALLBACK]
+
+def lowest_fidelity(first, second):
+    return max(first, second, key=FIDELITY_LEVELS.index)
+
+class TimeBudget:
+    """Buget de timp pentru modul anytime: fidelitatea scade pe masura ce se apropie termenul limita"""
+
+    def __init__(self, budget_ms, num_simulations, start_time=None):
+        self.budget = budget_ms / 1000 if budget_ms else None
+        self.start_time = time.time() if start_time is None else start_time
+        self.num_simulations = num_simulations
+
+    @property
+    def enabled(self):
+        return self.budget is not None
+
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    def remaining(self):
+        if not self.enabled:
+            return float('inf')
+        return max(0.0, self.budget - self.elapsed())
+
+    def fidelity(self):
+        if not self.enabled:
+            return FULL
+        used = self.elapsed() / self.budget
+        if used < 0.5:
+            return FULL
+        if used < 0.8:
+            return REDUCED
+        if used < 1.0:
+            return MINIMAL
+        return FALLBACK
+
+    def simulations(self, fidelity):
+        if fidelity == FULL:
+            return self.num_simulations
+        if fidelity == REDUCED:
+            return max(1, self.num_simulations // 4)
+        if fidelity == MINIMAL:
+            return 1
+        return 0
+
+    def candidate_limit(self, num_candidates, k, fidelity):
+        """Cati candidati mai evaluam la fiecare nivel de fidelitate"""
+        if fidelity == FULL:
+            return num_candidates
+        if fidelity == REDUCED:
+            return min(num_candidates, max(4 * k, num_candidates // 4))
+        if fidelity == MINIMAL:
+            return min(num_candidates, max(2 * k, num_candidates // 16))
+        return 0
+
+    def affordable_fidelity(self, fidelity, seconds_per_simulation, num_candidates, k, seeds_left, num_processes):
+        """Coboram fidelitatea pana cand etapa estimata incape in partea ei din timpul ramas"""
+        if not self.enabled or not seconds_per_simulation:
+            return fidelity
+
+        share = self.remaining() / max(1, seeds_left)
+        while fidelity != FALLBACK:
+            evaluations = self.candidate_limit(num_candidates, k, fidelity) * self.simulations(fidelity)
+            if seconds_per_simulation * evaluations / max(1, num_processes) <= share:
+                break
+            fidelity = FIDELITY_LEVELS[FIDELITY_LEVELS.index(fidelity) + 1]
+        return fidelity
+
+    def initial_pass_plan(self, seconds_per_simulation, num_candidates, num_processes, share=0.4):
+        """Simulari si candidati pentru evaluarea initiala, ca sa incapa in partea alocata din buget"""
+        if not self.enabled or seconds_per_simulation <= 0:
+            return self.num_simulations, num_candidates, FULL
+
+        allowed = self.remaining() * share * max(1, num_processes)
+        full_cost = seconds_per_simulation * self.num_simulations * num_candidates
+        if full_cost <= allowed:
+            return self.num_simulations, num_candidates, FULL
+
+        simulations = int(self.num_simulations * allowed / full_cost)
+        if simulations >= 1:
+            return simulations, num_candidates, REDUCED
+
+        # nici cu o singura simulare nu incap toti candidatii
+        limit = max(1, int(allowed / seconds_per_simulation))
+        return 1, min(num_candidates, limit), MINIMAL
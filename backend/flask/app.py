@@ -10,33 +10,109 @@ import time
 import dill
 import sys
 import uuid
+import threading
 import hashlib
-import sqlite3
-import csv
+import gzip
 
 #initializam db
-from database import init_db, insert_network_stats, get_all_network_stats,insert_algorithm_run,get_all_algorithm_runs
+from database import (
+    init_db, insert_network_stats, get_all_network_stats, get_network_signatures, insert_algorithm_runs, get_all_algorithm_runs,
+    insert_model_params, get_model_params, get_cached_result, insert_cached_result,
+    get_run_statistics, get_saved_run_summaries, get_run_aggregates, get_algorithm_run, release_connection
+)
+from model_cache import ModelCache
+from graph_payloads import GraphPayloadCache
+from graph_layout import LayoutWorker
+from graph_lod import LevelOfDetail, stage_nodes, DEFAULT_MAX_NODES, DEFAULT_MAX_EDGES
+from response_encoding import serialize, compress_response, accepted_tokens
+from spread_evaluation import evaluate_seed_sets
+from experiment_grid import ExperimentJobs
+from network_stats import compute_network_stats, file_signature, list_networks, refresh_network_stats
 
 init_db()
+release_connection()
 
 app = Flask(__name__)
-CORS(app)
+# ETag si cursorul de paginare trebuie sa fie vizibile din browser
+CORS(app, expose_headers=["ETag", "X-Next-Cursor"])
 
 DATASET_FOLDER = "../../datasets/csv_files"
 
-# Global model cache
-MODEL_CACHE = {}
+# coordonatele nodurilor, calculate in fundal si salvate langa fiecare retea
+LAYOUTS = LayoutWorker(DATASET_FOLDER)
+
+# grafurile retelelor, pregatite pentru redarea rularilor salvate
+GRAPH_PAYLOADS = GraphPayloadCache(DATASET_FOLDER, layouts=LAYOUTS)
+
+# vederile reduse ale retelelor mari; bugetul cerut de client e limitat la aceste valori
+GRAPH_LOD = LevelOfDetail(DATASET_FOLDER)
+LOD_MAX_NODES = int(os.environ.get("LOD_MAX_NODES", DEFAULT_MAX_NODES))
+LOD_MAX_EDGES = int(os.environ.get("LOD_MAX_EDGES", DEFAULT_MAX_EDGES))
+
+# Global model cache, limitat dupa memorie; modelele evacuate sunt scrise pe disc
+MODEL_CACHE = ModelCache(
+    max_bytes=int(os.environ.get("MODEL_CACHE_MAX_BYTES", 2 * 1024 ** 3)),
+    spill=os.environ.get("MODEL_CACHE_SPILL", "1") == "1",
+    spill_max_bytes=int(os.environ.get("MODEL_CACHE_SPILL_MAX_BYTES", 10 * 1024 ** 3))
+)
+
+# seturile de date ale caror muchii au sens (cine scrie cui / cine are incredere in cine)
+DIRECTED_DATASETS = {"email_TarragonaUni", "filmtrust"}
+
+# numele claselor salvate in algorithm_runs.diffusion_model
+MODEL_CLASS_NAMES = {
+    "linear_threshold": "OptimizedLinearThresholdModel",
+    "independent_cascade": "IndependentCascadeModel"
+}
+MAX_PAGE_SIZE = 1000
+
+# limitele unei cereri /evaluate
+MAX_EVALUATION_SIMULATIONS = int(os.environ.get("MAX_EVALUATION_SIMULATIONS", 100000))
+MAX_EVALUATION_SEED_SETS = 500
+
+# cache-ul de rezultate: euristicile deterministe si rularile cu samanta fixata
+RESULT_CACHE_MAX_BYTES = int(os.environ.get("RESULT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+DETERMINISTIC_ALGORITHMS = {"degree_heuristic", "centrality_heuristic"}
+# parametri care controleaza doar executia, nu si rezultatul
+EXECUTION_ONLY_PARAMS = {"checkpoint", "checkpointInterval", "resume", "useResultCache"}
+
+# semnaturile fisierelor de muchii, recalculate doar cand fisierul se schimba (mtime, dimensiune)
+DATASET_SIGNATURES = {}
+
+def dataset_signature(dataset):
+    """Continutul fisierului de muchii face parte din cheia modelului: un fisier inlocuit
+    nu mai poate fi servit dintr-un model din memorie sau din spill"""
+    dataset_name, dataset_number = dataset.split(' ')
+    path = os.path.join(DATASET_FOLDER, dataset_name, f"{dataset_number}_edges.csv")
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = DATASET_SIGNATURES.get(path)
+    if cached is None or cached[0] != version:
+        cached = (version, file_signature(path))
+        DATASET_SIGNATURES[path] = cached
+    return cached[1]
 
 def get_cache_key(dataset, model_name, params):
 
     model_params = {}
+    if params.get("directed"):
+        model_params["directed"] = True
+    # pragurile LT si probabilitatile trivalente depind de samanta, daca e fixata
+    if params.get("randomSeed") is not None:
+        model_params["random_seed"] = params["randomSeed"]
     if model_name == "linear_threshold":
         model_params["threshold_range"] = params.get("thresholdRange", [0, 0.5])
     elif model_name == "independent_cascade":
         model_params["propagation_probability"] = params.get("propagationProbability", 0.1)
+        model_params["probability_model"] = params.get("probabilityModel", "uniform")
+        if model_params["probability_model"] == "edge_weight":
+            model_params["edge_weight_column"] = params.get("edgeWeightColumn", "weight")
     
     # cheia pentru instanta modelului
-    key_string = f"{dataset}_{model_name}_{json.dumps(model_params, sort_keys=True)}"
+    key_string = f"{dataset}_{dataset_signature(dataset)}_{model_name}_{json.dumps(model_params, sort_keys=True)}"
     
     return hashlib.md5(key_string.encode()).hexdigest()
 
@@ -50,15 +126,24 @@ def initialize_model(G, model_name, params, propagation_prob=0.1):
     if model_name == "linear_threshold":
         from propagation_models import OptimizedLinearThresholdModel
         model_params = {
-            'threshold_range': params.get('thresholdRange', [0, 0.5])
+            'threshold_range': params.get('thresholdRange', [0, 0.5]),
+            'directed': G.is_directed(),
+            'seed': params.get('randomSeed')
         }
         model = OptimizedLinearThresholdModel(nodes, edges, **model_params)
     elif model_name == "independent_cascade":
         from propagation_models import IndependentCascadeModel
         print(f"Propagation probability: {propagation_prob}")
         model_params = {
-            'propagation_probability': propagation_prob
+            'propagation_probability': propagation_prob,
+            'probability_model': params.get('probabilityModel', 'uniform'),
+            'directed': G.is_directed(),
+            'seed': params.get('randomSeed')
         }
+        if model_params['probability_model'] == 'edge_weight':
+            # ponderile vin din coloana din fisierul de muchii, in ordinea lui G.edges()
+            weight_column = params.get('edgeWeightColumn', 'weight')
+            model_params['edge_weights'] = [w for _, _, w in G.edges(data=weight_column, default=1.0)]
 
         model = IndependentCascadeModel(nodes, edges, **model_params)
     else:
@@ -68,28 +153,72 @@ def initialize_model(G, model_name, params, propagation_prob=0.1):
     model._model_id = model_id    
     return model
 
-def run_single_algorithm(algorithm, G, initialized_model, params, dataset, key):
+def model_fingerprint(model):
+    """Hash-ul continutului modelului (praguri/probabilitati), calculat o singura data"""
+    if getattr(model, '_fingerprint', None) is None:
+        digest = hashlib.md5(model.__class__.__name__.encode())
+        digest.update(json.dumps(model.get_model_params(), sort_keys=True).encode())
+        for name, values in sorted(model.get_param_arrays().items()):
+            digest.update(name.encode())
+            digest.update(values.tobytes())
+        model._fingerprint = digest.hexdigest()
+    return model._fingerprint
+
+def get_result_key(algorithm, model, params, key):
+    # doar rularile reproductibile pot fi servite din cache
+    if not params.get('useResultCache', True) or params.get('timeBudgetMs'):
+        return None
+    if algorithm not in DETERMINISTIC_ALGORITHMS and params.get('randomSeed') is None:
+        return None
+
+    inputs = {
+        "algorithm": algorithm,
+        "model_key": key,
+        "model": model_fingerprint(model),
+        "params": {name: value for name, value in params.items() if name not in EXECUTION_ONLY_PARAMS}
+    }
+    return hashlib.md5(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+def prepare_algorithm_inputs(G, initialized_model):
+    """Fisierele temporare cu modelul, nodurile si muchiile; un sweep le scrie o singura data"""
+    import tempfile
+
+    with tempfile.NamedTemporaryFile(mode='wb', suffix='.pkl', delete=False) as model_file:
+        dill.dump(initialized_model, model_file)
+        model_path = model_file.name
+        
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as nodes_file:
+        json.dump(list(G.nodes()), nodes_file)
+        nodes_path = nodes_file.name
+        
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as edges_file:
+        json.dump(list(G.edges()), edges_file)
+        edges_path = edges_file.name
+
+    return {"nodes": nodes_path, "edges": edges_path, "model": model_path}
+
+def cleanup_algorithm_inputs(inputs):
+    for path in inputs.values():
+        try:
+            os.unlink(path)
+        except Exception as e:
+            print(f"[DEBUG] Warning: Failed to clean up temp file {path}: {e}")
+
+def run_single_algorithm(algorithm, G, initialized_model, params, dataset, key, inputs=None):
     try:
 
         start_time = time.time()
         
-        # fisierele temporare pentru pregatirea datelor grafului
+        # fisierele temporare pentru pregatirea datelor grafului, daca apelantul nu le-a pregatit deja
         import tempfile
-        
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.pkl', delete=False) as model_file:
-            dill.dump(initialized_model, model_file)
-            model_path = model_file.name
-            
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as nodes_file:
-            json.dump(list(G.nodes()), nodes_file)
-            nodes_path = nodes_file.name
-            
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as edges_file:
-            json.dump(list(G.edges()), edges_file)
-            edges_path = edges_file.name
+        own_inputs = inputs is None
+        if own_inputs:
+            inputs = prepare_algorithm_inputs(G, initialized_model)
+        nodes_path, edges_path, model_path = inputs["nodes"], inputs["edges"], inputs["model"]
             
+        # algoritmii care isi salveaza structurile pe disc le indexeaza dupa cheia modelului
         with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as params_file:
-            json.dump(params, params_file)
+            json.dump({**params, 'cacheKey': key}, params_file)
             params_path = params_file.name
         
         python_path = sys.executable
@@ -115,13 +244,7 @@ def run_single_algorithm(algorithm, G, initialized_model, params, dataset, key):
         runtime = (time.time() - start_time) * 1000
 
         # stergerea fisierelor temporare
-        try:
-            os.unlink(nodes_path)
-            os.unlink(edges_path)
-            os.unlink(model_path)
-            os.unlink(params_path)
-        except Exception as e:
-            print(f"[DEBUG] Warning: Failed to clean up temp files: {e}")
+        cleanup_algorithm_inputs({"params": params_path, **(inputs if own_inputs else {})})
 
         stdout_lines = [line.strip() for line in result_process.stdout.split('\n') if line.strip()]
         
@@ -149,22 +272,32 @@ def run_single_algorithm(algorithm, G, initialized_model, params, dataset, key):
             if 'total_activated' in stage:
                 total_activated = max(total_activated, stage['total_activated'])
 
-        # inseram datele despre simularea facuta in db
-        insert_algorithm_run(
-            model_id=initialized_model._model_id,
-            algorithm=algorithm,
-            cache_key=key,
-            seed_size=len(seed_nodes),
-            runtime=runtime,
-            spread=total_activated,
-            seed_nodes=list(seed_nodes),
-            stages=algorithm_stages,
-            network_name=dataset,
-            diffusion_model=initialized_model.__class__.__name__,
-            model_params=json.dumps(initialized_model.get_model_params())
-        )
+        # parametrii completi se scriu o singura data pe model, nu la fiecare rulare
+        model_params = initialized_model.get_model_params()
+        if not getattr(initialized_model, '_params_saved', False):
+            insert_model_params(
+                initialized_model._model_id,
+                initialized_model.__class__.__name__,
+                model_params,
+                initialized_model.get_param_arrays()
+            )
+            initialized_model._params_saved = True
+
+        # randul pentru db; apelantul insereaza toate rularile unui sweep odata
+        run_record = {
+            "model_id": initialized_model._model_id,
+            "algorithm": algorithm,
+            "cache_key": key,
+            "seed_size": len(seed_nodes),
+            "runtime": runtime,
+            "spread": total_activated,
+            "seed_nodes": list(seed_nodes),
+            "stages": algorithm_stages,
+            "network_name": dataset,
+            "diffusion_model": initialized_model.__class__.__name__,
+            "model_params": model_params
+        }
 
-        
         return {
             "status": "success",
             "stages": algorithm_stages,
@@ -173,7 +306,8 @@ def run_single_algorithm(algorithm, G, initialized_model, params, dataset, key):
                 "runtime": runtime,
                 "seed_set_size": len(seed_nodes),
                 "seed_nodes": list(seed_nodes)
-            }
+            },
+            "run_record": run_record
         }
 
     except subprocess.CalledProcessError as e:
@@ -190,6 +324,109 @@ def run_single_algorithm(algorithm, G, initialized_model, params, dataset, key):
             "error": str(e)
         }
 
+def run_or_reuse(algorithm, G, initialized_model, params, dataset, key, inputs=None):
+    """Rezultatul pentru un seed size, din cache-ul de rezultate sau dintr-o rulare noua.
+
+    Intoarce (rezultat, rand pentru algorithm_runs); randul e None pentru rezultatele din cache
+    si pentru erori."""
+    seed_size = params['seedSize']
+    result_key = get_result_key(algorithm, initialized_model, params, key)
+    cached = get_cached_result(result_key) if result_key else None
+    if cached is not None:
+        return {
+            "seed_size": seed_size,
+            "status": "success",
+            "metrics": cached["metrics"],
+            "stages": cached["stages"],
+            "cached": True
+        }, None
+
+    algorithm_result = run_single_algorithm(algorithm, G, initialized_model, params, dataset, key, inputs)
+    if algorithm_result["status"] == "error":
+        return {
+            "seed_size": seed_size,
+            "status": "error",
+            "error": algorithm_result["error"]
+        }, None
+
+    if result_key:
+        insert_cached_result(
+            result_key, algorithm, algorithm_result["stages"],
+            algorithm_result["metrics"], RESULT_CACHE_MAX_BYTES
+        )
+    return {
+        "seed_size": seed_size,
+        "status": "success",
+        "metrics": algorithm_result["metrics"],
+        "stages": algorithm_result["stages"]
+    }, algorithm_result["run_record"]
+
+class DatasetError(Exception):
+    """Reteaua sau modelul cerut nu poate fi incarcat; status e codul HTTP al raspunsului"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def get_model_settings(data):
+    # parametrii modelului vin la nivelul cererii, nu in parametrii algoritmului
+    return {
+        **data.get('parameters', {}),
+        'propagationProbability': data.get('propagationProbability', 0.1),
+        'probabilityModel': data.get('probabilityModel', 'uniform'),
+        'edgeWeightColumn': data.get('edgeWeightColumn', 'weight'),
+        'directed': data.get('directed', data['dataset'].split(' ')[0] in DIRECTED_DATASETS)
+    }
+
+def load_network_graph(dataset, model_settings):
+    try:
+        dataset_name, dataset_number = dataset.split(' ')
+    except ValueError:
+        raise DatasetError("Dataset name must be in format 'name number'")
+
+    dataset_filepath = os.path.join(DATASET_FOLDER, f"{dataset_name}/{dataset_number}_edges.csv")
+    if not os.path.exists(dataset_filepath):
+        raise DatasetError(f"Dataset {dataset} not found", 404)
+
+    try:
+        df = pd.read_csv(dataset_filepath)
+    except Exception as e:
+        raise DatasetError(f"Failed to load graph data: {str(e)}")
+
+    G = nx.DiGraph() if model_settings['directed'] else nx.Graph()
+    weight_column = model_settings['edgeWeightColumn']
+    if weight_column in df.columns:
+        G.add_weighted_edges_from(zip(df['source'], df['target'], df[weight_column]), weight=weight_column)
+    elif model_settings['probabilityModel'] == 'edge_weight':
+        raise DatasetError(f"Dataset {dataset} has no '{weight_column}' column")
+    else:
+        G.add_edges_from(list(zip(df['source'], df['target'])))
+    return G
+
+def get_initialized_model(G, dataset, model_name, model_settings):
+    """Modelul din cache sau unul nou, initializat O SINGURA DATA pentru toate scripturile"""
+    cache_key = get_cache_key(dataset, model_name, model_settings)
+    model = MODEL_CACHE.get(cache_key)
+    if model is None:
+        try:
+            model = initialize_model(G, model_name, model_settings, model_settings['propagationProbability'])
+        except Exception as e:
+            raise DatasetError(f"Failed to initialize model: {str(e)}")
+        MODEL_CACHE.put(cache_key, model)
+    return model, cache_key
+
+# grilele de experimente pornite din API, rulate pe rand in fundal
+EXPERIMENTS = ExperimentJobs(sys.modules[__name__], DATASET_FOLDER)
+
+# conexiunea la baza de date se intoarce in pool la sfarsitul fiecarei cereri
+@app.teardown_appcontext
+def release_db_connection(exception):
+    release_connection()
+
+@app.after_request
+def negotiate_encoding(response):
+    return compress_response(response, request.headers.get('Accept-Encoding'))
+
 #endpoint pentru a rula pe rand toti algoritmii
 @app.route("/run-algorithm", methods=["POST"])
 def run_algorithm():
@@ -210,105 +447,86 @@ def run_algorithm():
         selected_model = data['model']
         selected_algorithm = data['algorithm']
         parameters = data.get('parameters', {})
-        if 'propagationProbability' in data:
-         propagation_prob=data['propagationProbability']
-
-        else:
-            propagation_prob=0.1
+        model_settings = get_model_settings(data)
 
-        # generarea cheii pentru a salva in cache modelul
-        cache_key = get_cache_key(selected_dataset, selected_model, parameters)
-        
         seed_sizes = parameters.get('seedSize', [5])
         if not isinstance(seed_sizes, list):
             seed_sizes = [seed_sizes]
 
         try:
-            dataset_name, dataset_number = selected_dataset.split(' ')
-        except ValueError:
-            return jsonify({
-                "status": "error",
-                "error": "Dataset name must be in format 'name number'"
-            }), 400
-
-        dataset_filepath = os.path.join(DATASET_FOLDER, f"{dataset_name}/{dataset_number}_edges.csv")
-        
-        if not os.path.exists(dataset_filepath):
-            return jsonify({
-                "status": "error",
-                "error": f"Dataset {selected_dataset} not found"
-            }), 404
-
-        try:
-            df = pd.read_csv(dataset_filepath)
-            G = nx.Graph()
-            G.add_edges_from(list(zip(df['source'], df['target'])))
-        except Exception as e:
+            G = load_network_graph(selected_dataset, model_settings)
+            initialized_model, cache_key = get_initialized_model(G, selected_dataset, selected_model, model_settings)
+        except DatasetError as e:
             return jsonify({
                 "status": "error",
-                "error": f"Failed to load graph data: {str(e)}"
-            }), 400
-
-        # verificam daca modelul e in cache
-        if cache_key in MODEL_CACHE:
-            initialized_model = MODEL_CACHE[cache_key]
-            model_id = getattr(initialized_model, '_model_id', 'Unknown')
-        else:
-            # initializam modelul O SINGURA DATA pentru toate scripturile
-            try:
-                initialized_model = initialize_model(G, selected_model, parameters, propagation_prob)
-                MODEL_CACHE[cache_key] = initialized_model
-                model_id = getattr(initialized_model, '_model_id', 'Unknown')
-            except Exception as e:
-                return jsonify({
-                    "status": "error",
-                    "error": f"Failed to initialize model: {str(e)}"
-                }), 400
+                "error": str(e)
+            }), e.status
+        model_id = getattr(initialized_model, '_model_id', 'Unknown')
 
         all_results = []
         seed_stages = {}
+        run_records = []
         
-        # rulam algoritmii cu modelul deja initializat
-        for seed_size in seed_sizes:
-            current_params = parameters.copy()
-            current_params['seedSize'] = seed_size
-            
-            algorithm_result = run_single_algorithm(
-                selected_algorithm, 
-                G, 
-                initialized_model,
-                current_params,selected_dataset,cache_key
-            )
-            
-            if algorithm_result["status"] == "error":
-                all_results.append({
-                    "seed_size": seed_size,
-                    "status": "error",
-                    "error": algorithm_result["error"]
-                })
-                continue
-            
-            seed_stages[seed_size] = algorithm_result["stages"]
-            
-            all_results.append({
-                "seed_size": seed_size,
-                "status": "success",
-                "metrics": algorithm_result["metrics"],
-                "stages": algorithm_result["stages"]
-            })
+        # rulam algoritmii cu modelul deja initializat; la mai multe seed size-uri intrarile se scriu o data
+        inputs = prepare_algorithm_inputs(G, initialized_model) if len(seed_sizes) > 1 else None
+        try:
+            for seed_size in seed_sizes:
+                current_params = parameters.copy()
+                current_params['seedSize'] = seed_size
+
+                result, run_record = run_or_reuse(
+                    selected_algorithm, G, initialized_model, current_params, selected_dataset, cache_key, inputs
+                )
+                all_results.append(result)
+                if result["status"] == "success":
+                    seed_stages[seed_size] = result["stages"]
+                if run_record is not None:
+                    run_records.append(run_record)
+        finally:
+            if inputs is not None:
+                cleanup_algorithm_inputs(inputs)
+
+        insert_algorithm_runs(run_records)
 
         response = {
             "status": "success",
-            "nodes": list(G.nodes()),
-            "edges": list(G.edges()),
             "algorithm": selected_algorithm,
             "results": all_results,
-            "stages_by_seed": seed_stages,
             "model_id": model_id,
             "cache_key": cache_key
         }
+
+        # vederea redusa pastreaza seed-urile si nodurile activate; metricile raman cele exacte
+        view = None
+        if data.get('view', request.args.get('view')) == 'lod':
+            keep_nodes = stage_nodes(*(result.get("stages") for result in all_results))
+            view = GRAPH_LOD.view(selected_dataset, keep_nodes, *lod_budget({**request.args, **data}))
+
+        if view is not None:
+            nodes = view["nodes"]
+            edge_index = view["edges"]
+            response["lod"] = view["lod"]
+        else:
+            nodes = list(G.nodes())
+            node_position = {node: i for i, node in enumerate(nodes)}
+            edge_index = [(node_position[u], node_position[v]) for u, v in G.edges()]
+        response["nodes"] = nodes
+
+        # forma compacta: muchiile ca indici in lista de noduri si etapele o singura data, in results
+        if data.get('compact') or request.args.get('compact') == '1':
+            response["edges"] = [int(i) for edge in edge_index for i in edge]
+            response["edges_format"] = "index_pairs"
+        else:
+            response["edges"] = [(nodes[u], nodes[v]) for u, v in edge_index]
+            response["stages_by_seed"] = seed_stages
+
+        # cu layout-ul precalculat frontend-ul poate desena graful imediat
+        LAYOUTS.request(selected_dataset)
+        positions = LAYOUTS.positions_for(selected_dataset, nodes)
+        if positions is not None:
+            response["positions"] = positions.round(2).ravel().tolist()
         
-        return jsonify(response)
+        return serialize(response, request.headers.get('Accept'))
 
     except Exception as e:
         return jsonify({
@@ -316,6 +534,107 @@ def run_algorithm():
             "error": f"Unexpected server error: {str(e)}"
         }), 500
     
+#endpoint pentru spread-ul asteptat al mai multor seed set-uri, cu intervale de incredere
+@app.route("/evaluate", methods=["POST"])
+def evaluate():
+    data = request.json or {}
+    if not all(field in data for field in ('dataset', 'model')):
+        return jsonify({"status": "error", "error": "Missing required fields. Need: ['dataset', 'model']"}), 400
+    selected_dataset = data['dataset']
+
+    # parametrii numerici sunt validati inainte de orice calcul
+    def optional(name, convert):
+        return convert(data[name]) if data.get(name) is not None else None
+    try:
+        run_ids = [int(run_id) for run_id in data.get('runIds', [])]
+        num_simulations = max(1, min(int(data.get('numSimulations', 1000)), MAX_EVALUATION_SIMULATIONS))
+        confidence = float(data.get('confidence', 0.95))
+        max_steps = optional('maxSteps', int)
+        relative_error = optional('relativeError', float)
+        simulation_seed = optional('simulationSeed', int)
+    except (TypeError, ValueError):
+        return jsonify({
+            "status": "error",
+            "error": "runIds, numSimulations, maxSteps and simulationSeed must be integers, confidence and relativeError numbers"
+        }), 400
+    if not 0 < confidence < 1:
+        return jsonify({"status": "error", "error": "confidence must be between 0 and 1"}), 400
+
+    # seturile vin direct (liste sau {label, nodes}) sau ca id-uri de rulari salvate
+    labels, seed_sets = [], []
+    for i, item in enumerate(data.get('seedSets', [])):
+        if isinstance(item, dict):
+            labels.append(item.get('label', f"set {i}"))
+            seed_sets.append(item.get('nodes', []))
+        else:
+            labels.append(f"set {i}")
+            seed_sets.append(item)
+    for run_id in run_ids:
+        row = get_algorithm_run(run_id)
+        if row is None:
+            return jsonify({"status": "error", "error": f"Run {run_id} not found"}), 404
+        if row["network_name"] != selected_dataset:
+            return jsonify({"status": "error", "error": f"Run {run_id} was made on {row['network_name']}"}), 400
+        labels.append(f"run {run_id} ({row['algorithm']})")
+        seed_sets.append(row["seed_nodes"])
+
+    if not seed_sets or len(seed_sets) > MAX_EVALUATION_SEED_SETS:
+        return jsonify({
+            "status": "error",
+            "error": f"Need between 1 and {MAX_EVALUATION_SEED_SETS} seed sets"
+        }), 400
+    model_settings = get_model_settings(data)
+    try:
+        G = load_network_graph(selected_dataset, model_settings)
+        model, cache_key = get_initialized_model(G, selected_dataset, data['model'], model_settings)
+    except DatasetError as e:
+        return jsonify({"status": "error", "error": str(e)}), e.status
+
+    evaluation = evaluate_seed_sets(
+        model, seed_sets,
+        num_simulations=num_simulations,
+        max_steps=max_steps,
+        seed=simulation_seed,
+        confidence=confidence,
+        relative_error=relative_error
+    )
+    for label, estimate in zip(labels, evaluation["estimates"]):
+        estimate["label"] = label
+
+    return serialize({
+        "status": "success",
+        "dataset": selected_dataset,
+        "model_id": getattr(model, '_model_id', 'Unknown'),
+        "cache_key": cache_key,
+        **evaluation
+    }, request.headers.get('Accept'))
+
+#endpoint pentru o grila de experimente: retele x modele x algoritmi x seed size-uri
+@app.route("/experiments", methods=["POST"])
+def start_experiment():
+    try:
+        job = EXPERIMENTS.submit(request.json)
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "error": str(e)
+        }), 400
+    return jsonify({
+        "status": "success",
+        "experiment_id": job["experiment_id"],
+        "total_cells": job["total_cells"]
+    }), 202
+
+@app.route("/experiments/<experiment_id>", methods=["GET"])
+def get_experiment(experiment_id):
+    job = EXPERIMENTS.get(experiment_id)
+    if job is None:
+        return jsonify({
+            "status": "error",
+            "error": f"Experiment {experiment_id} not found"
+        }), 404
+    return serialize({"status": "success", "experiment": job}, request.headers.get('Accept'))
+
 #endpoint pentru salvarea datelor despre retelele de grafuri
 @app.route("/save-network-stats", methods=["POST"])
 def save_network_stats():
@@ -330,22 +649,29 @@ def save_network_stats():
         if not os.path.exists(nodes_path) or not os.path.exists(edges_path):
             return jsonify({"error": f"File(s) not found: {nodes_path}, {edges_path}"}), 400
 
-        df_edges = pd.read_csv(edges_path)
-        G = nx.Graph()
-        G.add_edges_from(zip(df_edges['source'], df_edges['target']))
+        # statisticile se recalculeaza doar daca fisierul de muchii s-a schimbat
+        name = dataset_name + " " + number
+        signature = file_signature(edges_path)
+        if not data.get("force") and get_network_signatures().get(name) == signature:
+            return jsonify({"status": "success", "message": "Network stats are up to date"})
 
-        num_nodes = G.number_of_nodes()
-        num_edges = G.number_of_edges()
-        avg_degree = sum(dict(G.degree()).values()) / num_nodes
-        clustering = nx.average_clustering(G)
-        deg_dist = json.dumps(nx.degree_histogram(G)) # distribuția gradelor
-
-        insert_network_stats(dataset_name + " " + number, num_nodes, num_edges, avg_degree, clustering, deg_dist)
+        stats = compute_network_stats(edges_path)
+        insert_network_stats(
+            name, stats["num_nodes"], stats["num_edges"], stats["average_degree"], stats["clustering_coeff"],
+            json.dumps(stats["degree_distribution"]), extra_stats=stats["extra"], source_signature=signature
+        )
         
         return jsonify({"status": "success", "message": "Network stats saved successfully"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
     
+#endpoint pentru recalcularea statisticilor tuturor retelelor (doar cele noi sau modificate)
+@app.route("/refresh-network-stats", methods=["POST"])
+def refresh_network_stats_endpoint():
+    data = request.get_json(silent=True) or {}
+    updated, failed = refresh_network_stats(DATASET_FOLDER, data.get("processes"), data.get("force", False))
+    return jsonify({"status": "success" if not failed else "error", "updated": updated, "failed": failed})
+
 #endpoint pentru afisarea datelor despre retelele de grafuri
 @app.route("/datasets-info", methods=["GET"])
 def get_datasets_info():
@@ -359,63 +685,104 @@ def get_datasets_info():
                 "num_edges": row[3],
                 "average_degree": row[4],
                 "clustering_coeff": row[5],
-                "degree_distribution": json.loads(row[6])
+                "degree_distribution": json.loads(row[6]),
+                **(json.loads(row[7]) if row[7] else {})
             } for row in rows
         ]
         return jsonify({"status": "success", "datasets": datasets}), 200
     except Exception as e:
         return jsonify({"status": "error", "error": str(e)}), 500
     
+def normalize_timestamp(value):
+    # sqlite salveaza 'YYYY-MM-DD HH:MM:SS', acceptam si forma ISO
+    return value.replace('T', ' ').rstrip('Z') if value else None
+
+def run_filter_args(args):
+    model = args.get('model')
+    return {
+        "network": args.get('network'),
+        "algorithm": args.get('algorithm'),
+        "model": MODEL_CLASS_NAMES.get(model, model),
+        "since": normalize_timestamp(args.get('since')),
+        "until": normalize_timestamp(args.get('until'))
+    }
+
+def page_args(args):
+    """limit si cursorul 'timestamp|id' al ultimului rand din pagina precedenta"""
+    limit = args.get('limit', type=int)
+    if limit is not None:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+    after = None
+    cursor = args.get('cursor')
+    if cursor:
+        timestamp, _, run_id = cursor.rpartition('|')
+        after = (timestamp, int(run_id))
+    return after, limit
+
+def lod_budget(options):
+    """maxNodes/maxEdges din cerere, in limitele configurate"""
+    max_nodes = int(options.get('maxNodes') or LOD_MAX_NODES)
+    max_edges = int(options.get('maxEdges') or LOD_MAX_EDGES)
+    return max(1, min(max_nodes, LOD_MAX_NODES)), max(0, min(max_edges, LOD_MAX_EDGES))
+
+def next_cursor(rows, limit, timestamp_of, id_of):
+    if limit is None or len(rows) < limit:
+        return None
+    return f"{timestamp_of(rows[-1])}|{id_of(rows[-1])}"
+
 #endpoint pt a returna toate datele despre algoritmi impreune cu datele despre retele
 @app.route('/statistics', methods=['GET'])
 def get_statistics():
-    conn = sqlite3.connect('networks.db')
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-
-    query = '''
-        SELECT 
-            ar.id, ar.algorithm, ar.seed_size, ar.runtime, ar.spread, ar.timestamp,
-            ar.network_name, ar.diffusion_model,ar.model_params,
-            ns.num_nodes, ns.num_edges, ns.average_degree, ns.clustering_coeff
-        FROM algorithm_runs ar
-        LEFT JOIN network_stats ns ON ar.network_name = ns.name
-        ORDER BY ar.timestamp DESC
-    '''
-
-    cursor.execute(query)
-    rows = cursor.fetchall()
-    conn.close()
-
-    results = [dict(row) for row in rows]
-    return jsonify({'stats': results})
-
+    try:
+        after, limit = page_args(request.args)
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+
+    rows = get_run_statistics(after=after, limit=limit, **run_filter_args(request.args))
+    return jsonify({
+        'stats': rows,
+        'next_cursor': next_cursor(rows, limit, lambda row: row['timestamp'], lambda row: row['id'])
+    })
+
+#endpoint pentru statisticile agregate pe (algoritm, retea, seed_size, model, probabilitate)
+@app.route('/statistics/aggregates', methods=['GET'])
+def get_statistics_aggregates():
+    return jsonify({'aggregates': get_run_aggregates(**run_filter_args(request.args))})
+
+
+#endpoint pentru starea cache-ului de modele
+@app.route('/model-cache-stats', methods=['GET'])
+def get_model_cache_stats():
+    return jsonify(MODEL_CACHE.stats())
+
+#endpoint pentru layout-urile aflate in calcul sau esuate
+@app.route('/layout-status', methods=['GET'])
+def get_layout_status():
+    return jsonify(LAYOUTS.status())
+
+#endpoint pentru parametrii completi ai unui model (pragurile/probabilitatile neuniforme)
+@app.route('/model-params/<model_id>', methods=['GET'])
+def get_model_params_endpoint(model_id):
+    stored = get_model_params(model_id)
+    if stored is None:
+        return jsonify({"error": "Not found"}), 404
+
+    return jsonify({
+        "model_id": model_id,
+        "diffusion_model": stored["diffusion_model"],
+        "params": stored["summary"],
+        "arrays": {name: values.tolist() for name, values in stored["arrays"].items()}
+    })
 
 #endpoint-uri pentru returnarea datelor necesare la animarea simularilor precedente
 @app.route('/saved-runs', methods=['GET'])
 def get_saved_runs():
-    conn = sqlite3.connect('networks.db')
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT 
-            ar.id, 
-            ar.algorithm, 
-            ar.seed_size, 
-            ar.network_name, 
-            ar.diffusion_model, 
-            ar.timestamp,
-            ar.runtime, 
-            ar.spread,
-            ns.num_nodes,
-            ns.num_edges
-        FROM algorithm_runs ar
-        LEFT JOIN network_stats ns ON ar.network_name = ns.name
-        ORDER BY ar.timestamp DESC
-    ''')
-    
-    runs = cursor.fetchall()
-    conn.close()
+    try:
+        after, limit = page_args(request.args)
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+
+    runs = get_saved_run_summaries(after=after, limit=limit, **run_filter_args(request.args))
     
     result = [{
         "id": row[0],
@@ -430,49 +797,88 @@ def get_saved_runs():
         "total_edges": row[9]   # From network_stats
     } for row in runs]
 
-    return jsonify(result)
+    response = jsonify(result)
+    # lista ramane corpul raspunsului; cursorul paginii urmatoare vine in header
+    cursor = next_cursor(runs, limit, lambda row: row[5], lambda row: row[0])
+    if cursor:
+        response.headers['X-Next-Cursor'] = cursor
+    return response
 
 @app.route('/saved-runs/<int:run_id>', methods=['GET'])
 def get_saved_run(run_id):
-    conn = sqlite3.connect('networks.db')
-    cursor = conn.cursor()
-    cursor.execute('SELECT seed_nodes, stages, algorithm, network_name FROM algorithm_runs WHERE id = ?', (run_id,))
-    row = cursor.fetchone()
-    conn.close()
-
-    if row:
-        project_root = "C:/Users/Antonia/Desktop/Influence Maximization models/Influence-Maximization"
-        network, network_id = row[3].split()
-        base_path = os.path.join(project_root, "datasets", "csv_files", network)
-
-        nodes_file = os.path.join(base_path, f"{network_id}_nodes.csv")
-        edges_file = os.path.join(base_path, f"{network_id}_edges.csv")
-
-        nodes = []
-        edges = []
-        with open(nodes_file, newline='') as f:
-            reader = csv.DictReader(f)
-            for r in reader:
-                nodes.append(r['node_id'])
-
-        with open(edges_file, newline='') as f:
-            reader = csv.DictReader(f)
-            for r in reader:
-                edges.append([r['source'], r['target']])
-
-        return jsonify({
-            "seed_nodes": eval(row[0]),
-            "stages": eval(row[1]),
-            "algorithm": row[2],
-            "graph_data": {
-                "nodes": nodes,
-                "edges": edges
-            }
-        })
+    row = get_algorithm_run(run_id)
+    if row is None:
+        return jsonify({"error": "Not found"}), 404
+
+    # graful retelei vine separat, din /graph-payload, si poate fi refolosit intre rulari
+    result = {
+        "seed_nodes": row["seed_nodes"],
+        "stages": row["stages"],
+        "algorithm": row["algorithm"],
+        "network_name": row["network_name"]
+    }
+
+    if request.args.get('include_graph') == '1' and request.args.get('view') == 'lod':
+        keep_nodes = [*row["seed_nodes"], *stage_nodes(row["stages"])]
+        view = GRAPH_LOD.view(row["network_name"], keep_nodes, *lod_budget(request.args))
+        if view is None:
+            return jsonify({"error": f"Dataset {row['network_name']} not found"}), 404
+        nodes = view["nodes"]
+        result["graph_data"] = {
+            "nodes": nodes,
+            "edges": [[nodes[u], nodes[v]] for u, v in view["edges"]],
+            "lod": view["lod"]
+        }
+        positions = LAYOUTS.positions_for(row["network_name"], nodes)
+        if positions is not None:
+            result["graph_data"]["positions"] = positions.round(2).ravel().tolist()
+    elif request.args.get('include_graph') == '1':
+        payload = GRAPH_PAYLOADS.get(row["network_name"])
+        if payload is None:
+            return jsonify({"error": f"Dataset {row['network_name']} not found"}), 404
+        graph = json.loads(gzip.decompress(payload[2]))
+        nodes = graph["nodes"]
+        flat_edges = graph["edges"]
+        result["graph_data"] = {
+            "nodes": nodes,
+            "edges": [[nodes[flat_edges[i]], nodes[flat_edges[i + 1]]] for i in range(0, len(flat_edges), 2)]
+        }
+        if "positions" in graph:
+            result["graph_data"]["positions"] = graph["positions"]
 
-    return jsonify({"error": "Not found"}), 404
+    return jsonify(result)
 
+#endpoint pentru graful unei retele (noduri + muchii ca indici), cu ETag/Last-Modified
+@app.route('/graph-payload/<path:network>', methods=['GET'])
+def get_graph_payload(network):
+    # numele ajunge in caile de citire si de scriere ale cache-ului, deci acceptam doar retelele existente
+    if network not in {name for name, _ in list_networks(DATASET_FOLDER)}:
+        return jsonify({"error": f"Dataset {network} not found"}), 404
+    payload = GRAPH_PAYLOADS.get(network)
+    if payload is None:
+        return jsonify({"error": f"Dataset {network} not found"}), 404
+
+    # payload-ul e deja comprimat; il decomprimam doar pentru clientii fara gzip
+    etag, last_modified, body = payload
+    if "gzip" in accepted_tokens(request.headers.get('Accept-Encoding')):
+        response = flask.Response(body, mimetype='application/json')
+        response.headers["Content-Encoding"] = "gzip"
+        response.set_etag(etag, weak=True)
+    else:
+        response = flask.Response(gzip.decompress(body), mimetype='application/json')
+        response.set_etag(etag)
+    response.vary.add("Accept-Encoding")
+    response.last_modified = last_modified
+    # browserul pastreaza payload-ul, dar il revalideaza la fiecare folosire
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 
 if __name__ == "__main__":
+    # statisticile retelelor se pot calcula la pornire, in fundal, fara sa intarzie serverul
+    if os.environ.get("NETWORK_STATS_AT_STARTUP") == "1":
+        threading.Thread(target=refresh_network_stats, args=(DATASET_FOLDER,), daemon=True).start()
+    if os.environ.get("LAYOUTS_AT_STARTUP") == "1":
+        for network, _ in list_networks(DATASET_FOLDER):
+            LAYOUTS.request(network)
     app.run(port=5000, debug=True)
\ No newline at end of file
@@ -0,0 +1,319 @@
+import os
+import sys
+import json
+import time
+import uuid
+import signal
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+import dill
+import numpy as np
+import pandas as pd
+import networkx as nx
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.append(os.path.join(BACKEND_DIR, 'models'))
+sys.path.append(BACKEND_DIR)
+
+from propagation_models import OptimizedLinearThresholdModel, IndependentCascadeModel
+from network_stats import DEFAULT_DATASET_FOLDER, list_networks
+from experiment_grid import ALGORITHM_FOLDER, list_algorithms
+
+COUNTED_RUN = os.path.join(BENCHMARK_DIR, 'counted_run.py')
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+RESULTS_VERSION = 1
+
+# aceleasi retele orientate ca in app.py
+DIRECTED_DATASETS = {"email_TarragonaUni", "filmtrust"}
+
+MODELS = {
+    "independent_cascade": lambda nodes, edges, directed, seed: IndependentCascadeModel(
+        nodes, edges, 0.1, directed=directed, seed=seed
+    ),
+    "linear_threshold": lambda nodes, edges, directed, seed: OptimizedLinearThresholdModel(
+        nodes, edges, threshold_range=[0, 0.5], directed=directed, seed=seed
+    ),
+}
+
+# o rulare de benchmark porneste la rece: fara warm start, checkpoint-uri sau scoruri salvate
+COLD_START_PARAMS = {"warmStart": False, "checkpoint": False, "resume": False, "centralityCache": False}
+
+# metricile comparate cu baseline-ul: (camp, toleranta relativa implicita, prag absolut sub care ignoram diferenta)
+COMPARED_METRICS = (
+    ("wall_time", 0.20, 0.05),
+    ("cpu_time", 0.20, 0.05),
+    ("peak_rss_mb", 0.10, 5.0),
+    ("mc_simulations", 0.0, 0),
+    ("rr_sets", 0.0, 0),
+)
+
+def load_network(edges_file, directed):
+    """Nodurile si muchiile in ordinea folosita de app.py (prin networkx)"""
+    df = pd.read_csv(edges_file, usecols=['source', 'target'])
+    G = nx.DiGraph() if directed else nx.Graph()
+    G.add_edges_from(zip(df['source'].tolist(), df['target'].tolist()))
+    return list(G.nodes()), list(G.edges())
+
+def run_measured(cmd, timeout):
+    """Ruleaza comanda; (depasit timpul, cod de iesire, timp, rusage, stdout, stderr).
+
+    wait4 da timpul CPU doar pentru acest copil (plus Pool-urile lui), nu pentru toti
+    copiii procesului curent, deci rularile nu se amesteca intre ele."""
+    stdout = tempfile.TemporaryFile()
+    stderr = tempfile.TemporaryFile()
+    start = time.perf_counter()
+    process = subprocess.Popen(cmd, stdout=stdout, stderr=stderr, cwd=BACKEND_DIR, start_new_session=True)
+    deadline = start + timeout if timeout else None
+    while True:
+        pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+        if pid:
+            break
+        if deadline and time.perf_counter() > deadline:
+            os.killpg(process.pid, signal.SIGKILL)
+            pid, status, rusage = os.wait4(process.pid, 0)
+            status = None
+            break
+        time.sleep(0.01)
+    wall_time = time.perf_counter() - start
+    process.returncode = -1 if status is None else os.waitstatus_to_exitcode(status)
+
+    stdout.seek(0)
+    stderr.seek(0)
+    return status is None, process.returncode, wall_time, rusage, stdout.read().decode(), stderr.read().decode()
+
+def spread_of(stdout):
+    """Spread-ul si numarul de seed-uri, calculate ca in app.py din etapele afisate de algoritm"""
+    lines = [line.strip() for line in stdout.split('\n') if line.strip()]
+    output = json.loads(lines[-1])
+    stages = output.get("stages", []) if isinstance(output, dict) else output
+    seed_nodes = set()
+    spread = 0
+    for stage in stages:
+        seed_nodes.update(stage.get('selected_nodes', []))
+        spread = max(spread, stage.get('total_activated', 0))
+    return spread, len(seed_nodes)
+
+def run_once(algorithm, inputs, model, params, timeout):
+    # id nou pentru fiecare rulare: starea salvata de o rulare anterioara nu poate fi gasita
+    model._model_id = str(uuid.uuid4())
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_path = os.path.join(tmp_dir, 'model.pkl')
+        params_path = os.path.join(tmp_dir, 'params.json')
+        counts_path = os.path.join(tmp_dir, 'counts.json')
+        with open(model_path, 'wb') as f:
+            dill.dump(model, f)
+        with open(params_path, 'w') as f:
+            json.dump(params, f)
+
+        cmd = [
+            sys.executable, COUNTED_RUN, counts_path,
+            os.path.join(ALGORITHM_FOLDER, f'{algorithm}.py'),
+            inputs["nodes"], inputs["edges"], model_path, params_path
+        ]
+        timed_out, returncode, wall_time, rusage, stdout, stderr = run_measured(cmd, timeout)
+
+        # memoria vine din counted_run.py; ru_maxrss ar include si memoria acestui proces
+        run = {"wall_time": wall_time, "cpu_time": rusage.ru_utime + rusage.ru_stime, "peak_rss_mb": None}
+        if timed_out:
+            return {**run, "status": "timeout", "error": f"Exceeded {timeout}s"}
+        counts = {}
+        if os.path.exists(counts_path):
+            with open(counts_path, 'r') as f:
+                counts = json.load(f)
+        run["peak_rss_mb"] = counts.pop("peak_rss_mb", None)
+        if returncode != 0:
+            return {**run, "status": "error", "error": stderr.strip().splitlines()[-1] if stderr.strip() else f"exit code {returncode}"}
+        try:
+            spread, seed_set_size = spread_of(stdout)
+        except Exception as e:
+            return {**run, "status": "error", "error": f"Unreadable algorithm output: {e}"}
+        return {**run, **counts, "status": "success", "spread": spread, "seed_set_size": seed_set_size}
+
+def summarize(runs):
+    """O singura inregistrare din repetari: mediana timpilor, maximul memoriei"""
+    failed = [run for run in runs if run["status"] != "success"]
+    if failed:
+        return {key: failed[0][key] for key in ("status", "error", "wall_time", "cpu_time", "peak_rss_mb")}
+
+    summary = {
+        "status": "success",
+        "wall_time": statistics.median(run["wall_time"] for run in runs),
+        "cpu_time": statistics.median(run["cpu_time"] for run in runs),
+        "peak_rss_mb": max((run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None), default=None),
+        "wall_times": [run["wall_time"] for run in runs]
+    }
+    for field in ("spread", "seed_set_size", "mc_simulations", "propagation_steps", "rr_sets"):
+        summary[field] = runs[0][field]
+    # cu aceeasi samanta repetarile trebuie sa dea exact acelasi rezultat
+    summary["reproducible"] = all(run["spread"] == runs[0]["spread"] for run in runs)
+    return summary
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+def run_suite(config, dataset_folder=DEFAULT_DATASET_FOLDER, log=print):
+    edge_files = dict(list_networks(dataset_folder))
+    results = []
+    for dataset in config["datasets"]:
+        directed = dataset.split(' ')[0] in DIRECTED_DATASETS
+        nodes, edges = load_network(edge_files[dataset], directed)
+
+        # nodurile si muchiile sunt scrise o singura data pe retea
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            inputs = {"nodes": os.path.join(tmp_dir, 'nodes.json'), "edges": os.path.join(tmp_dir, 'edges.json')}
+            with open(inputs["nodes"], 'w') as f:
+                json.dump(nodes, f)
+            with open(inputs["edges"], 'w') as f:
+                json.dump(edges, f)
+
+            for model_name in config["models"]:
+                model = MODELS[model_name](nodes, edges, directed, config["seed"])
+                for algorithm in config["algorithms"]:
+                    for seed_size in config["seed_sizes"]:
+                        params = {
+                            **COLD_START_PARAMS,
+                            **config["params"],
+                            "seedSize": seed_size,
+                            "randomSeed": config["seed"],
+                            "numProcesses": config["processes"]
+                        }
+                        runs = [run_once(algorithm, inputs, model, params, config["timeout"]) for _ in range(config["repeats"])]
+                        result = {
+                            "dataset": dataset,
+                            "model": model_name,
+                            "algorithm": algorithm,
+                            "seed_size": seed_size,
+                            **summarize(runs)
+                        }
+                        results.append(result)
+                        log(format_result(result))
+    return results
+
+def result_key(result):
+    return (result["dataset"], result["model"], result["algorithm"], result["seed_size"])
+
+def compare(results, baseline, tolerance_scale=1.0):
+    """Regresiile fata de baseline: metricile care cresc peste toleranta, spread-urile schimbate
+    si rularile care nu mai reusesc"""
+    baseline_results = {result_key(result): result for result in baseline["results"]}
+    findings = []
+    for result in results:
+        previous = baseline_results.get(result_key(result))
+        if previous is None or previous["status"] != "success":
+            continue
+        if result["status"] != "success":
+            findings.append({"key": result_key(result), "metric": "status", "baseline": "success", "current": result["status"]})
+            continue
+        for metric, tolerance, min_delta in COMPARED_METRICS:
+            before, after = previous.get(metric), result.get(metric)
+            if before is None or after is None:
+                continue
+            if after - before > max(min_delta, before * tolerance * tolerance_scale):
+                findings.append({"key": result_key(result), "metric": metric, "baseline": before, "current": after})
+        # aceeasi configuratie si aceeasi samanta: un spread diferit inseamna ca s-a schimbat rezultatul
+        if result["spread"] != previous["spread"]:
+            findings.append({"key": result_key(result), "metric": "spread", "baseline": previous["spread"], "current": result["spread"]})
+    return findings
+
+def format_result(result):
+    name = f"{result['dataset']:<24} {result['model']:<20} {result['algorithm']:<22} k={result['seed_size']:<4}"
+    if result["status"] != "success":
+        return f"{name} {result['status']}: {result['error']}"
+    rss = f"{result['peak_rss_mb']:7.1f}MB" if result['peak_rss_mb'] is not None else "      ?"
+    return (
+        f"{name} wall {result['wall_time']:8.2f}s  cpu {result['cpu_time']:8.2f}s  rss {rss}  "
+        f"mc {result['mc_simulations']:>9}  rr {result['rr_sets']:>8}  spread {result['spread']}"
+        + ("" if result["reproducible"] else "  (NOT REPRODUCIBLE)")
+    )
+
+def parse_param(text):
+    key, _, value = text.partition('=')
+    try:
+        return key, json.loads(value)
+    except json.JSONDecodeError:
+        return key, value
+
+def main():
+    networks = [network for network, _ in list_networks(DEFAULT_DATASET_FOLDER)]
+    algorithms = list_algorithms()
+
+    parser = argparse.ArgumentParser(description="Benchmark every algorithm under both diffusion models on the bundled datasets")
+    parser.add_argument('--datasets', nargs='+', default=networks, choices=networks, metavar='DATASET')
+    parser.add_argument('--models', nargs='+', default=list(MODELS), choices=list(MODELS))
+    parser.add_argument('--algorithms', nargs='+', default=algorithms, choices=algorithms)
+    parser.add_argument('--seed-sizes', type=int, nargs='+', default=[10])
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--processes', type=int, default=1, help="numProcesses for the parallel algorithms; part of the result, keep it fixed between runs")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for the models and the algorithms")
+    parser.add_argument('--param', action='append', default=[], metavar='KEY=VALUE', help="extra algorithm parameter, e.g. numSimulations=50")
+    parser.add_argument('--timeout', type=float, default=1800, help="seconds per run; 0 disables the limit")
+    parser.add_argument('--output', help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument('--baseline', help="results file to compare against; regressions make the exit code 1")
+    parser.add_argument('--tolerance-scale', type=float, default=1.0, help="multiplies the relative tolerances of the comparison")
+    args = parser.parse_args()
+
+    config = {
+        "datasets": args.datasets,
+        "models": args.models,
+        "algorithms": args.algorithms,
+        "seed_sizes": args.seed_sizes,
+        "repeats": max(1, args.repeats),
+        "processes": args.processes,
+        "seed": args.seed,
+        "params": dict(parse_param(text) for text in args.param),
+        "timeout": args.timeout
+    }
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        differences = [key for key in ("seed", "processes", "params") if baseline["config"].get(key) != config[key]]
+        if differences:
+            print(f"Warning: baseline was recorded with a different {', '.join(differences)}", file=sys.stderr)
+
+    started_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+    results = run_suite(config)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{started_at.replace(':', '')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            "version": RESULTS_VERSION,
+            "started_at": started_at,
+            "environment": environment(),
+            "config": config,
+            "results": results
+        }, f, indent=2)
+    print(f"Wrote {len(results)} results to {output}")
+
+    failed = sum(result["status"] != "success" for result in results)
+    if failed:
+        print(f"{failed} runs failed or timed out")
+
+    if baseline is not None:
+        findings = compare(results, baseline, args.tolerance_scale)
+        for finding in findings:
+            print(f"REGRESSION {' / '.join(map(str, finding['key']))}: {finding['metric']} {finding['baseline']} -> {finding['current']}")
+        print(f"{len(findings)} regressions against {args.baseline}")
+        if findings:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import json
+import runpy
+import functools
+import multiprocessing as mp
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'algorithms')))
+
+from propagation_models import OptimizedLinearThresholdModel, IndependentCascadeModel, LiveEdgeCoins
+
+COUNTERS = ("mc_simulations", "propagation_steps", "rr_sets")
+
+# memorie partajata: procesele din Pool-urile algoritmilor sunt create prin fork si aduna in acelasi loc
+counts = mp.Array('q', len(COUNTERS))
+
+def counted(func, counter):
+    slot = COUNTERS.index(counter)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with counts.get_lock():
+            counts[slot] += 1
+        return func(*args, **kwargs)
+    return wrapper
+
+def install_counters():
+    """O simulare Monte Carlo e fie un trace(), fie o simulare cu monedele ei (LiveEdgeCoins),
+    ca in CELF si greedy; propagate() e un singur pas dintr-o astfel de simulare"""
+    for model_class in (OptimizedLinearThresholdModel, IndependentCascadeModel):
+        model_class.trace = counted(model_class.trace, "mc_simulations")
+        model_class.propagate = counted(model_class.propagate, "propagation_steps")
+        model_class.sample_rr_set = counted(model_class.sample_rr_set, "rr_sets")
+    LiveEdgeCoins.__init__ = counted(LiveEdgeCoins.__init__, "mc_simulations")
+
+def peak_rss_mb():
+    """VmHWM-ul procesului: spre deosebire de ru_maxrss, porneste de la zero dupa exec si nu
+    include memoria procesului care ne-a lansat"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+def main():
+    if len(sys.argv) < 3:
+        raise SystemExit("Usage: python counted_run.py <counts_file> <algorithm_script> [script args...]")
+    counts_file, script = sys.argv[1], sys.argv[2]
+    install_counters()
+    sys.argv = [script] + sys.argv[3:]
+    try:
+        runpy.run_path(script, run_name="__main__")
+    finally:
+        with open(counts_file, 'w') as f:
+            json.dump({**dict(zip(COUNTERS, counts[:])), "peak_rss_mb": peak_rss_mb()}, f)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import sys
+import os
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models')))
+
+from propagation_models import OptimizedLinearThresholdModel, IndependentCascadeModel
+
+MODELS = {
+    "linear_threshold": lambda nodes, edges: OptimizedLinearThresholdModel(nodes, edges),
+    "independent_cascade": lambda nodes, edges: IndependentCascadeModel(nodes, edges, 0.1),
+}
+
+def random_graph(num_edges, avg_degree, seed=None):
+    """Graf aleator cu numarul dat de muchii; numarul de noduri rezulta din gradul mediu"""
+    rng = np.random.default_rng(seed)
+    num_nodes = max(2, int(2 * num_edges / avg_degree))
+    src = rng.integers(0, num_nodes, size=num_edges)
+    dst = rng.integers(0, num_nodes - 1, size=num_edges)
+    dst[dst >= src] += 1  # fara bucle
+    return list(range(num_nodes)), list(zip(src.tolist(), dst.tolist()))
+
+def time_construction(factory, nodes, edges, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        factory(nodes, edges)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark propagation model construction time against edge count")
+    parser.add_argument('--edges', type=int, nargs='+', default=[1000, 10000, 100000, 200000])
+    parser.add_argument('--avg-degree', type=float, default=64)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'edges':>10} {'nodes':>8} " + " ".join(f"{name:>20}" for name in MODELS))
+    for num_edges in args.edges:
+        nodes, edges = random_graph(num_edges, args.avg_degree, args.seed)
+        timings = [time_construction(factory, nodes, edges, args.repeats) for factory in MODELS.values()]
+        print(f"{num_edges:>10} {len(nodes):>8} " + " ".join(f"{t:>19.3f}s" for t in timings))
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,103 @@
+import os
 import sqlite3
 import json
+import io
+import time
+import queue
+import threading
+import functools
+import struct
+import zlib
+import numpy as np
+
+DB_PATH = 'networks.db'
+
+# campurile cu liste de noduri, codificate ca indici intr-un tabel comun de noduri
+NODE_LIST_FIELDS = ("selected_nodes", "propagated_nodes")
+STAGES_ENCODING = "zlib-nodeidx-v1"
+
+# pool mic de conexiuni: un fir imprumuta o conexiune la primul get_connection() si o intoarce
+# cu release_connection() (Flask o face la sfarsitul fiecarei cereri); peste DB_POOL_SIZE
+# conexiuni libere, cele in plus se inchid
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 8))
+_pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+_local = threading.local()
+
+# rezultatele interogarilor de citire, valabile cat timp contorul de scrieri din baza de date
+# nu se schimba; contorul e in SQLite, deci vede si scrierile altor procese (ex: experiment_grid.py)
+QUERY_CACHE_MAX_ENTRIES = 256
+_query_cache = {}
+_query_cache_lock = threading.Lock()
+
+def data_generation():
+    row = get_connection().execute('SELECT generation FROM query_generation WHERE id = 0').fetchone()
+    return row[0] if row else 0
+
+def bump_data_generation(conn):
+    """Se apeleaza in tranzactia care modifica datele citite prin cached_query"""
+    conn.execute('UPDATE query_generation SET generation = generation + 1 WHERE id = 0')
+
+def open_connection():
+    # folosita de un singur fir odata, dar de fire diferite de-a lungul timpului
+    conn = sqlite3.connect(DB_PATH, timeout=30, cached_statements=256, check_same_thread=False)
+    # WAL: cititorii nu mai sunt blocati de scrieri
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+def get_connection():
+    """Conexiunea imprumutata de firul curent, luata din pool sau deschisa daca pool-ul e gol.
+
+    Cache-ul de instructiuni al conexiunii pastreaza interogarile frecvente deja
+    pregatite, iar conexiunile refolosite intre cereri il pastreaza si el."""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        try:
+            conn = _pool.get_nowait()
+        except queue.Empty:
+            conn = open_connection()
+        _local.conn = conn
+    return conn
+
+def release_connection():
+    """Intoarce conexiunea firului curent in pool, sau o inchide daca pool-ul e plin"""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        return
+    _local.conn = None
+    if conn.in_transaction:
+        conn.rollback()
+    try:
+        _pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+def cached_query(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        # citit inainte de interogare: o scriere facuta intre timp invalideaza rezultatul la urmatorul apel
+        generation = data_generation()
+        with _query_cache_lock:
+            entry = _query_cache.get(key)
+            if entry is not None and entry[0] == generation:
+                return entry[1]
+
+        result = func(*args, **kwargs)
+
+        with _query_cache_lock:
+            if len(_query_cache) >= QUERY_CACHE_MAX_ENTRIES:
+                _query_cache.clear()
+            _query_cache[key] = (generation, result)
+        return result
+    return wrapper
+
+def invalidate_query_cache():
+    with _query_cache_lock:
+        _query_cache.clear()
 
 def init_db():
-    conn = sqlite3.connect('networks.db')
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS network_stats (
@@ -16,6 +111,12 @@ def init_db():
         )
     ''')
 
+    # coloanele adaugate ulterior: statisticile suplimentare si semnatura fisierului de muchii
+    columns = {row[1] for row in cursor.execute('PRAGMA table_info(network_stats)')}
+    for column in ("extra_stats", "source_signature"):
+        if column not in columns:
+            cursor.execute(f'ALTER TABLE network_stats ADD COLUMN {column} TEXT')
+
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS algorithm_runs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -33,13 +134,146 @@ def init_db():
             timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
         )
     ''')
+
+    # parametrii completi ai unui model, salvati o singura data pe model_id
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS model_params (
+            model_id TEXT PRIMARY KEY,
+            diffusion_model TEXT,
+            summary TEXT,
+            arrays BLOB,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # rezultatele rularilor reproductibile, adresate dupa hash-ul tuturor intrarilor
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS result_cache (
+            result_key TEXT PRIMARY KEY,
+            algorithm TEXT,
+            stages TEXT,
+            metrics TEXT,
+            size INTEGER,
+            hits INTEGER DEFAULT 0,
+            last_used REAL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # etapele rularilor, in afara randului din algorithm_runs si comprimate
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS run_stages (
+            run_id INTEGER PRIMARY KEY,
+            encoding TEXT,
+            data BLOB
+        )
+    ''')
+
+    # contorul de scrieri care invalideaza cache-ul interogarilor, in toate procesele
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS query_generation (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            generation INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('INSERT OR IGNORE INTO query_generation (id, generation) VALUES (0, 0)')
+
+    # indecsi pentru filtrele si sortarile endpoint-urilor de citire
+    cursor.executescript('''
+        CREATE INDEX IF NOT EXISTS idx_network_stats_name ON network_stats(name);
+        CREATE INDEX IF NOT EXISTS idx_runs_network_name ON algorithm_runs(network_name);
+        CREATE INDEX IF NOT EXISTS idx_runs_algorithm ON algorithm_runs(algorithm);
+        CREATE INDEX IF NOT EXISTS idx_runs_cache_key ON algorithm_runs(cache_key);
+        CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON algorithm_runs(timestamp);
+        CREATE INDEX IF NOT EXISTS idx_result_cache_last_used ON result_cache(last_used);
+    ''')
     conn.commit()
-    conn.close()
 
-def insert_network_stats(name, num_nodes, num_edges, avg_degree, clustering, deg_dist):
-    conn = sqlite3.connect('networks.db')
+    migrate_inline_stages()
+
+def encode_stages(stages):
+    """Etapele ca blob comprimat: metadatele JSON plus listele de noduri ca indici uint32.
+
+    propagated_nodes e o multime, deci indicii sunt sortati si codificati prin diferente;
+    selected_nodes isi pastreaza ordinea selectiei."""
+    node_table = []
+    node_index = {}
+    meta_stages = []
+    chunks = []
+
+    for stage in stages:
+        meta = {name: value for name, value in stage.items() if name not in NODE_LIST_FIELDS}
+        lengths = {}
+        for name in NODE_LIST_FIELDS:
+            if name not in stage:
+                continue
+            indices = []
+            for node in stage[name]:
+                if node not in node_index:
+                    node_index[node] = len(node_table)
+                    node_table.append(node)
+                indices.append(node_index[node])
+            indices = np.asarray(indices, dtype=np.uint32)
+            if name == "propagated_nodes":
+                indices = np.diff(np.sort(indices), prepend=np.uint32(0)).astype(np.uint32)
+            chunks.append(indices)
+            lengths[name] = len(indices)
+        meta["_lengths"] = lengths
+        meta_stages.append(meta)
+
+    header = json.dumps({"nodes": node_table, "stages": meta_stages}).encode()
+    body = np.concatenate(chunks).tobytes() if chunks else b''
+    return zlib.compress(struct.pack('<I', len(header)) + header + body, 6)
+
+def decode_stages(blob):
+    raw = zlib.decompress(blob)
+    header_len = struct.unpack_from('<I', raw)[0]
+    header = json.loads(raw[4:4 + header_len])
+    values = np.frombuffer(raw, dtype=np.uint32, offset=4 + header_len)
+    node_table = header["nodes"]
+
+    stages = []
+    position = 0
+    for meta in header["stages"]:
+        lengths = meta.pop("_lengths")
+        stage = dict(meta)
+        for name in NODE_LIST_FIELDS:
+            if name not in lengths:
+                continue
+            indices = values[position:position + lengths[name]]
+            position += lengths[name]
+            if name == "propagated_nodes":
+                indices = np.cumsum(indices, dtype=np.uint64)
+            stage[name] = [node_table[i] for i in indices.tolist()]
+        stages.append(stage)
+    return stages
+
+def migrate_inline_stages(batch_size=500):
+    """Muta etapele salvate inline in randurile vechi in tabelul run_stages"""
+    conn = get_connection()
+    while True:
+        rows = conn.execute(
+            'SELECT id, stages FROM algorithm_runs WHERE stages IS NOT NULL LIMIT ?', (batch_size,)
+        ).fetchall()
+        if not rows:
+            break
+        with conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO run_stages (run_id, encoding, data) VALUES (?, ?, ?)',
+                [(run_id, STAGES_ENCODING, encode_stages(json.loads(stages))) for run_id, stages in rows]
+            )
+            conn.executemany(
+                'UPDATE algorithm_runs SET stages = NULL WHERE id = ?', [(run_id,) for run_id, _ in rows]
+            )
+
+def insert_network_stats(
+    name, num_nodes, num_edges, avg_degree, clustering, deg_dist, extra_stats=None, source_signature=None
+):
+    conn = get_connection()
     cursor = conn.cursor()
     
+    extra = json.dumps(extra_stats) if extra_stats is not None else None
+
     # Verifică dacă există deja un rând cu același nume
     cursor.execute('SELECT id FROM network_stats WHERE name = ?', (name,))
     existing_row = cursor.fetchone()
@@ -48,63 +282,320 @@ def insert_network_stats(name, num_nodes, num_edges, avg_degree, clustering, deg
         # Dacă există, actualizează rândul
         cursor.execute('''
             UPDATE network_stats 
-            SET num_nodes = ?, num_edges = ?, average_degree = ?, clustering_coeff = ?, degree_distribution = ?
+            SET num_nodes = ?, num_edges = ?, average_degree = ?, clustering_coeff = ?, degree_distribution = ?,
+                extra_stats = ?, source_signature = ?
             WHERE name = ?
-        ''', (num_nodes, num_edges, avg_degree, clustering, deg_dist, name))
+        ''', (num_nodes, num_edges, avg_degree, clustering, deg_dist, extra, source_signature, name))
     else:
         # Dacă nu există, inserează un nou rând
         cursor.execute('''
-            INSERT INTO network_stats (name, num_nodes, num_edges, average_degree, clustering_coeff, degree_distribution)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (name, num_nodes, num_edges, avg_degree, clustering, deg_dist))
+            INSERT INTO network_stats (name, num_nodes, num_edges, average_degree, clustering_coeff, degree_distribution,
+                                       extra_stats, source_signature)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (name, num_nodes, num_edges, avg_degree, clustering, deg_dist, extra, source_signature))
     
+    bump_data_generation(conn)
     conn.commit()
-    conn.close()
+    invalidate_query_cache()
 
 def get_all_network_stats():
-    conn = sqlite3.connect('networks.db')
+    conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute('SELECT * FROM network_stats')
+    cursor.execute('''
+        SELECT id, name, num_nodes, num_edges, average_degree, clustering_coeff, degree_distribution, extra_stats
+        FROM network_stats
+    ''')
     rows = cursor.fetchall()
-    conn.close()
     return rows
 
+def get_network_signatures():
+    """Semnatura fisierului de muchii din care au fost calculate statisticile fiecarei retele"""
+    cursor = get_connection().cursor()
+    cursor.execute('SELECT name, source_signature FROM network_stats WHERE source_signature IS NOT NULL')
+    return dict(cursor.fetchall())
+
 #salvam simularile precedente
 def insert_algorithm_run(
     model_id, algorithm, cache_key, seed_size, runtime, spread,
     seed_nodes, stages, network_name, diffusion_model, model_params
 ):
-    conn = sqlite3.connect('networks.db')
-    cursor = conn.cursor()
+    insert_algorithm_runs([{
+        "model_id": model_id,
+        "algorithm": algorithm,
+        "cache_key": cache_key,
+        "seed_size": seed_size,
+        "runtime": runtime,
+        "spread": spread,
+        "seed_nodes": seed_nodes,
+        "stages": stages,
+        "network_name": network_name,
+        "diffusion_model": diffusion_model,
+        "model_params": model_params
+    }])
 
-    cursor.execute('''
-        INSERT INTO algorithm_runs 
-        (model_id, algorithm, cache_key, seed_size, runtime, spread,
-         seed_nodes, stages, network_name, diffusion_model, model_params)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        model_id,
-        algorithm,
-        cache_key,
-        seed_size,
-        runtime,
-        spread,
-        json.dumps(seed_nodes),
-        json.dumps(stages),
-        network_name,
-        diffusion_model,
-        json.dumps(model_params)
-    ))
-
-    conn.commit()
-    conn.close()
+def insert_algorithm_runs(runs):
+    """Rularile unui sweep intr-o singura tranzactie"""
+    if not runs:
+        return
+    conn = get_connection()
+    with conn:
+        for run in runs:
+            # randul ramane mic; etapele merg comprimate in run_stages
+            cursor = conn.execute('''
+                INSERT INTO algorithm_runs 
+                (model_id, algorithm, cache_key, seed_size, runtime, spread,
+                 seed_nodes, network_name, diffusion_model, model_params)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                run["model_id"],
+                run["algorithm"],
+                run["cache_key"],
+                run["seed_size"],
+                run["runtime"],
+                run["spread"],
+                json.dumps(run["seed_nodes"]),
+                run["network_name"],
+                run["diffusion_model"],
+                json.dumps(run["model_params"])
+            ))
+            conn.execute(
+                'INSERT INTO run_stages (run_id, encoding, data) VALUES (?, ?, ?)',
+                (cursor.lastrowid, STAGES_ENCODING, encode_stages(run["stages"]))
+            )
+        bump_data_generation(conn)
+    invalidate_query_cache()
 
 def get_all_algorithm_runs():
-    conn = sqlite3.connect('networks.db')
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute('SELECT * FROM algorithm_runs')
     rows = cursor.fetchall()
-    conn.close()
     return rows
 
+def run_filters(network=None, algorithm=None, model=None, since=None, until=None):
+    """Clauza WHERE comuna pentru filtrele endpoint-urilor de statistici"""
+    clauses = []
+    values = []
+    for column, value in (("ar.network_name", network), ("ar.algorithm", algorithm), ("ar.diffusion_model", model)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            values.append(value)
+    if since is not None:
+        clauses.append("ar.timestamp >= ?")
+        values.append(since)
+    if until is not None:
+        clauses.append("ar.timestamp <= ?")
+        values.append(until)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", values
+
+def keyset_page(query, values, after=None, limit=None):
+    """Paginare dupa (timestamp, id): pagina urmatoare incepe strict dupa cursor"""
+    if after is not None:
+        query += (" AND " if " WHERE " in query else " WHERE ") + "(ar.timestamp, ar.id) < (?, ?)"
+        values = values + list(after)
+    query += " ORDER BY ar.timestamp DESC, ar.id DESC"
+    if limit is not None:
+        query += " LIMIT ?"
+        values = values + [limit]
+    return query, values
+
+@cached_query
+def get_run_statistics(after=None, limit=None, **filters):
+    where, values = run_filters(**filters)
+    query, values = keyset_page('''
+        SELECT 
+            ar.id, ar.algorithm, ar.seed_size, ar.runtime, ar.spread, ar.timestamp,
+            ar.network_name, ar.diffusion_model,ar.model_params,
+            ns.num_nodes, ns.num_edges, ns.average_degree, ns.clustering_coeff
+        FROM algorithm_runs ar
+        LEFT JOIN network_stats ns ON ar.network_name = ns.name
+    ''' + where, values, after, limit)
+
+    cursor = get_connection().cursor()
+    cursor.row_factory = sqlite3.Row
+    cursor.execute(query, values)
+    return [dict(row) for row in cursor.fetchall()]
+
+@cached_query
+def get_saved_run_summaries(after=None, limit=None, **filters):
+    where, values = run_filters(**filters)
+    query, values = keyset_page('''
+        SELECT 
+            ar.id, 
+            ar.algorithm, 
+            ar.seed_size, 
+            ar.network_name, 
+            ar.diffusion_model, 
+            ar.timestamp,
+            ar.runtime, 
+            ar.spread,
+            ns.num_nodes,
+            ns.num_edges
+        FROM algorithm_runs ar
+        LEFT JOIN network_stats ns ON ar.network_name = ns.name
+    ''' + where, values, after, limit)
+
+    cursor = get_connection().cursor()
+    cursor.execute(query, values)
+    return cursor.fetchall()
+
+# probabilitatea IC a unei rulari (uniforma sau medie), pentru gruparea statisticilor pe model
+RUN_PROBABILITY_SQL = '''
+    CASE WHEN json_valid(ar.model_params) AND json_type(ar.model_params) = 'object' THEN ROUND(COALESCE(
+        json_extract(ar.model_params, '$.propagation_probability'),
+        json_extract(ar.model_params, '$.mean_probability')
+    ), 3) END
+'''
+AGGREGATE_GROUP = ("algorithm", "network_name", "seed_size", "diffusion_model", "propagation_probability")
+
+@cached_query
+def get_run_aggregates(**filters):
+    """Numar de rulari, medie, deviatie standard, mediana si p95 pentru runtime si spread pe
+    (algoritm, retea, seed_size, model, probabilitate), calculate integral in SQL, plus
+    statisticile retelei; dashboard-ul nu mai are nevoie de rularile individuale"""
+    where, values = run_filters(**filters)
+    group_columns = ", ".join(AGGREGATE_GROUP)
+    groups = {}
+    for metric in ("runtime", "spread"):
+        cursor = get_connection().cursor()
+        cursor.execute(f'''
+            WITH ranked AS (
+                SELECT
+                    ar.algorithm, ar.network_name, ar.seed_size, ar.diffusion_model,
+                    {RUN_PROBABILITY_SQL} AS propagation_probability,
+                    ar.{metric} AS value
+                FROM algorithm_runs ar
+                {where}{" AND" if where else " WHERE"} ar.{metric} IS NOT NULL
+            ), positioned AS (
+                SELECT *,
+                    ROW_NUMBER() OVER (PARTITION BY {group_columns} ORDER BY value) AS position,
+                    COUNT(*) OVER (PARTITION BY {group_columns}) AS total
+                FROM ranked
+            )
+            SELECT
+                {group_columns}, COUNT(*), AVG(value), AVG(value * value),
+                AVG(CASE WHEN position IN ((total + 1) / 2, (total + 2) / 2) THEN value END),
+                MIN(CASE WHEN position >= 0.95 * total THEN value END)
+            FROM positioned
+            GROUP BY {group_columns}
+            ORDER BY {group_columns}
+        ''', values)
+
+        for *key, runs, mean, mean_square, median, p95 in cursor.fetchall():
+            group = groups.setdefault(tuple(key), {**dict(zip(AGGREGATE_GROUP, key)), "runs": runs})
+            std = max(0.0, mean_square - mean * mean) ** 0.5
+            group[metric] = {"mean": mean, "std": std, "median": median, "p95": p95}
+
+    # statisticile retelelor, o singura data pe retea
+    cursor = get_connection().cursor()
+    cursor.execute('SELECT name, num_nodes, num_edges, average_degree, clustering_coeff FROM network_stats')
+    networks = {row[0]: row[1:] for row in cursor.fetchall()}
+    for group in groups.values():
+        stats = networks.get(group["network_name"], (None, None, None, None))
+        group.update(zip(("num_nodes", "num_edges", "average_degree", "clustering_coeff"), stats))
+    return list(groups.values())
+
+def get_algorithm_run(run_id):
+    """O rulare salvata; etapele sunt decodate doar aici, la deschiderea ei"""
+    cursor = get_connection().cursor()
+    cursor.execute('''
+        SELECT ar.seed_nodes, ar.stages, ar.algorithm, ar.network_name, rs.data
+        FROM algorithm_runs ar
+        LEFT JOIN run_stages rs ON rs.run_id = ar.id
+        WHERE ar.id = ?
+    ''', (run_id,))
+    row = cursor.fetchone()
+
+    if row is None:
+        return None
+    seed_nodes, inline_stages, algorithm, network_name, blob = row
+    return {
+        "seed_nodes": json.loads(seed_nodes),
+        "stages": decode_stages(blob) if blob is not None else json.loads(inline_stages or '[]'),
+        "algorithm": algorithm,
+        "network_name": network_name
+    }
+
+def encode_param_arrays(arrays):
+    """Array-urile neuniforme ale unui model intr-un singur blob npz comprimat"""
+    if not arrays:
+        return None
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+def decode_param_arrays(blob):
+    if not blob:
+        return {}
+    with np.load(io.BytesIO(blob)) as data:
+        return {name: data[name] for name in data.files}
 
+def insert_model_params(model_id, diffusion_model, summary, arrays):
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    # modelul e imutabil dupa initializare, deci prima scriere ramane valabila
+    cursor.execute('''
+        INSERT OR IGNORE INTO model_params (model_id, diffusion_model, summary, arrays)
+        VALUES (?, ?, ?, ?)
+    ''', (model_id, diffusion_model, json.dumps(summary), encode_param_arrays(arrays)))
+
+    conn.commit()
+
+def get_model_params(model_id):
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('SELECT diffusion_model, summary, arrays FROM model_params WHERE model_id = ?', (model_id,))
+    row = cursor.fetchone()
+
+    if row is None:
+        return None
+    return {
+        "diffusion_model": row[0],
+        "summary": json.loads(row[1]),
+        "arrays": decode_param_arrays(row[2])
+    }
+
+def get_cached_result(result_key):
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('SELECT stages, metrics FROM result_cache WHERE result_key = ?', (result_key,))
+    row = cursor.fetchone()
+
+    if row is not None:
+        cursor.execute(
+            'UPDATE result_cache SET hits = hits + 1, last_used = ? WHERE result_key = ?',
+            (time.time(), result_key)
+        )
+        conn.commit()
+
+    if row is None:
+        return None
+    return {
+        "stages": json.loads(row[0]),
+        "metrics": json.loads(row[1])
+    }
+
+def insert_cached_result(result_key, algorithm, stages, metrics, max_bytes):
+    stages_json = json.dumps(stages)
+    metrics_json = json.dumps(metrics)
+    size = len(stages_json) + len(metrics_json)
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        INSERT OR REPLACE INTO result_cache (result_key, algorithm, stages, metrics, size, last_used)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (result_key, algorithm, stages_json, metrics_json, size, time.time()))
+
+    # evacuam intrarile folosite cel mai demult pana incapem in limita
+    cursor.execute('''
+        DELETE FROM result_cache WHERE result_key IN (
+            SELECT result_key FROM (
+                SELECT result_key, SUM(size) OVER (ORDER BY last_used DESC, rowid DESC) AS running
+                FROM result_cache
+            ) WHERE running > ?
+        )
+    ''', (max_bytes,))
+
+    conn.commit()
@@ -0,0 +1,378 @@
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from network_stats import DEFAULT_DATASET_FOLDER, list_networks
+from database import release_connection
+
+ALGORITHM_FOLDER = os.path.join(os.path.dirname(__file__), 'algorithms')
+# module ajutatoare din algorithms/, nu scripturi de rulat
+HELPER_MODULES = {"checkpoint", "rng_streams", "time_budget"}
+# algoritmii care pornesc mai multe procese primesc partea lor din bugetul de CPU
+PARALLEL_ALGORITHMS = {"celf", "classic_greedy", "community_celf"}
+MODELS = ("independent_cascade", "linear_threshold")
+DEFAULT_SEED_SIZES = [5, 10, 20]
+MAX_GRID_CELLS = 10000
+
+def list_algorithms(algorithm_folder=ALGORITHM_FOLDER):
+    return sorted(
+        filename[:-len('.py')] for filename in os.listdir(algorithm_folder)
+        if filename.endswith('.py') and filename[:-len('.py')] not in HELPER_MODULES
+    )
+
+def normalize_spec(spec, dataset_folder=DEFAULT_DATASET_FOLDER):
+    """Specificatia grilei cu valorile implicite completate; ValueError daca e invalida.
+
+    {"datasets": [...] | "all", "models": [...], "algorithms": [...] | "all",
+     "seedSizes": [...], "modelSettings": {...}, "parameters": {"*": {...}, "<algoritm>": {...}},
+     "cpuBudget": n}
+
+    modelSettings si parametrii "*" definesc modelul (probabilitati, praguri, randomSeed),
+    comun tuturor algoritmilor; parametrii "*" ajung si la algoritmi, iar din modelSettings doar
+    randomSeed, ca simularile algoritmilor sa fie la fel de reproductibile ca modelul. Parametrii
+    pe algoritm ajung doar la scriptul algoritmului si pot suprascrie randomSeed."""
+    if not isinstance(spec, dict):
+        raise ValueError("Experiment spec must be a JSON object")
+
+    networks = [network for network, _ in list_networks(dataset_folder)]
+    datasets = spec.get('datasets', 'all')
+    datasets = networks if datasets == 'all' else datasets
+    if not isinstance(datasets, list) or not datasets:
+        raise ValueError("'datasets' must be a non-empty list or 'all'")
+    unknown = [dataset for dataset in datasets if dataset not in networks]
+    if unknown:
+        raise ValueError(f"Unknown datasets: {unknown}")
+
+    models = spec.get('models', list(MODELS))
+    if not isinstance(models, list) or not models or any(model not in MODELS for model in models):
+        raise ValueError(f"'models' must be a non-empty list of {list(MODELS)}")
+
+    available = list_algorithms()
+    algorithms = spec.get('algorithms', 'all')
+    algorithms = available if algorithms == 'all' else algorithms
+    if not isinstance(algorithms, list) or not algorithms or any(algorithm not in available for algorithm in algorithms):
+        raise ValueError(f"'algorithms' must be a non-empty list of {available} or 'all'")
+
+    seed_sizes = spec.get('seedSizes', DEFAULT_SEED_SIZES)
+    seed_sizes = seed_sizes if isinstance(seed_sizes, list) else [seed_sizes]
+    if not seed_sizes or any(not isinstance(size, int) or isinstance(size, bool) or size < 1 for size in seed_sizes):
+        raise ValueError("'seedSizes' must be a list of positive integers")
+
+    model_settings = spec.get('modelSettings', {})
+    parameters = spec.get('parameters', {})
+    if not isinstance(model_settings, dict) or not isinstance(parameters, dict):
+        raise ValueError("'modelSettings' and 'parameters' must be objects")
+    if any(not isinstance(value, dict) for value in parameters.values()):
+        raise ValueError("'parameters' must map algorithm names (or '*') to objects")
+
+    cpu_budget = spec.get('cpuBudget', os.cpu_count() or 1)
+    if not isinstance(cpu_budget, int) or isinstance(cpu_budget, bool) or cpu_budget < 1:
+        raise ValueError("'cpuBudget' must be a positive integer")
+
+    normalized = {
+        "datasets": list(dict.fromkeys(datasets)),
+        "models": list(dict.fromkeys(models)),
+        "algorithms": list(dict.fromkeys(algorithms)),
+        "seedSizes": sorted(set(seed_sizes)),
+        "modelSettings": model_settings,
+        "parameters": parameters,
+        "cpuBudget": min(cpu_budget, os.cpu_count() or 1)
+    }
+    if count_cells(normalized) > MAX_GRID_CELLS:
+        raise ValueError(f"Experiment grid is limited to {MAX_GRID_CELLS} cells")
+    return normalized
+
+def count_cells(spec):
+    return len(spec["datasets"]) * len(spec["models"]) * len(spec["algorithms"]) * len(spec["seedSizes"])
+
+def plan_chains(spec, dataset_folder=DEFAULT_DATASET_FOLDER):
+    """Celulele grilei grupate in lanturi (retea, model, algoritm).
+
+    Un lant ruleaza seed size-urile crescator, in acelasi fir, ca sa refoloseasca ce lasa pe
+    disc rularea anterioara (starea CELF, schitele RR). Retelele mari sunt planificate primele,
+    ca sa nu ramana un lant lung la final cand restul firelor stau."""
+    edge_files = dict(list_networks(dataset_folder))
+    datasets = sorted(spec["datasets"], key=lambda dataset: -os.path.getsize(edge_files[dataset]))
+    shared = dict(spec["parameters"].get('*', {}))
+    # samanta din modelSettings are prioritate in model (vezi SharedInputs), deci si in algoritmi
+    if spec["modelSettings"].get('randomSeed') is not None:
+        shared['randomSeed'] = spec["modelSettings"]['randomSeed']
+    return [
+        {
+            "dataset": dataset,
+            "model": model,
+            "algorithm": algorithm,
+            "seed_sizes": spec["seedSizes"],
+            "parameters": {**shared, **spec["parameters"].get(algorithm, {})}
+        }
+        for dataset in datasets
+        for model in spec["models"]
+        for algorithm in spec["algorithms"]
+    ]
+
+class SharedInputs:
+    """Graful, modelul si fisierele de intrare ale unei perechi (retea, model), pregatite o data
+    pentru toate lanturile care le folosesc si sterse dupa ultimul"""
+
+    def __init__(self, backend, spec, chains):
+        self.backend = backend
+        self.spec = spec
+        self.lock = threading.Lock()
+        self.graphs = {}  # retea -> (lock, graf)
+        self.entries = {}  # (retea, model) -> (lock, intrare)
+        self.remaining = {}
+        for chain in chains:
+            key = (chain["dataset"], chain["model"])
+            self.remaining[key] = self.remaining.get(key, 0) + 1
+
+    def model_settings(self, dataset):
+        data = {
+            **self.spec["modelSettings"],
+            "dataset": dataset,
+            "parameters": {**self.spec["parameters"].get('*', {}), **self.spec["modelSettings"]}
+        }
+        return self.backend.get_model_settings(data)
+
+    def slot(self, table, key):
+        with self.lock:
+            if key not in table:
+                table[key] = [threading.Lock(), None]
+            return table[key]
+
+    def graph(self, dataset):
+        slot = self.slot(self.graphs, dataset)
+        with slot[0]:
+            if slot[1] is None:
+                slot[1] = self.backend.load_network_graph(dataset, self.model_settings(dataset))
+            return slot[1]
+
+    def acquire(self, dataset, model_name):
+        """(graf, model, cheia modelului, fisiere de intrare); ridica DatasetError"""
+        slot = self.slot(self.entries, (dataset, model_name))
+        with slot[0]:
+            if slot[1] is None:
+                G = self.graph(dataset)
+                model, cache_key = self.backend.get_initialized_model(G, dataset, model_name, self.model_settings(dataset))
+                slot[1] = (G, model, cache_key, self.backend.prepare_algorithm_inputs(G, model))
+            return slot[1]
+
+    def release(self, dataset, model_name):
+        with self.lock:
+            key = (dataset, model_name)
+            self.remaining[key] -= 1
+            entry = self.entries.pop(key, [None, None])[1] if self.remaining[key] == 0 else None
+            # graful ramane cat timp il mai foloseste un alt model
+            if not any(count for (other, _), count in self.remaining.items() if other == dataset):
+                self.graphs.pop(dataset, None)
+        if entry is not None:
+            self.backend.cleanup_algorithm_inputs(entry[3])
+
+def run_chain(backend, shared, chain, processes_per_cell, on_cell=None):
+    """Ruleaza un lant si scrie rularile lui in algorithm_runs dintr-o singura tranzactie"""
+    cells = []
+    try:
+        try:
+            G, model, cache_key, inputs = shared.acquire(chain["dataset"], chain["model"])
+        except backend.DatasetError as e:
+            for seed_size in chain["seed_sizes"]:
+                cells.append({**cell_info(chain, seed_size), "status": "error", "error": str(e)})
+                if on_cell:
+                    on_cell(cells[-1])
+            return cells
+
+        run_records = []
+        for seed_size in chain["seed_sizes"]:
+            params = {**chain["parameters"], 'seedSize': seed_size}
+            if chain["algorithm"] in PARALLEL_ALGORITHMS:
+                params.setdefault('numProcesses', processes_per_cell)
+            result, run_record = backend.run_or_reuse(
+                chain["algorithm"], G, model, params, chain["dataset"], cache_key, inputs
+            )
+            if run_record is not None:
+                run_records.append(run_record)
+            cell = {**cell_info(chain, seed_size), "status": result["status"], "cached": result.get("cached", False)}
+            if result["status"] == "success":
+                cell["spread"] = result["metrics"]["spread"]
+                cell["runtime"] = result["metrics"]["runtime"]
+                cell["seed_nodes"] = result["metrics"]["seed_nodes"]
+            else:
+                cell["error"] = result["error"]
+            cells.append(cell)
+            if on_cell:
+                on_cell(cell)
+
+        backend.insert_algorithm_runs(run_records)
+        return cells
+    finally:
+        shared.release(chain["dataset"], chain["model"])
+        # firele executorului nu sunt cereri Flask; conexiunea se intoarce aici in pool
+        release_connection()
+
+def cell_info(chain, seed_size):
+    return {
+        "dataset": chain["dataset"],
+        "model": chain["model"],
+        "algorithm": chain["algorithm"],
+        "seed_size": seed_size
+    }
+
+def run_grid(backend, spec, on_cell=None, dataset_folder=DEFAULT_DATASET_FOLDER):
+    """Ruleaza toata grila si intoarce rezultatele celulelor, in ordinea planului.
+
+    Lanturile ruleaza in paralel pe cel mult cpuBudget fire; algoritmii paraleli primesc
+    restul bugetului ca numProcesses, deci numarul total de procese ramane in buget."""
+    chains = plan_chains(spec, dataset_folder)
+    workers = max(1, min(spec["cpuBudget"], len(chains)))
+    processes_per_cell = max(1, spec["cpuBudget"] // workers)
+    shared = SharedInputs(backend, spec, chains)
+
+    results = [None] * len(chains)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(run_chain, backend, shared, chain, processes_per_cell, on_cell): index
+            for index, chain in enumerate(chains)
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return [cell for cells in results for cell in cells]
+
+class ExperimentJobs:
+    """Grilele pornite din API, rulate pe rand intr-un fir de fundal.
+
+    Doua grile simultane ar depasi impreuna bugetul de CPU, asa ca stau la coada."""
+
+    def __init__(self, backend, dataset_folder=DEFAULT_DATASET_FOLDER, max_jobs=32):
+        self.backend = backend
+        self.dataset_folder = dataset_folder
+        self.max_jobs = max_jobs
+        self.jobs = OrderedDict()
+        self.tasks = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def submit(self, spec):
+        """Valideaza specificatia si pune grila la coada; ValueError daca e invalida"""
+        spec = normalize_spec(spec, self.dataset_folder)
+        job_id = uuid.uuid4().hex
+        with self.lock:
+            self.jobs[job_id] = {
+                "experiment_id": job_id,
+                "status": "queued",
+                "spec": spec,
+                "total_cells": count_cells(spec),
+                "completed_cells": 0,
+                "failed_cells": 0,
+                "cached_cells": 0,
+                "submitted_at": time.time(),
+                "results": []
+            }
+            # joburile terminate cele mai vechi sunt uitate
+            finished = [key for key, job in self.jobs.items() if job["status"] in ("completed", "failed")]
+            for key in finished[:max(0, len(self.jobs) - self.max_jobs)]:
+                del self.jobs[key]
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.work, daemon=True)
+                self.thread.start()
+        self.tasks.put(job_id)
+        return self.get(job_id)
+
+    def get(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return None if job is None else {**job, "results": list(job["results"])}
+
+    def work(self):
+        while True:
+            job_id = self.tasks.get()
+            try:
+                self.run(job_id)
+            finally:
+                self.tasks.task_done()
+
+    def run(self, job_id):
+        with self.lock:
+            job = self.jobs[job_id]
+            job["status"] = "running"
+            job["started_at"] = time.time()
+
+        def on_cell(cell):
+            with self.lock:
+                job["completed_cells"] += 1
+                job["failed_cells"] += cell["status"] == "error"
+                job["cached_cells"] += bool(cell.get("cached"))
+                job["results"].append(cell)
+
+        try:
+            run_grid(self.backend, job["spec"], on_cell, self.dataset_folder)
+            status, error = "completed", None
+        except Exception as e:
+            print(f"[DEBUG] Experiment {job_id} failed: {e}")
+            status, error = "failed", str(e)
+        with self.lock:
+            job["status"] = status
+            job["finished_at"] = time.time()
+            if error:
+                job["error"] = error
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an experiment grid (datasets x models x algorithms x seed sizes) and store the runs in algorithm_runs")
+    parser.add_argument('spec', nargs='?', help="JSON file with the grid spec")
+    parser.add_argument('--all', action='store_true', help="every dataset, model and algorithm with the default seed sizes")
+    parser.add_argument('--cpu-budget', type=int, help="overrides cpuBudget from the spec")
+    parser.add_argument('--dry-run', action='store_true', help="print the plan without running it")
+    parser.add_argument('--output', help="write the cell results to this JSON file")
+    args = parser.parse_args()
+
+    if args.spec:
+        with open(args.spec, 'r') as f:
+            spec = json.load(f)
+    elif args.all:
+        spec = {}
+    else:
+        parser.error("either a spec file or --all is required")
+    if args.cpu_budget is not None:
+        spec["cpuBudget"] = args.cpu_budget
+
+    # app.py foloseste cai relative (baza de date, scripturile algoritmilor, seturile de date)
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        spec = normalize_spec(spec)
+    except ValueError as e:
+        parser.error(str(e))
+
+    chains = plan_chains(spec)
+    print(f"{count_cells(spec)} cells in {len(chains)} chains, cpu budget {spec['cpuBudget']}")
+    if args.dry_run:
+        for chain in chains:
+            print(f"  {chain['dataset']:<28} {chain['model']:<20} {chain['algorithm']:<22} {chain['seed_sizes']}")
+        return
+
+    import app as backend
+
+    start = time.time()
+    def on_cell(cell):
+        if cell["status"] == "success":
+            outcome = "cached" if cell["cached"] else f"{cell['runtime'] / 1000:.1f}s"
+            outcome = f"spread {cell['spread']} ({outcome})"
+        else:
+            outcome = f"error: {cell['error']}"
+        print(f"[{time.time() - start:7.1f}s] {cell['dataset']} / {cell['model']} / {cell['algorithm']} / k={cell['seed_size']}: {outcome}", flush=True)
+
+    cells = run_grid(backend, spec, on_cell)
+    failed = sum(cell["status"] == "error" for cell in cells)
+    print(f"Finished {len(cells)} cells in {time.time() - start:.1f}s, {failed} failed")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"spec": spec, "results": cells}, f, indent=2)
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
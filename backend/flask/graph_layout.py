@@ -0,0 +1,227 @@
+import os
+import sys
+import queue
+import argparse
+import threading
+from collections import OrderedDict
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import eigsh
+
+from graph_payloads import graph_index, network_files
+from network_stats import DEFAULT_DATASET_FOLDER, list_networks
+
+LAYOUT_DIM = 3
+# distanta tinta dintre vecini, apropiata de cea folosita de d3-force-3d in frontend
+LINK_DISTANCE = 30.0
+
+def spectral_coordinates(num_nodes, source, target, dim, rng):
+    """Vectorii proprii ai laplacianului normalizat, folositi ca pozitii initiale"""
+    if num_nodes <= dim + 1 or len(source) == 0:
+        return rng.standard_normal((num_nodes, dim))
+
+    adjacency = sp.coo_matrix(
+        (np.ones(2 * len(source)), (np.concatenate([source, target]), np.concatenate([target, source]))),
+        shape=(num_nodes, num_nodes)
+    ).tocsr()
+    degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    d_inv_sqrt = 1.0 / np.sqrt(np.maximum(degree, 1.0))
+    scaled = sp.diags(d_inv_sqrt) @ adjacency @ sp.diags(d_inv_sqrt)
+
+    # cele mai mari valori proprii ale lui I + D^-1/2 A D^-1/2 corespund celor mai mici ale laplacianului
+    try:
+        values, vectors = eigsh(
+            scaled + sp.identity(num_nodes), k=dim + 1, which='LA',
+            v0=rng.random(num_nodes), tol=1e-3, maxiter=20 * num_nodes
+        )
+    except Exception as e:
+        print(f"[DEBUG] Warning: Spectral layout failed, using random start: {e}")
+        return rng.standard_normal((num_nodes, dim))
+
+    order = np.argsort(values)[::-1][1:dim + 1]
+    coordinates = vectors[:, order] * d_inv_sqrt[:, None]
+    # componentele mici ajung suprapuse, asa ca le separam putin
+    coordinates /= np.abs(coordinates).max(axis=0) + 1e-12
+    return coordinates + 0.01 * rng.standard_normal(coordinates.shape)
+
+def force_refine(positions, source, target, iterations, negative_samples, rng, gravity=0.1):
+    """Fruchterman-Reingold cu respingerea estimata din noduri alese aleator, O(n + m) pe iteratie"""
+    num_nodes, dim = positions.shape
+    samples = min(negative_samples, num_nodes - 1)
+    if samples <= 0:
+        return positions
+
+    temperature = np.cbrt(num_nodes)
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        displacement = np.zeros_like(positions)
+
+        # atractie pe muchii, proportionala cu d^2
+        delta = positions[source] - positions[target]
+        distance = np.linalg.norm(delta, axis=1, keepdims=True)
+        pull = delta * distance
+        for axis in range(dim):
+            displacement[:, axis] -= np.bincount(source, weights=pull[:, axis], minlength=num_nodes)
+            displacement[:, axis] += np.bincount(target, weights=pull[:, axis], minlength=num_nodes)
+
+        # respingere fata de un esantion de noduri, scalata la toate perechile
+        others = rng.integers(0, num_nodes, size=(num_nodes, samples))
+        delta = positions[:, None, :] - positions[others]
+        distance_sq = np.einsum('ijk,ijk->ij', delta, delta) + 1e-4
+        displacement += (delta / distance_sq[..., None]).sum(axis=1) * ((num_nodes - 1) / samples)
+
+        # gravitatia tine aproape nodurile izolate si componentele mici
+        displacement -= positions * (gravity * np.cbrt(num_nodes))
+
+        length = np.linalg.norm(displacement, axis=1, keepdims=True) + 1e-12
+        positions += displacement * (np.minimum(length, temperature) / length)
+        temperature -= cooling
+    return positions
+
+def compute_layout(num_nodes, source, target, dim=LAYOUT_DIM, iterations=60, negative_samples=8, seed=0):
+    """Coordonatele nodurilor, ca float32 de forma (num_nodes, dim)"""
+    if num_nodes == 0:
+        return np.zeros((0, dim), dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    loops = source == target
+    source, target = source[~loops], target[~loops]
+
+    positions = spectral_coordinates(num_nodes, source, target, dim, rng)
+    # pornim de la raza pe care o are cam un layout echilibrat cu distanta 1 intre vecini
+    positions *= np.cbrt(num_nodes)
+    positions = force_refine(positions, source, target, iterations, negative_samples, rng)
+
+    positions -= positions.mean(axis=0)
+    return (positions * LINK_DISTANCE).astype(np.float32)
+
+class LayoutWorker:
+    """Layout-urile retelelor, calculate o singura data intr-un fir de fundal.
+
+    Coordonatele sunt salvate ca array float32 langa CSV-urile retelei ({numar}_layout.npy)
+    si sunt recalculate doar cand fisierele sursa se schimba. Cererile nu asteapta niciodata
+    calculul: pana e gata layout-ul, positions() intoarce None."""
+
+    def __init__(self, dataset_folder, max_entries=16):
+        self.dataset_folder = dataset_folder
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # retea -> (mtime, noduri, pozitii)
+        self.pending = set()
+        self.failed = {}
+        self.tasks = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def layout_path(self, network):
+        nodes_file, _ = network_files(self.dataset_folder, network)
+        return f"{nodes_file[:-len('_nodes.csv')]}_layout.npy"
+
+    def layout_mtime(self, network):
+        """mtime-ul layout-ului salvat, sau None daca lipseste ori e mai vechi decat CSV-urile"""
+        path = self.layout_path(network)
+        if not os.path.exists(path):
+            return None
+        mtime = os.path.getmtime(path)
+        for source_file in network_files(self.dataset_folder, network):
+            if os.path.exists(source_file) and os.path.getmtime(source_file) > mtime:
+                return None
+        return mtime
+
+    def request(self, network):
+        """Pune reteaua in coada daca layout-ul ei lipseste sau e vechi"""
+        _, edges_file = network_files(self.dataset_folder, network)
+        if not os.path.exists(edges_file) or self.layout_mtime(network) is not None:
+            return
+        with self.lock:
+            if network in self.pending or network in self.failed:
+                return
+            self.pending.add(network)
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.work, daemon=True)
+                self.thread.start()
+        self.tasks.put(network)
+
+    def work(self):
+        while True:
+            network = self.tasks.get()
+            try:
+                self.compute(network)
+            except Exception as e:
+                print(f"[DEBUG] Warning: Failed to compute layout for {network}: {e}")
+                with self.lock:
+                    self.failed[network] = str(e)
+            finally:
+                with self.lock:
+                    self.pending.discard(network)
+                self.tasks.task_done()
+
+    def compute(self, network):
+        nodes_file, edges_file = network_files(self.dataset_folder, network)
+        nodes, source, target = graph_index(nodes_file, edges_file)
+        positions = compute_layout(len(nodes), source, target)
+
+        path = self.layout_path(network)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, positions)
+        os.replace(tmp_path, path)
+        return positions
+
+    def load(self, network):
+        """(noduri, pozitii) pentru layout-ul curent, sau None"""
+        mtime = self.layout_mtime(network)
+        if mtime is None:
+            return None
+        with self.lock:
+            entry = self.entries.get(network)
+            if entry is not None and entry[0] >= mtime:
+                self.entries.move_to_end(network)
+                return entry[1], entry[2]
+
+        nodes, _, _ = graph_index(*network_files(self.dataset_folder, network))
+        positions = np.load(self.layout_path(network))
+        if len(positions) != len(nodes):
+            return None
+        with self.lock:
+            self.entries[network] = (mtime, nodes, positions)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return nodes, positions
+
+    def positions(self, network):
+        """Pozitiile in ordinea nodurilor din payload-ul grafului"""
+        loaded = self.load(network)
+        return loaded[1] if loaded is not None else None
+
+    def positions_for(self, network, node_ids):
+        """Pozitiile aliniate la o lista oarecare de noduri, sau None daca nu le avem pe toate"""
+        loaded = self.load(network)
+        if loaded is None:
+            return None
+        nodes, positions = loaded
+        indexer = nodes.get_indexer(node_ids)
+        if (indexer < 0).any():
+            return None
+        return positions[indexer]
+
+    def status(self):
+        with self.lock:
+            return {"pending": sorted(self.pending), "failed": dict(self.failed)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute layout coordinates for every network under datasets/csv_files")
+    parser.add_argument('--dataset-folder', default=DEFAULT_DATASET_FOLDER)
+    parser.add_argument('--force', action='store_true', help="recompute even when the saved layout is up to date")
+    args = parser.parse_args()
+
+    worker = LayoutWorker(args.dataset_folder)
+    for network, _ in list_networks(args.dataset_folder):
+        if not args.force and worker.layout_mtime(network) is not None:
+            continue
+        try:
+            positions = worker.compute(network)
+            print(f"Computed layout for {network}: {len(positions)} nodes")
+        except Exception as e:
+            print(f"Failed {network}: {e}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import scipy.sparse as sp
+
+from graph_payloads import graph_index, network_files
+from network_stats import core_numbers
+
+DEFAULT_MAX_NODES = 2000
+DEFAULT_MAX_EDGES = 10000
+
+def load_structure(nodes_file, edges_file):
+    """Graful neorientat, fara bucle si muchii duble, cu nodurile ordonate dupa importanta"""
+    nodes, source, target = graph_index(nodes_file, edges_file)
+    num_nodes = len(nodes)
+    keep = source != target
+    source, target = source[keep], target[keep]
+
+    adjacency = sp.coo_matrix(
+        (np.ones(2 * len(source), dtype=np.int32), (np.concatenate([source, target]), np.concatenate([target, source]))),
+        shape=(num_nodes, num_nodes)
+    ).tocsr()
+    adjacency.data[:] = 1
+    upper = sp.triu(adjacency, k=1).tocoo()
+
+    degree = np.diff(adjacency.indptr)
+    cores = core_numbers(adjacency)
+    # k-core descrescator, apoi grad descrescator; rank 0 e nodul cel mai important
+    order = np.lexsort((np.arange(num_nodes), -degree, -cores))
+    rank = np.empty(num_nodes, dtype=np.int64)
+    rank[order] = np.arange(num_nodes)
+
+    return {
+        "nodes": nodes,
+        "source": upper.row.astype(np.int64),
+        "target": upper.col.astype(np.int64),
+        "rank": rank
+    }
+
+def representatives(structure, kept):
+    """Fiecare nod pastrat se reprezinta pe sine; un nod ascuns e absorbit de cel mai important
+    vecin pastrat, iar daca nu are niciunul ramane -1"""
+    source, target, rank = structure["source"], structure["target"], structure["rank"]
+    rep = np.full(len(rank), -1, dtype=np.int64)
+    rep[kept] = kept
+
+    # perechile (ascuns, vecin pastrat), in ambele directii
+    hidden_end = np.concatenate([source, target])
+    kept_end = np.concatenate([target, source])
+    mask = (rep[hidden_end] == -1) & (rep[kept_end] == kept_end)
+    hidden_end, kept_end = hidden_end[mask], kept_end[mask]
+    if len(hidden_end):
+        order = np.lexsort((rank[kept_end], hidden_end))
+        hidden_end, kept_end = hidden_end[order], kept_end[order]
+        first = np.concatenate([[True], hidden_end[1:] != hidden_end[:-1]])
+        rep[hidden_end[first]] = kept_end[first]
+    return rep
+
+def reduce_structure(structure, keep, max_nodes, max_edges):
+    """Vederea redusa: nodurile fortate plus cele mai importante, cu muchiile agregate pe reprezentanti"""
+    num_nodes = len(structure["rank"])
+    num_edges = len(structure["source"])
+    rank = structure["rank"]
+
+    forced = np.asarray(keep, dtype=np.int64)
+    # nodurile fortate (seed-uri, activate) trec inaintea celorlalte, in ordinea primita
+    # (cele activate mai devreme intai), ca sa putem taia din ele cand depasesc bugetul
+    priority = rank.copy()
+    priority[forced] = np.arange(len(forced)) - len(forced)
+
+    if num_nodes <= max_nodes:
+        kept = np.arange(num_nodes)
+    else:
+        by_priority = np.argsort(priority, kind='stable')
+        kept = np.sort(by_priority[:max_nodes])
+    dropped_forced = int(len(forced) - np.isin(forced, kept).sum())
+
+    rep = representatives(structure, kept)
+    src_rep, dst_rep = rep[structure["source"]], rep[structure["target"]]
+    valid = (src_rep >= 0) & (dst_rep >= 0) & (src_rep != dst_rep)
+    pairs = np.sort(np.column_stack([src_rep[valid], dst_rep[valid]]), axis=1)
+    if len(pairs):
+        pairs, weights = np.unique(pairs, axis=0, return_counts=True)
+    else:
+        pairs, weights = np.zeros((0, 2), dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    if len(pairs) > max_edges:
+        # o muchie e cat de importanta e capatul ei mai slab; muchiile agregate dese trec inainte
+        edge_priority = np.maximum(priority[pairs[:, 0]], priority[pairs[:, 1]])
+        selected = np.lexsort((-weights, edge_priority))[:max_edges]
+        selected.sort()
+        pairs, weights = pairs[selected], weights[selected]
+
+    absorbed = np.bincount(rep[rep >= 0], minlength=num_nodes)[kept] - 1
+    position = np.full(num_nodes, -1, dtype=np.int64)
+    position[kept] = np.arange(len(kept))
+
+    lod = {
+        "reduced": bool(len(kept) < num_nodes or len(pairs) < num_edges),
+        "total_nodes": num_nodes,
+        "total_edges": num_edges,
+        "shown_nodes": int(len(kept)),
+        "shown_edges": int(len(pairs)),
+        "hidden_nodes": int((rep < 0).sum()),
+        "dropped_forced_nodes": dropped_forced
+    }
+    # fara reducere fiecare nod se reprezinta doar pe sine si fiecare muchie are ponderea 1
+    if lod["reduced"]:
+        lod["absorbed"] = absorbed.tolist()
+        lod["edge_weights"] = weights.tolist()
+    return {"node_index": kept, "edge_index": position[pairs], "lod": lod}
+
+class LevelOfDetail:
+    """Vederi reduse ale retelelor mari, pentru desenat in browser.
+
+    Structura fiecarei retele (muchii neorientate si ordinea nodurilor dupa k-core si grad)
+    e calculata o singura data si tinuta in memorie; vederile rezultate sunt si ele pastrate,
+    dupa retea, buget si nodurile fortate."""
+
+    def __init__(self, dataset_folder, max_structures=8, max_views=64):
+        self.dataset_folder = dataset_folder
+        self.max_structures = max_structures
+        self.max_views = max_views
+        self.structures = OrderedDict()  # retea -> (mtime, structura)
+        self.views = OrderedDict()  # (retea, mtime, buget, noduri fortate) -> vedere
+        self.lock = threading.Lock()
+
+    def structure(self, network):
+        nodes_file, edges_file = network_files(self.dataset_folder, network)
+        if not os.path.exists(edges_file):
+            return None, None
+        mtime = max(os.path.getmtime(path) for path in (nodes_file, edges_file) if os.path.exists(path))
+
+        with self.lock:
+            entry = self.structures.get(network)
+            if entry is not None and entry[0] >= mtime:
+                self.structures.move_to_end(network)
+                return mtime, entry[1]
+
+        structure = load_structure(nodes_file, edges_file)
+        with self.lock:
+            self.structures[network] = (mtime, structure)
+            while len(self.structures) > self.max_structures:
+                self.structures.popitem(last=False)
+        return mtime, structure
+
+    def view(self, network, keep_nodes=(), max_nodes=DEFAULT_MAX_NODES, max_edges=DEFAULT_MAX_EDGES):
+        """{"nodes", "edges" (perechi de indici in nodes), "lod"} sau None daca reteaua nu exista"""
+        mtime, structure = self.structure(network)
+        if structure is None:
+            return None
+
+        keep = structure["nodes"].get_indexer(list(keep_nodes))
+        keep = keep[keep >= 0]
+        # pastram ordinea primei aparitii, ea decide ce noduri fortate incap in buget
+        keep = keep[np.sort(np.unique(keep, return_index=True)[1])]
+        key = (network, mtime, max_nodes, max_edges, hashlib.md5(keep.tobytes()).hexdigest())
+        with self.lock:
+            if key in self.views:
+                self.views.move_to_end(key)
+                return self.views[key]
+
+        reduced = reduce_structure(structure, keep, max_nodes, max_edges)
+        view = {
+            "nodes": structure["nodes"][reduced["node_index"]].tolist(),
+            "edges": reduced["edge_index"],
+            "lod": reduced["lod"]
+        }
+        with self.lock:
+            self.views[key] = view
+            while len(self.views) > self.max_views:
+                self.views.popitem(last=False)
+        return view
+
+def stage_nodes(*runs):
+    """Nodurile selectate sau activate din etapele uneia sau mai multor rulari, fara duplicate,
+    in ordinea activarii: etapa cu etapa, seed-urile inaintea nodurilor propagate"""
+    runs = [[stage for stage in stages or [] if isinstance(stage, dict)] for stages in runs]
+    nodes = {}
+    for step in range(max((len(stages) for stages in runs), default=0)):
+        for stages in runs:
+            if step < len(stages):
+                nodes.update(dict.fromkeys(stages[step].get("selected_nodes") or []))
+                nodes.update(dict.fromkeys(stages[step].get("propagated_nodes") or []))
+    return list(nodes)
@@ -0,0 +1,126 @@
+import os
+import gzip
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+PAYLOAD_DIR = os.path.join(os.path.dirname(__file__), 'graph_cache')
+PAYLOAD_VERSION = 2
+
+def network_files(dataset_folder, network):
+    """Fisierele de noduri si de muchii pentru o retea 'nume numar'"""
+    dataset_name, dataset_number = network.split(' ')
+    base_path = os.path.join(dataset_folder, dataset_name)
+    return (
+        os.path.join(base_path, f"{dataset_number}_nodes.csv"),
+        os.path.join(base_path, f"{dataset_number}_edges.csv")
+    )
+
+def graph_index(nodes_file, edges_file):
+    """Ordinea nodurilor folosita in payload si capetele muchiilor ca indici in ea"""
+    df_edges = pd.read_csv(edges_file, usecols=['source', 'target'])
+    nodes = pd.Index(pd.read_csv(nodes_file)['node_id'].unique()) if os.path.exists(nodes_file) else pd.Index([])
+
+    # nodurile care apar doar in muchii sunt adaugate la final
+    endpoints = pd.unique(np.concatenate([df_edges['source'].to_numpy(), df_edges['target'].to_numpy()]))
+    missing = pd.Index(endpoints).difference(nodes, sort=False)
+    if len(missing):
+        nodes = nodes.append(missing)
+
+    return nodes, nodes.get_indexer(df_edges['source']), nodes.get_indexer(df_edges['target'])
+
+class GraphPayloadCache:
+    """Graful unei retele serializat o singura data, in memorie si pe disc.
+
+    Payload-ul e JSON compact: lista nodurilor si muchiile ca perechi de indici intr-o
+    lista plata, plus coordonatele nodurilor cand layout-ul precalculat e disponibil.
+    Payload-ul e pastrat comprimat cu gzip, in memorie si pe disc, si e trimis asa clientilor
+    care accepta gzip. ETag-ul e hash-ul octetilor comprimati (gzip fara mtime, deci stabil),
+    iar fisierul de pe disc e refacut doar cand CSV-urile sursa sau layout-ul se schimba."""
+
+    def __init__(self, dataset_folder, max_entries=32, payload_dir=PAYLOAD_DIR, layouts=None):
+        self.dataset_folder = dataset_folder
+        self.layouts = layouts
+        self.max_entries = max_entries
+        self.payload_dir = payload_dir
+        self.entries = OrderedDict()  # retea -> (etag, last_modified, body comprimat)
+        self.lock = threading.Lock()
+
+    def source_files(self, network):
+        return network_files(self.dataset_folder, network)
+
+    def get(self, network):
+        """(etag, last_modified, body comprimat cu gzip) sau None daca reteaua nu exista"""
+        nodes_file, edges_file = self.source_files(network)
+        if not os.path.exists(edges_file):
+            return None
+        sources = [nodes_file, edges_file]
+        if self.layouts is not None:
+            # layout-ul lipsa sau vechi e pus in coada; payload-ul se reface cand e gata
+            self.layouts.request(network)
+            sources.append(self.layouts.layout_path(network))
+        last_modified = max(os.path.getmtime(path) for path in sources if os.path.exists(path))
+
+        with self.lock:
+            entry = self.entries.get(network)
+            if entry is not None and entry[1] >= last_modified:
+                self.entries.move_to_end(network)
+                return entry
+
+        body = self.load(network, last_modified)
+        if body is None:
+            body = gzip.compress(self.build(network, nodes_file, edges_file), compresslevel=6, mtime=0)
+            self.store(network, body)
+
+        entry = (hashlib.md5(body).hexdigest(), last_modified, body)
+        with self.lock:
+            self.entries[network] = entry
+            self.entries.move_to_end(network)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return entry
+
+    def payload_path(self, network):
+        return os.path.join(self.payload_dir, f"{network.replace(' ', '_')}.v{PAYLOAD_VERSION}.json.gz")
+
+    def load(self, network, last_modified):
+        path = self.payload_path(network)
+        if not os.path.exists(path) or os.path.getmtime(path) < last_modified:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                body = f.read()
+            if not body.startswith(b'\x1f\x8b'):
+                raise ValueError("not a gzip file")
+            return body
+        except Exception as e:
+            print(f"[DEBUG] Warning: Failed to read graph payload {path}: {e}")
+            return None
+
+    def store(self, network, body):
+        path = self.payload_path(network)
+        try:
+            os.makedirs(self.payload_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"[DEBUG] Warning: Failed to write graph payload {path}: {e}")
+
+    def build(self, network, nodes_file, edges_file):
+        nodes, source, target = graph_index(nodes_file, edges_file)
+        payload = {
+            "version": PAYLOAD_VERSION,
+            "nodes": nodes.tolist(),
+            "edges": np.column_stack([source, target]).ravel().tolist()
+        }
+
+        # coordonatele precalculate, daca sunt gata; altfel clientul calculeaza singur layout-ul
+        positions = self.layouts.positions(network) if self.layouts is not None else None
+        if positions is not None and len(positions) == len(nodes):
+            payload["positions"] = np.round(positions, 2).ravel().tolist()
+        return json.dumps(payload, separators=(',', ':')).encode()
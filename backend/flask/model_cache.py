@@ -0,0 +1,150 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from itertools import islice
+import numpy as np
+import dill
+
+SPILL_DIR = os.path.join(os.path.dirname(__file__), 'model_cache')
+
+def estimate_size(obj, seen=None, sample=256):
+    """Amprenta aproximativa in bytes; listele mari sunt estimate dintr-un esantion"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        # getsizeof include datele doar pentru array-urile care le detin
+        if obj.base is not None:
+            return sys.getsizeof(obj) + estimate_size(obj.base, seen)
+        return sys.getsizeof(obj)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        items = list(islice(obj.items(), sample))
+        if items:
+            inner = sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in items)
+            size += inner * len(obj) // len(items)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        items = list(islice(obj, sample))
+        if items:
+            inner = sum(estimate_size(item, seen) for item in items)
+            size += inner * len(obj) // len(items)
+    elif hasattr(obj, '__dict__'):
+        size += estimate_size(vars(obj), seen)
+    return size
+
+class ModelCache:
+    """Cache LRU pentru modelele initializate, limitat dupa memoria ocupata.
+
+    Modelele evacuate pot fi scrise pe disc (dill) si reincarcate la urmatoarea cerere,
+    ceea ce e mult mai rapid decat reconstructia lor din CSV."""
+
+    def __init__(self, max_bytes, spill=True, spill_max_bytes=None, spill_dir=SPILL_DIR):
+        self.max_bytes = max_bytes
+        self.spill = spill
+        self.spill_max_bytes = spill_max_bytes
+        self.spill_dir = spill_dir
+        self.entries = OrderedDict()  # cheie -> (model, bytes)
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0, "spills": 0, "reloads": 0}
+
+    def spill_path(self, key):
+        return os.path.join(self.spill_dir, f'{key}.pkl')
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.counters["hits"] += 1
+                return self.entries[key][0]
+
+        model = self.reload(key)
+        with self.lock:
+            if model is None:
+                self.counters["misses"] += 1
+                return None
+            self.counters["reloads"] += 1
+        self.put(key, model)
+        return model
+
+    def put(self, key, model):
+        size = estimate_size(model)
+        evicted = []
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (model, size)
+            self.total_bytes += size
+
+            # pastram mereu cel putin modelul tocmai adaugat
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                old_key, (old_model, old_size) = self.entries.popitem(last=False)
+                self.total_bytes -= old_size
+                self.counters["evictions"] += 1
+                evicted.append((old_key, old_model))
+
+        for old_key, old_model in evicted:
+            self.spill_model(old_key, old_model)
+
+    def spill_model(self, key, model):
+        if not self.spill:
+            return
+        path = self.spill_path(key)
+        if os.path.exists(path):
+            return
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                dill.dump(model, f, protocol=dill.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            with self.lock:
+                self.counters["spills"] += 1
+            self.trim_spill_dir()
+        except Exception as e:
+            print(f"[DEBUG] Warning: Failed to spill model {key}: {e}")
+
+    def reload(self, key):
+        path = self.spill_path(key)
+        if not self.spill or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                model = dill.load(f)
+            os.utime(path)
+            return model
+        except Exception as e:
+            print(f"[DEBUG] Warning: Failed to reload spilled model {key}: {e}")
+            return None
+
+    def trim_spill_dir(self):
+        if self.spill_max_bytes is None:
+            return
+        files = [
+            os.path.join(self.spill_dir, name)
+            for name in os.listdir(self.spill_dir) if name.endswith('.pkl')
+        ]
+        # stergem intai fisierele folosite cel mai demult
+        files.sort(key=os.path.getmtime, reverse=True)
+        used = 0
+        for path in files:
+            used += os.path.getsize(path)
+            if used > self.spill_max_bytes:
+                os.unlink(path)
+
+    def stats(self):
+        with self.lock:
+            return {
+                **self.counters,
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "models": [
+                    {"cache_key": key, "model_id": getattr(model, '_model_id', None), "bytes": size}
+                    for key, (model, size) in self.entries.items()
+                ]
+            }
@@ -4,6 +4,235 @@ import random
 from functools import lru_cache
 import multiprocessing as mp
 
+def edge_index_arrays(edges, node_indices):
+    """Indicii capetelor fiecarei muchii, ca doua array-uri paralele"""
+    src = np.fromiter((node_indices[u] for u, _ in edges), dtype=np.int64, count=len(edges))
+    dst = np.fromiter((node_indices[v] for _, v in edges), dtype=np.int64, count=len(edges))
+    return src, dst
+
+
+def csr_from_index_arrays(src, dst, num_nodes, directed=False, return_positions=False):
+    """CSR (indptr, indices); vecinii fiecarui nod raman in ordinea muchiilor"""
+    if directed:
+        rows, cols = src, dst
+    else:
+        # fiecare muchie apare in ambele directii, intercalat
+        rows = np.column_stack([src, dst]).ravel()
+        cols = np.column_stack([dst, src]).ravel()
+    order = np.argsort(rows, kind='stable')
+
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_nodes), out=indptr[1:])
+    indices = cols[order].astype(np.int32)
+
+    if not return_positions:
+        return indptr, indices
+
+    # pozitia in CSR a fiecarui arc; la grafuri neorientate u->v are index par, v->u impar
+    positions = np.empty_like(order)
+    positions[order] = np.arange(len(order))
+    return indptr, indices, positions
+
+
+def csr_gather(indptr, rows):
+    """Pozitiile din CSR ale tuturor arcelor care pleaca din nodurile date"""
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return offsets + np.arange(total)
+
+
+def build_csr(nodes, edges, node_indices=None):
+    """Construieste reprezentarea CSR (indptr, indices) a grafului neorientat"""
+    if node_indices is None:
+        node_indices = {node: i for i, node in enumerate(nodes)}
+    src, dst = edge_index_arrays(edges, node_indices)
+    return csr_from_index_arrays(src, dst, len(nodes))
+
+
+class CSRGraph:
+    """Graful in format CSR. Cel neorientat foloseste aceeasi structura in ambele directii,
+    iar pentru cel orientat transpusa se construieste doar cand e ceruta."""
+
+    def __init__(self, num_nodes, src, dst, directed=False):
+        self.num_nodes = num_nodes
+        self.directed = directed
+        self.indptr, self.indices, positions = csr_from_index_arrays(
+            src, dst, num_nodes, directed=directed, return_positions=True
+        )
+        if directed:
+            self.edge_arcs = positions
+            self.twin_arcs = None
+        else:
+            self.edge_arcs = positions[0::2]
+            self.twin_arcs = positions[1::2]
+
+        self._reverse = None
+        self._twin = None
+
+    def __getstate__(self):
+        # structurile derivate se reconstruiesc la nevoie, nu le trimitem la subprocese
+        state = self.__dict__.copy()
+        state['_reverse'] = None
+        state['_twin'] = None
+        return state
+
+    @property
+    def num_arcs(self):
+        return len(self.indices)
+
+    def arc_values_from_edges(self, edge_values):
+        """Valori date per muchie (in ordinea listei de muchii), aliniate cu arcele din CSR"""
+        values = np.empty(self.num_arcs, dtype=np.float64)
+        values[self.edge_arcs] = edge_values
+        if not self.directed:
+            values[self.twin_arcs] = edge_values
+        return values
+
+    def edge_values(self, values, reverse=False):
+        """Valorile arcelor u->v (sau v->u, pentru grafuri neorientate) in ordinea muchiilor"""
+        return values[self.twin_arcs if reverse else self.edge_arcs]
+
+    def in_degrees(self):
+        return np.bincount(self.indices, minlength=self.num_nodes)
+
+    def arc_sources(self):
+        return np.repeat(np.arange(self.num_nodes, dtype=np.int64), np.diff(self.indptr))
+
+    def reverse_structure(self):
+        """CSR-ul transpus: pentru fiecare nod v, nodurile u cu arc u->v"""
+        if not self.directed:
+            return self.indptr, self.indices
+        if self._reverse is None:
+            order = np.argsort(self.indices, kind='stable')
+            indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+            np.cumsum(self.in_degrees(), out=indptr[1:])
+            indices = self.arc_sources()[order].astype(np.int32)
+            self._reverse = (indptr, indices, order)
+        return self._reverse[:2]
+
+    def reverse_values(self, values):
+        """Valorile arcelor, aliniate cu CSR-ul transpus"""
+        if self.directed:
+            self.reverse_structure()
+            return values[self._reverse[2]]
+
+        # valorile simetrice sunt deja aliniate, folosim aceeasi memorie
+        if np.array_equal(values[self.edge_arcs], values[self.twin_arcs]):
+            return values
+        if self._twin is None:
+            twin = np.empty(self.num_arcs, dtype=np.int64)
+            twin[self.edge_arcs] = self.twin_arcs
+            twin[self.twin_arcs] = self.edge_arcs
+            self._twin = twin
+        return values[self._twin]
+
+    def find_arcs(self, src, dst):
+        """Pozitiile arcelor src->dst (care trebuie sa existe in graf)"""
+        arc_keys = self.arc_sources() * self.num_nodes + self.indices
+        sorter = np.argsort(arc_keys, kind='stable')
+        keys = np.asarray(src, dtype=np.int64) * self.num_nodes + np.asarray(dst, dtype=np.int64)
+        return sorter[np.searchsorted(arc_keys, keys, sorter=sorter)]
+
+
+def group_edge_positions(model, groups):
+    """Pozitiile in model.edges ale muchiilor din interiorul fiecarui grup de noduri.
+
+    O singura trecere prin arcele u->v ale muchiilor, grupate dupa eticheta comuna a capetelor."""
+    labels = np.full(model.num_nodes, -1, dtype=np.int64)
+    for group, members in enumerate(groups):
+        labels[[model.node_indices[node] for node in members]] = group
+
+    edge_arcs = model.graph.edge_arcs
+    edge_labels = labels[model.graph.arc_sources()[edge_arcs]]
+    edge_labels[edge_labels != labels[model.graph.indices[edge_arcs]]] = -1
+
+    inside = np.nonzero(edge_labels >= 0)[0]
+    inside = inside[np.argsort(edge_labels[inside], kind='stable')]
+    bounds = np.searchsorted(edge_labels[inside], np.arange(len(groups) + 1))
+    return [inside[bounds[g]:bounds[g + 1]] for g in range(len(groups))]
+
+def restrict_arc_values(graph, sub_graph, values, edge_positions):
+    """Valorile arcelor unui subgraf construit din muchiile edge_positions ale grafului complet"""
+    sub_values = np.empty(sub_graph.num_arcs, dtype=values.dtype)
+    sub_values[sub_graph.edge_arcs] = values[graph.edge_arcs[edge_positions]]
+    if not graph.directed:
+        sub_values[sub_graph.twin_arcs] = values[graph.twin_arcs[edge_positions]]
+    return sub_values
+
+
+# generatoarele de probabilitati pentru IC, pe arcele din CSR
+PROBABILITY_MODELS = ("uniform", "weighted_cascade", "trivalency", "edge_weight")
+TRIVALENCY_VALUES = (0.1, 0.01, 0.001)
+
+def weighted_cascade_probabilities(graph):
+    """p(u, v) = 1 / grad_intrare(v)"""
+    return 1.0 / graph.in_degrees()[graph.indices]
+
+def trivalency_probabilities(graph, rng, values=TRIVALENCY_VALUES):
+    # o valoare per muchie, aceeasi in ambele directii pentru grafuri neorientate
+    return graph.arc_values_from_edges(rng.choice(values, size=len(graph.edge_arcs)))
+
+def edge_weight_probabilities(graph, edge_weights):
+    """Ponderile din fisierul de muchii; daca depasesc 1 sunt scalate la maxim"""
+    weights = np.asarray(edge_weights, dtype=np.float64)
+    if len(weights) and weights.max() > 1:
+        weights = weights / weights.max()
+    return graph.arc_values_from_edges(np.clip(weights, 0, 1))
+
+
+class LiveEdgeCoins:
+    """Monedele unei simulari, fixate per arc: orice seed set evaluat cu aceeasi cheie
+    vede aceleasi arce vii (numere aleatoare comune intre candidati)"""
+
+    def __init__(self, key):
+        self.key = np.uint64(key)
+
+    def random(self, arcs):
+        # splitmix64 pe (cheie, pozitia arcului), calculat doar pentru arcele atinse
+        with np.errstate(over='ignore'):
+            z = (np.asarray(arcs, dtype=np.uint64) + self.key) * np.uint64(0x9E3779B97F4A7C15)
+            z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            z = z ^ (z >> np.uint64(31))
+        return (z >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+def arc_draws(rng, arcs):
+    """Numerele uniforme pentru arcele date, din generatorul primit (sau cel global)"""
+    if rng is None:
+        return np.random.random(len(arcs))
+    if isinstance(rng, LiveEdgeCoins):
+        return rng.random(arcs)
+    return rng.random(len(arcs))
+
+
+def random_root(rng, num_nodes):
+    if rng is None:
+        return np.random.randint(num_nodes)
+    return int(rng.integers(num_nodes))
+
+
+def nodes_activated_by(model, activation_steps, step):
+    """Nodurile activate pana la pasul dat (inclusiv), citite dintr-un trace"""
+    active = np.nonzero((activation_steps >= 0) & (activation_steps <= step))[0]
+    return [model.idx_to_node[idx] for idx in active.tolist()]
+
+# LT vazut prin esantionare inversa (seturi RR, grafuri live-edge): fiecare nod isi pastreaza cel mult
+# un predecesor viu, ales dupa pondere; asta e echivalent cu LT doar pentru praguri uniforme in [0, 1]
+# redesenate la fiecare cascada, nu cu pragurile fixate o data din threshold_range
+LIVE_EDGE_LT = "live_edge_lt"
+
+def sampled_model(model):
+    """Modelul pe care il optimizeaza algoritmii bazati pe sample_rr_set/incoming_csr (D-SSA, SKIM)"""
+    if isinstance(model, OptimizedLinearThresholdModel):
+        return LIVE_EDGE_LT
+    return model.__class__.__name__
+
+
 class PropagationModel:
     """Clasa de baza pentru modelele de propagare"""
     
@@ -20,51 +249,66 @@ class PropagationModel:
 
 
 class OptimizedLinearThresholdModel:    
-    def __init__(self, nodes, edges, threshold_range=(0, 1)):
+    def __init__(self, nodes, edges, threshold_range=(0, 1), directed=False, seed=None):
         self.nodes = nodes
         self.edges = edges
         self.node_indices = {node: i for i, node in enumerate(nodes)}
         self.idx_to_node = {i: node for node, i in self.node_indices.items()}  # Reverse lookup cache
         self.num_nodes = len(nodes)
+        self.threshold_range = threshold_range
+        self.directed = directed
+
+        # Graful CSR; ponderile sunt aliniate cu arcele u->v
+        src, dst = edge_index_arrays(edges, self.node_indices)
+        self.graph = CSRGraph(self.num_nodes, src, dst, directed)
+        rng = np.random.default_rng(seed)
+
+        # 1. Setăm ponderile random, generate toate odată (o pondere per muchie)
+        weights = self.graph.arc_values_from_edges(rng.uniform(0, 1, size=len(src)))
+
+        # 2. Normalizăm ponderile: suma ponderilor primite de fiecare nod, cu bincount pe arce
+        total_weight = np.bincount(self.graph.indices, weights=weights, minlength=self.num_nodes)
+        self.edge_weight = weights / np.where(total_weight > 0, total_weight, 1)[self.graph.indices]
+        self._in_weight = None
 
-        # Matrice de adiacență (ponderi)
-        self.adj_matrix = np.zeros((self.num_nodes, self.num_nodes))
-        self.neighbors = [[] for _ in range(self.num_nodes)]
-        
-        # 1. Setăm ponderile random și construim vecinii
-        for u, v in edges:
-            weight = random.uniform(0, 1)
-            u_idx, v_idx = self.node_indices[u], self.node_indices[v]
-            self.adj_matrix[u_idx, v_idx] = weight
-            self.adj_matrix[v_idx, u_idx] = weight
-            self.neighbors[u_idx].append(v_idx)
-            self.neighbors[v_idx].append(u_idx)
-        
-        # 2. Normalizăm ponderile
-        for node_idx in range(self.num_nodes):
-            incoming_neighbors = self.neighbors[node_idx]
-            total_weight = sum(self.adj_matrix[neighbor_idx, node_idx] for neighbor_idx in incoming_neighbors)
-            if total_weight > 0:
-                for neighbor_idx in incoming_neighbors:
-                    self.adj_matrix[neighbor_idx, node_idx] /= total_weight
-        
         # 3. Praguri generate vectorizat
         low, high = threshold_range
-        self.thresholds = np.random.uniform(low, high, size=self.num_nodes)
+        self.thresholds = rng.uniform(low, high, size=self.num_nodes)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_in_weight'] = None
+        return state
+
+    @property
+    def in_weight(self):
+        """Ponderile w(u, v) aliniate cu CSR-ul transpus, construite doar cand sunt cerute"""
+        if self._in_weight is None:
+            self._in_weight = self.graph.reverse_values(self.edge_weight)
+        return self._in_weight
 
     def get_node_from_index(self, index):
         return self.idx_to_node.get(index)
+
+    def _seed_indices(self, seed_nodes):
+        return np.unique(np.array(
+            [self.node_indices[node] for node in seed_nodes if node in self.node_indices], dtype=np.int64
+        ))
+
+    def _received_influence(self, sources):
+        # influența trimisă de nodurile date pe arcele lor de ieșire
+        arcs = csr_gather(self.graph.indptr, sources)
+        return np.bincount(self.graph.indices[arcs], weights=self.edge_weight[arcs], minlength=self.num_nodes)
     
-    def propagate(self, active_nodes):
+    def propagate(self, active_nodes, rng=None):
+        # pragurile sunt fixate la constructie, deci pasul LT nu consuma numere aleatoare
         # Bitmap pentru nodurile active
+        active_indices = self._seed_indices(active_nodes)
         active_bitmap = np.zeros(self.num_nodes, dtype=bool)
-        for node in active_nodes:
-            idx = self.node_indices.get(node)
-            if idx is not None:
-                active_bitmap[idx] = True
+        active_bitmap[active_indices] = True
 
         # Vectorizat: influența totală primită de fiecare nod
-        influence = self.adj_matrix.T @ active_bitmap  # shape: (num_nodes,)
+        influence = self._received_influence(active_indices)
 
         # Determinăm nodurile noi activate
         newly_active = ~active_bitmap & (influence >= self.thresholds)
@@ -74,98 +318,245 @@ class OptimizedLinearThresholdModel:
 
         return [self.idx_to_node[idx] for idx in all_active_indices]
 
+    def trace(self, seed_nodes, max_steps=None, rng=None):
+        """O singura propagare pas cu pas; pasul de activare al fiecarui nod (-1 daca ramane inactiv)"""
+        activation_steps = np.full(self.num_nodes, -1, dtype=np.int32)
+        newly_active = self._seed_indices(seed_nodes)
+        activation_steps[newly_active] = 0
+
+        # influenta primita se actualizeaza doar cu nodurile nou activate
+        influence = np.zeros(self.num_nodes)
+        step = 0
+        while len(newly_active) and (max_steps is None or step < max_steps):
+            step += 1
+            influence += self._received_influence(newly_active)
+            newly_active = np.nonzero((activation_steps < 0) & (influence >= self.thresholds))[0]
+            activation_steps[newly_active] = step
+
+        return activation_steps
+
+    def sample_rr_set(self, root=None, rng=None):
+        """Set RR (reverse reachable): drumul invers aleator prin vecinii alesi dupa pondere.
+        Esantioneaza varianta live-edge a LT (praguri uniforme in [0, 1] la fiecare cascada),
+        nu self.thresholds; vezi LIVE_EDGE_LT"""
+        if root is None:
+            root = random_root(rng, self.num_nodes)
+
+        indptr, indices = self.graph.reverse_structure()
+        in_weight = self.in_weight
+        rr_set = [root]
+        visited = {root}
+        node = root
+        while True:
+            start, end = indptr[node], indptr[node + 1]
+            if start == end:
+                break
+            # fiecare nod alege cel mult un vecin, cu probabilitatea ponderii sale
+            cumulative = np.cumsum(in_weight[start:end])
+            pos = np.searchsorted(cumulative, arc_draws(rng, [start])[0], side='right')
+            if pos >= end - start:
+                break
+            node = int(indices[start + pos])
+            if node in visited:
+                break
+            visited.add(node)
+            rr_set.append(node)
+
+        return rr_set
+
+    def incoming_csr(self):
+        """CSR-ul arcelor de intrare: pentru fiecare nod v, vecinii u si ponderea w(u, v);
+        folosit pentru grafurile live-edge, care ignora si ele self.thresholds"""
+        indptr, indices = self.graph.reverse_structure()
+        return indptr, indices, self.in_weight
+
+    def subgraph(self, sub_nodes):
+        """Model restrans la o submultime de noduri, cu aceleasi ponderi si praguri"""
+        return self.subgraphs([sub_nodes])[0]
+
+    def subgraphs(self, groups):
+        """Cate un model restrans pentru fiecare grup disjunct de noduri"""
+        models = []
+        for members, positions in zip(groups, group_edge_positions(self, groups)):
+            members = list(members)
+            sub_edges = [self.edges[i] for i in positions.tolist()]
+            model = OptimizedLinearThresholdModel(members, sub_edges, self.threshold_range, self.directed)
+            model.edge_weight = restrict_arc_values(self.graph, model.graph, self.edge_weight, positions)
+            model.thresholds = self.thresholds[[self.node_indices[node] for node in members]]
+            models.append(model)
+        return models
+
     def get_model_params(self):
+        """Rezumat compact al parametrilor; pragurile individuale sunt in get_param_arrays"""
         return {
-            "thresholds": self.thresholds.tolist()
+            "threshold_range": list(self.threshold_range),
+            "mean_threshold": float(self.thresholds.mean()) if self.num_nodes else None,
+            "num_nodes": self.num_nodes,
+            "directed": self.directed
+        }
+
+    def get_param_arrays(self):
+        return {
+            "thresholds": self.thresholds
         }
 
 class IndependentCascadeModel:    
-    def __init__(self, nodes, edges, propagation_probability=0.1):
+    def __init__(self, nodes, edges, propagation_probability=0.1, probability_model="uniform", edge_weights=None, directed=False, seed=None):
         self.nodes = nodes
         self.edges = edges
         self.node_indices = {node: i for i, node in enumerate(nodes)}
         self.idx_to_node = {i: node for node, i in self.node_indices.items()}  # Optimizare: cache invers
         self.num_nodes = len(nodes)
-        
-        # Folosim array vectorizat pentru probabilități
-        self.adj_matrix = np.zeros((self.num_nodes, self.num_nodes))
-        
-        # Optimizare: Folosim liste compacte pentru vecini
-        self.neighbors = [[] for _ in range(self.num_nodes)]
-        
-        # Setăm probabilitățile de propagare în matricea de adiacență
-        for u, v in edges:
-            u_idx, v_idx = self.node_indices[u], self.node_indices[v]
-            self.adj_matrix[u_idx, v_idx] = propagation_probability
-            self.adj_matrix[v_idx, u_idx] = propagation_probability
-            self.neighbors[u_idx].append(v_idx)
-            self.neighbors[v_idx].append(u_idx)
-        
-        # Pre-calculăm array-uri numpy pentru vecini pentru procesare vectorială
-        self.neighbors_array = [np.array(n) for n in self.neighbors]
-        
-        # Optimizare: Pre-alocăm structuri de date folosite în propagare
-        self._active_bitmap = np.zeros(self.num_nodes, dtype=bool)
+        self.propagation_probability = propagation_probability
+        self.probability_model = probability_model
+        self.directed = directed
+
+        # CSR: arcele u->v ale fiecarui nod u, cu probabilitatea fiecarui arc aliniata cu indices
+        src, dst = edge_index_arrays(edges, self.node_indices)
+        self.graph = CSRGraph(self.num_nodes, src, dst, directed)
+        self.edge_prob = self._generate_probabilities(probability_model, edge_weights, np.random.default_rng(seed))
+
+        # probabilitatile pe CSR-ul transpus, construite doar cand sunt cerute (seturi RR, schite)
+        self._in_prob = None
+
+    def _generate_probabilities(self, probability_model, edge_weights, rng):
+        if probability_model == "uniform":
+            return np.full(self.graph.num_arcs, self.propagation_probability, dtype=np.float64)
+        if probability_model == "weighted_cascade":
+            return weighted_cascade_probabilities(self.graph)
+        if probability_model == "trivalency":
+            return trivalency_probabilities(self.graph, rng)
+        if probability_model == "edge_weight":
+            if edge_weights is None or len(edge_weights) != len(self.edges):
+                raise ValueError("Edge weight probabilities need one weight per edge")
+            return edge_weight_probabilities(self.graph, edge_weights)
+        raise ValueError(f"Unsupported probability model: {probability_model}")
+
+    @property
+    def in_prob(self):
+        """Probabilitatile p(u, v) aliniate cu CSR-ul transpus"""
+        if self._in_prob is None:
+            self._in_prob = self.graph.reverse_values(self.edge_prob)
+        return self._in_prob
+
+    def __getstate__(self):
+        # probabilitatile inverse se pot reconstrui, nu le trimitem la subprocese
+        state = self.__dict__.copy()
+        state['_in_prob'] = None
+        return state
 
     def get_node_from_index(self, index):
         return self.idx_to_node.get(index)  # Folosim caching pentru mapare inversă
-    
-    def propagate(self, active_nodes):
-        # Resetăm și inițializăm bitmap-ul activ
-        self._active_bitmap.fill(False)
-        
-        # Convertim nodurile active la indici
-        active_indices = {self.node_indices[node] for node in active_nodes if node in self.node_indices}
-        for idx in active_indices:
-            self._active_bitmap[idx] = True
-        
-        # Păstrăm nodurile nou activate în fiecare pas
-        new_active = set(active_indices)
-        frontier = set(active_indices)
-        
-        # Continuăm până când nu mai avem activări noi
-        while frontier:
-            next_frontier = set()
-            
-            # Pentru fiecare nod activ din frontiera actuală
-            for node_idx in frontier:
-                neighbors_idx = self.neighbors_array[node_idx]
-                
-                if len(neighbors_idx) == 0:  # Verificăm dacă nodul are vecini
-                    continue
-                
-                # Filtrăm doar vecinii inactivi
-                inactive_neighbors = neighbors_idx[~self._active_bitmap[neighbors_idx]]
-                
-                if len(inactive_neighbors) == 0:
-                    continue
-                
-                # Optimizare: Generăm toate numerele aleatorii deodată
-                random_probs = np.random.random(len(inactive_neighbors))
-                
-                # Verificăm activarea pentru fiecare vecin
-                for idx, neighbor_idx in enumerate(inactive_neighbors):
-                    if random_probs[idx] < self.adj_matrix[node_idx, neighbor_idx]:
-                        next_frontier.add(neighbor_idx)
-                        self._active_bitmap[neighbor_idx] = True
-                        new_active.add(neighbor_idx)
-            
-            # Actualizăm frontiera pentru următoarea iterație
-            frontier = next_frontier
-        
-        # Convertim indicii înapoi la nume de noduri
-        return [self.get_node_from_index(idx) for idx in new_active]
-    
+
+    def _seed_indices(self, seed_nodes):
+        return np.unique(np.array(
+            [self.node_indices[node] for node in seed_nodes if node in self.node_indices], dtype=np.int64
+        ))
+
+    def propagate(self, active_nodes, rng=None):
+        active = np.zeros(self.num_nodes, dtype=bool)
+        frontier = self._seed_indices(active_nodes)
+        active[frontier] = True
+
+        # BFS pe niveluri: toate arcele frontierei sunt incercate o data, vectorizat
+        while len(frontier):
+            arcs = csr_gather(self.graph.indptr, frontier)
+            targets = self.graph.indices[arcs]
+            live = ~active[targets] & (arc_draws(rng, arcs) < self.edge_prob[arcs])
+            frontier = np.unique(targets[live])
+            active[frontier] = True
+
+        return [self.idx_to_node[idx] for idx in np.nonzero(active)[0].tolist()]
+
+    def trace(self, seed_nodes, max_steps=None, rng=None):
+        """Un singur cascade BFS; pasul de activare al fiecarui nod (-1 daca ramane inactiv)"""
+        activation_steps = np.full(self.num_nodes, -1, dtype=np.int32)
+        frontier = self._seed_indices(seed_nodes)
+        activation_steps[frontier] = 0
+
+        step = 0
+        while len(frontier) and (max_steps is None or step < max_steps):
+            step += 1
+            # fiecare nod nou activ incearca o singura data vecinii inactivi
+            arcs = csr_gather(self.graph.indptr, frontier)
+            targets = self.graph.indices[arcs]
+            live = (activation_steps[targets] < 0) & (arc_draws(rng, arcs) < self.edge_prob[arcs])
+            frontier = np.unique(targets[live])
+            activation_steps[frontier] = step
+
+        return activation_steps
+
+    def sample_rr_set(self, root=None, rng=None):
+        """Set RR (reverse reachable): nodurile care ar fi activat radacina intr-o instanta aleatoare"""
+        if root is None:
+            root = random_root(rng, self.num_nodes)
+
+        indptr, indices = self.graph.reverse_structure()
+        in_prob = self.in_prob
+        visited = {root}
+        frontier = np.array([root], dtype=np.int64)
+        while len(frontier):
+            # fiecare arc u->nod este viu cu probabilitatea p(u, nod)
+            arcs = csr_gather(indptr, frontier)
+            sources = indices[arcs][arc_draws(rng, arcs) < in_prob[arcs]]
+            new_nodes = [u for u in np.unique(sources).tolist() if u not in visited]
+            visited.update(new_nodes)
+            frontier = np.array(new_nodes, dtype=np.int64)
+
+        return list(visited)
+
+    def incoming_csr(self):
+        """CSR-ul arcelor de intrare: pentru fiecare nod v, vecinii u si p(u, v)"""
+        indptr, indices = self.graph.reverse_structure()
+        return indptr, indices, self.in_prob
+
+    def subgraph(self, sub_nodes):
+        """Model restrans la o submultime de noduri, cu aceleasi probabilitati pe arce"""
+        return self.subgraphs([sub_nodes])[0]
+
+    def subgraphs(self, groups):
+        """Cate un model restrans pentru fiecare grup disjunct de noduri"""
+        models = []
+        for members, positions in zip(groups, group_edge_positions(self, groups)):
+            sub_edges = [self.edges[i] for i in positions.tolist()]
+            model = IndependentCascadeModel(list(members), sub_edges, self.propagation_probability, directed=self.directed)
+            model.probability_model = self.probability_model
+            model.edge_prob = restrict_arc_values(self.graph, model.graph, self.edge_prob, positions)
+            models.append(model)
+        return models
+
+    def edge_probabilities(self):
+        """Probabilitatea fiecarei muchii u->v, in ordinea din self.edges"""
+        return self.graph.edge_values(self.edge_prob)
+
+    def is_uniform(self):
+        return len(self.edge_prob) == 0 or bool(np.all(self.edge_prob == self.edge_prob[0]))
+
     def get_model_params(self):
-        # Extragem probabilitățile din matricea de adiacență
-        probabilities = {}
-        for u_idx in range(self.num_nodes):
-            for v_idx in self.neighbors[u_idx]:
-                u = self.get_node_from_index(u_idx)
-                v = self.get_node_from_index(v_idx)
-                if u_idx < v_idx:
-                    probabilities[f"{u}-{v}"] = float(self.adj_matrix[u_idx, v_idx])
-        
+        """Rezumat compact: probabilitatea uniforma simbolic, altfel doar statistici"""
+        if self.is_uniform():
+            return {
+                "probability_model": self.probability_model,
+                "propagation_probability": float(self.edge_prob[0]) if len(self.edge_prob) else self.propagation_probability,
+                "num_edges": len(self.edges),
+                "directed": self.directed
+            }
         return {
-            "probabilities": probabilities
-        }
\ No newline at end of file
+            "probability_model": self.probability_model,
+            "mean_probability": float(self.edge_prob.mean()),
+            "min_probability": float(self.edge_prob.min()),
+            "max_probability": float(self.edge_prob.max()),
+            "num_edges": len(self.edges),
+            "directed": self.directed
+        }
+
+    def get_param_arrays(self):
+        # probabilitatile uniforme sunt deja descrise complet de get_model_params
+        if self.is_uniform():
+            return {}
+        arrays = {
+            "edge_probabilities": self.edge_probabilities()
+        }
+        if not self.directed:
+            arrays["reverse_edge_probabilities"] = self.graph.edge_values(self.edge_prob, reverse=True)
+        return arrays
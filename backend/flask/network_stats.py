@@ -0,0 +1,208 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+from multiprocessing import Pool
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.sparse import csgraph
+
+from database import get_network_signatures, insert_network_stats, release_connection
+
+DEFAULT_DATASET_FOLDER = os.path.join(os.path.dirname(__file__), '..', '..', 'datasets', 'csv_files')
+
+def file_signature(path):
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def list_networks(dataset_folder):
+    """Toate retelele 'nume numar' pentru care exista un fisier de muchii"""
+    networks = []
+    for dataset_name in sorted(os.listdir(dataset_folder)):
+        base_path = os.path.join(dataset_folder, dataset_name)
+        if not os.path.isdir(base_path):
+            continue
+        for filename in sorted(os.listdir(base_path)):
+            if filename.endswith('_edges.csv'):
+                networks.append((f"{dataset_name} {filename[:-len('_edges.csv')]}", os.path.join(base_path, filename)))
+    return networks
+
+def adjacency_matrix(edges_file):
+    """Matricea de adiacenta simetrica, fara bucle si muchii duble, plus nodurile cu bucle"""
+    df = pd.read_csv(edges_file, usecols=['source', 'target'])
+    codes, _ = pd.factorize(np.concatenate([df['source'].to_numpy(), df['target'].to_numpy()]))
+    num_nodes = int(codes.max()) + 1 if len(codes) else 0
+    src, dst = codes[:len(df)], codes[len(df):]
+
+    loops = src == dst
+    loop_nodes = np.unique(src[loops])
+    src, dst = src[~loops], dst[~loops]
+
+    adjacency = sp.coo_matrix(
+        (np.ones(2 * len(src), dtype=np.int32), (np.concatenate([src, dst]), np.concatenate([dst, src]))),
+        shape=(num_nodes, num_nodes)
+    ).tocsr()
+    adjacency.data[:] = 1  # muchiile duble se contopesc
+    return adjacency, loop_nodes
+
+def triangle_counts(adjacency, block_size=4096):
+    """Triunghiurile fiecarui nod, diag(A^3)/2, calculate pe blocuri de randuri ca sa limitam memoria"""
+    num_nodes = adjacency.shape[0]
+    triangles = np.zeros(num_nodes, dtype=np.int64)
+    for start in range(0, num_nodes, block_size):
+        rows = adjacency[start:start + block_size]
+        triangles[start:start + block_size] = np.asarray((rows @ adjacency).multiply(rows).sum(axis=1)).ravel() // 2
+    return triangles
+
+def core_numbers(adjacency):
+    """Numerele k-core prin algoritmul Batagelj-Zaversnik, O(m)"""
+    indptr, indices = adjacency.indptr, adjacency.indices
+    degree = np.diff(indptr).astype(np.int64)
+    num_nodes = len(degree)
+    if num_nodes == 0:
+        return degree
+
+    # nodurile sortate dupa grad, cu pozitia de start a fiecarui grad
+    order = np.argsort(degree, kind='stable')
+    bin_start = np.concatenate([[0], np.cumsum(np.bincount(degree))[:-1]]).tolist()
+    position = np.empty(num_nodes, dtype=np.int64)
+    position[order] = np.arange(num_nodes)
+
+    order = order.tolist()
+    position = position.tolist()
+    core = degree.tolist()
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+
+    for i in range(num_nodes):
+        v = order[i]
+        for u in indices[indptr[v]:indptr[v + 1]]:
+            if core[u] > core[v]:
+                du = core[u]
+                pu = position[u]
+                pw = bin_start[du]
+                w = order[pw]
+                if u != w:
+                    order[pu], order[pw] = w, u
+                    position[u], position[w] = pw, pu
+                bin_start[du] += 1
+                core[u] -= 1
+    return np.asarray(core, dtype=np.int64)
+
+def diameter_estimate(adjacency, component_labels, sweeps=4):
+    """Limita inferioara a diametrului componentei gigant prin BFS-uri repetate (double sweep)"""
+    if adjacency.shape[0] == 0:
+        return 0
+    giant = np.bincount(component_labels).argmax()
+    members = np.nonzero(component_labels == giant)[0]
+    degree = np.diff(adjacency.indptr)
+    source = int(members[np.argmax(degree[members])])
+
+    best = 0
+    for _ in range(sweeps):
+        distances = csgraph.shortest_path(adjacency, unweighted=True, directed=False, indices=source)
+        reachable = np.isfinite(distances)
+        farthest = int(np.argmax(np.where(reachable, distances, -1)))
+        eccentricity = int(distances[farthest])
+        if eccentricity <= best:
+            break
+        best = eccentricity
+        source = farthest
+    return best
+
+def compute_network_stats(edges_file):
+    adjacency, loop_nodes = adjacency_matrix(edges_file)
+    num_nodes = adjacency.shape[0]
+    simple_degree = np.diff(adjacency.indptr).astype(np.int64)
+    num_edges = int(adjacency.nnz // 2) + len(loop_nodes)
+
+    # ca in networkx, o bucla adauga 2 la grad dar nu conteaza la clustering
+    degree = simple_degree.copy()
+    degree[loop_nodes] += 2
+
+    triangles = triangle_counts(adjacency)
+    possible = simple_degree * (simple_degree - 1)
+    clustering = np.divide(2 * triangles, possible, out=np.zeros(num_nodes), where=possible > 0)
+
+    num_components, labels = csgraph.connected_components(adjacency, directed=False)
+    component_sizes = np.bincount(labels) if num_nodes else np.zeros(0, dtype=np.int64)
+    cores = core_numbers(adjacency)
+
+    return {
+        "num_nodes": num_nodes,
+        "num_edges": num_edges,
+        "average_degree": float(degree.sum() / num_nodes) if num_nodes else 0.0,
+        "clustering_coeff": float(clustering.mean()) if num_nodes else 0.0,
+        "degree_distribution": np.bincount(degree).tolist() if num_nodes else [],
+        "extra": {
+            "num_triangles": int(triangles.sum() // 3),
+            "num_components": int(num_components),
+            "largest_component_size": int(component_sizes.max()) if num_nodes else 0,
+            "max_core": int(cores.max()) if num_nodes else 0,
+            "core_distribution": np.bincount(cores).tolist() if num_nodes else [],
+            "diameter_estimate": diameter_estimate(adjacency, labels)
+        }
+    }
+
+def _compute_task(task):
+    name, edges_file, signature = task
+    try:
+        return name, signature, compute_network_stats(edges_file), None
+    except Exception as e:
+        return name, signature, None, str(e)
+
+def compute_all_network_stats(dataset_folder, known_signatures=None, processes=None, force=False):
+    """Statisticile tuturor retelelor, in paralel; sar peste fisierele de muchii neschimbate"""
+    known_signatures = known_signatures or {}
+    tasks = []
+    for name, edges_file in list_networks(dataset_folder):
+        signature = file_signature(edges_file)
+        if force or known_signatures.get(name) != signature:
+            tasks.append((name, edges_file, signature))
+
+    if not tasks:
+        return []
+    if len(tasks) == 1 or processes == 1:
+        return [_compute_task(task) for task in tasks]
+    with Pool(processes=min(processes or os.cpu_count() or 1, len(tasks))) as pool:
+        return pool.map(_compute_task, tasks)
+
+def refresh_network_stats(dataset_folder, processes=None, force=False):
+    """Recalculeaza si salveaza statisticile retelelor noi sau modificate"""
+    try:
+        results = compute_all_network_stats(dataset_folder, get_network_signatures(), processes, force)
+        updated, failed = [], {}
+        for name, signature, stats, error in results:
+            if error is not None:
+                failed[name] = error
+                continue
+            insert_network_stats(
+                name, stats["num_nodes"], stats["num_edges"], stats["average_degree"],
+                stats["clustering_coeff"], json.dumps(stats["degree_distribution"]),
+                extra_stats=stats["extra"], source_signature=signature
+            )
+            updated.append(name)
+        return updated, failed
+    finally:
+        # ruleaza si in fire de fundal, care altfel ar tine conexiunea imprumutata
+        release_connection()
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute statistics for every network under datasets/csv_files")
+    parser.add_argument('--dataset-folder', default=DEFAULT_DATASET_FOLDER)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--force', action='store_true', help="recompute even when the edge file is unchanged")
+    args = parser.parse_args()
+
+    updated, failed = refresh_network_stats(args.dataset_folder, args.processes, args.force)
+    print(f"Updated {len(updated)} networks: {', '.join(updated) or '-'}")
+    for name, error in failed.items():
+        print(f"Failed {name}: {error}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
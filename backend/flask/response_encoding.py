@@ -0,0 +1,80 @@
+import gzip
+import json
+from flask import Response
+
+# dependinte optionale: fara ele raspunsurile raman JSON, comprimate cu gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MIN_COMPRESS_BYTES = 1024
+COMPRESSIBLE_TYPES = ("application/json", "application/msgpack")
+MSGPACK_MIMETYPE = "application/msgpack"
+
+def accepted_tokens(header):
+    """Valorile dintr-un header Accept-* cu q > 0"""
+    tokens = set()
+    for part in (header or "").split(","):
+        token, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if token and quality > 0:
+            tokens.add(token.strip().lower())
+    return tokens
+
+def serialize(payload, accept_header):
+    """JSON compact sau, daca clientul il cere si e instalat, MessagePack"""
+    if msgpack is not None and MSGPACK_MIMETYPE in accepted_tokens(accept_header):
+        body = msgpack.packb(payload, use_bin_type=True)
+        response = Response(body, mimetype=MSGPACK_MIMETYPE)
+    else:
+        body = json.dumps(payload, separators=(",", ":"))
+        response = Response(body, mimetype="application/json")
+    response.vary.add("Accept")
+    return response
+
+def compress_response(response, accept_encoding):
+    """Comprima raspunsurile mari cu brotli sau gzip, dupa Accept-Encoding"""
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_TYPES
+    ):
+        return response
+
+    body = response.get_data()
+    if len(body) < MIN_COMPRESS_BYTES:
+        return response
+
+    encodings = accepted_tokens(accept_encoding)
+    if brotli is not None and "br" in encodings:
+        compressed = brotli.compress(body, quality=4)
+        encoding = "br"
+    elif "gzip" in encodings:
+        compressed = gzip.compress(body, compresslevel=5)
+        encoding = "gzip"
+    else:
+        return response
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+
+    # reprezentarea comprimata nu mai e identica octet cu octet
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
@@ -0,0 +1,200 @@
+import os
+import sys
+import numpy as np
+from scipy.stats import norm
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'models')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'algorithms')))
+
+from propagation_models import csr_gather
+from rng_streams import resolve_seed, stream_generator, SIMULATION_STREAM
+
+# simularile sunt grupate in bucati cu generator propriu, deci rezultatul nu depinde de
+# cate seturi evaluam deodata si o evaluare mai lunga o continua pe una mai scurta
+SIMULATIONS_PER_CHUNK = 64
+# cate stari (set, simulare, nod) tinem in memorie deodata
+MAX_BATCH_CELLS = 1 << 25
+
+def geometric_positions(total, p, rng):
+    """Pozitiile din [0, total) alese independent cu probabilitatea p, prin salturi geometrice"""
+    parts = []
+    last = -1
+    while last < total - 1:
+        size = int((total - last) * p * 1.1) + 64
+        positions = last + np.cumsum(rng.geometric(p, size=size))
+        parts.append(positions[positions < total])
+        last = int(positions[-1])
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+def live_arc_graph(model, num_sims, rng):
+    """Arcele vii din num_sims instante IC, ca CSR peste randurile simulare * n + nod.
+
+    Arcele sunt grupate dupa probabilitate in clase [2^-(c+1), 2^-c); in fiecare clasa
+    candidatii din spatiul (simulare, arc) sunt alesi prin salturi geometrice cu maximul
+    clasei si pastrati cu p / maxim. Costul e cel mult dublul numarului de arce vii, nu
+    num_sims * m."""
+    prob = model.edge_prob
+    classes = np.minimum(np.floor(-np.log2(np.maximum(prob, 1e-300))), 60).astype(np.int64)
+
+    sims, arcs = [], []
+    for c in np.unique(classes[prob > 0]):
+        class_arcs = np.nonzero(classes == c)[0]
+        class_prob = prob[class_arcs]
+        p_max = float(class_prob.max())
+        positions = geometric_positions(num_sims * len(class_arcs), p_max, rng)
+        candidate_arcs = class_arcs[positions % len(class_arcs)]
+        if class_prob.min() < p_max:
+            keep = rng.random(len(positions)) * p_max < prob[candidate_arcs]
+            positions, candidate_arcs = positions[keep], candidate_arcs[keep]
+        sims.append(positions // len(class_arcs))
+        arcs.append(candidate_arcs)
+
+    sims = np.concatenate(sims) if sims else np.zeros(0, dtype=np.int64)
+    arcs = np.concatenate(arcs) if arcs else np.zeros(0, dtype=np.int64)
+    rows = sims * model.num_nodes + model.graph.arc_sources()[arcs]
+    order = np.argsort(rows, kind='stable')
+    indptr = np.zeros(num_sims * model.num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_sims * model.num_nodes), out=indptr[1:])
+    return indptr, model.graph.indices[arcs[order]].astype(np.int64)
+
+def live_edge_spreads(live_graph, num_nodes, num_sims, seed_indices, max_steps=None):
+    """Spread-ul fiecarui seed set in fiecare instanta, ca matrice (seturi, simulari).
+
+    O celula este set * num_sims * n + simulare * n + nod; toate seturile fac BFS deodata
+    pe aceleasi arce vii, deci sunt comparate cu numere aleatoare comune."""
+    indptr, targets_of = live_graph
+    span = num_sims * num_nodes
+    sim_offsets = np.arange(num_sims, dtype=np.int64)[:, None] * num_nodes
+    frontier = np.concatenate([
+        (s * span + sim_offsets + idx[None, :]).ravel() for s, idx in enumerate(seed_indices)
+    ]).astype(np.int64)
+
+    active = np.zeros(len(seed_indices) * span, dtype=bool)
+    active[frontier] = True
+    # pozitia la care a fost atinsa fiecare celula in pasul curent, ca sa eliminam duplicatele fara sortare
+    first_hit = np.empty(len(active), dtype=np.int64)
+
+    step = 0
+    while len(frontier) and (max_steps is None or step < max_steps):
+        step += 1
+        rows = frontier % span
+        arcs = csr_gather(indptr, rows)
+        counts = indptr[rows + 1] - indptr[rows]
+        reached = np.repeat(frontier - frontier % num_nodes, counts) + targets_of[arcs]
+        reached = reached[~active[reached]]
+
+        order = np.arange(len(reached))
+        first_hit[reached[::-1]] = order[::-1]
+        reached = reached[first_hit[reached] == order]
+        active[reached] = True
+        frontier = reached
+
+    return active.reshape(len(seed_indices), num_sims, num_nodes).sum(axis=2)
+
+def threshold_spreads(model, seed_indices, max_steps=None):
+    """Spread-ul LT al fiecarui seed set, ca matrice (seturi, 1): pragurile sunt fixate in
+    model, deci propagarea e determinista si o singura simulare e exacta"""
+    num_nodes = model.num_nodes
+    indptr, indices, edge_weight = model.graph.indptr, model.graph.indices, model.edge_weight
+    cells = len(seed_indices) * num_nodes
+
+    batch = np.concatenate([np.full(len(idx), s) for s, idx in enumerate(seed_indices)]).astype(np.int64)
+    frontier = np.concatenate(seed_indices).astype(np.int64)
+    active = np.zeros(cells, dtype=bool)
+    active[batch * num_nodes + frontier] = True
+    influence = np.zeros(cells)
+    thresholds = np.tile(model.thresholds, len(seed_indices))
+
+    step = 0
+    while len(frontier) and (max_steps is None or step < max_steps):
+        step += 1
+        # influenta se aduna doar de la nodurile nou activate, ca in trace()
+        arcs = csr_gather(indptr, frontier)
+        targets = np.repeat(batch, indptr[frontier + 1] - indptr[frontier]) * num_nodes + indices[arcs]
+        influence += np.bincount(targets, weights=edge_weight[arcs], minlength=cells)
+        candidates = np.unique(targets)
+        reached = candidates[~active[candidates] & (influence[candidates] >= thresholds[candidates])]
+        active[reached] = True
+        batch, frontier = reached // num_nodes, reached % num_nodes
+
+    return active.reshape(len(seed_indices), num_nodes).sum(axis=1)[:, None]
+
+def cascade_spreads(model, seed_indices, seed, first_chunk, num_chunks, max_steps=None):
+    """Spread-urile IC pentru bucatile de simulari [first_chunk, first_chunk + num_chunks)"""
+    # graful arcelor vii e comun; seturile sunt luate pe grupe ca sa limitam memoria
+    group_size = max(1, MAX_BATCH_CELLS // (SIMULATIONS_PER_CHUNK * max(1, model.num_nodes)))
+    columns = []
+    for chunk in range(first_chunk, first_chunk + num_chunks):
+        live_graph = live_arc_graph(model, SIMULATIONS_PER_CHUNK, stream_generator(seed, SIMULATION_STREAM, chunk))
+        columns.append(np.vstack([
+            live_edge_spreads(live_graph, model.num_nodes, SIMULATIONS_PER_CHUNK, seed_indices[g:g + group_size], max_steps)
+            for g in range(0, len(seed_indices), group_size)
+        ]))
+    return np.hstack(columns)
+
+def interval(samples, z):
+    """Media, deviatia standard si capetele intervalului de incredere"""
+    mean = float(samples.mean())
+    if len(samples) < 2:
+        return mean, 0.0, mean, mean
+    std = float(samples.std(ddof=1))
+    half_width = z * std / np.sqrt(len(samples))
+    return mean, std, float(mean - half_width), float(mean + half_width)
+
+def evaluate_seed_sets(model, seed_sets, num_simulations=1000, max_steps=None, seed=None,
+                       confidence=0.95, relative_error=None):
+    """Spread-ul asteptat al fiecarui seed set, cu interval de incredere normal.
+
+    Toate seturile folosesc aceleasi simulari, asa ca diferenta fata de cel mai bun set
+    e estimata pe perechi si are un interval mult mai strans decat al fiecarui set. Cu
+    relative_error simularile ruleaza in runde care se dubleaza si se opresc cand fiecare
+    interval e sub relative_error * spread, fara sa depaseasca num_simulations."""
+    seed = resolve_seed({"randomSeed": seed})
+    deterministic = hasattr(model, 'thresholds')
+    z = float(norm.ppf(0.5 + confidence / 2))
+    seed_indices = [model._seed_indices(seed_set) for seed_set in seed_sets]
+
+    if deterministic:
+        spreads = threshold_spreads(model, seed_indices, max_steps)
+    else:
+        max_chunks = max(1, -(-int(num_simulations) // SIMULATIONS_PER_CHUNK))
+        done = max_chunks if relative_error is None else 1
+        spreads = cascade_spreads(model, seed_indices, seed, 0, done, max_steps)
+        while done < max_chunks:
+            half_widths = z * spreads.std(axis=1, ddof=1) / np.sqrt(spreads.shape[1])
+            if (half_widths <= relative_error * np.maximum(spreads.mean(axis=1), 1)).all():
+                break
+            extra = min(done, max_chunks - done)
+            spreads = np.hstack([spreads, cascade_spreads(model, seed_indices, seed, done, extra, max_steps)])
+            done += extra
+
+    spreads = spreads.astype(np.float64)
+    means = spreads.mean(axis=1)
+    best = int(np.argmax(means))
+    estimates = []
+    for i, seed_set in enumerate(seed_sets):
+        mean, std, low, high = interval(spreads[i], z)
+        _, _, diff_low, diff_high = interval(spreads[i] - spreads[best], z)
+        estimates.append({
+            "seed_set_size": int(len(seed_indices[i])),
+            "unknown_nodes": int(len(set(seed_set)) - len(seed_indices[i])),
+            "spread": mean,
+            "std": std,
+            "ci_low": low,
+            "ci_high": high,
+            "difference_to_best": {
+                "mean": float(means[i] - means[best]),
+                "ci_low": diff_low,
+                "ci_high": diff_high
+            }
+        })
+
+    return {
+        "random_seed": seed,
+        "num_simulations": int(spreads.shape[1]),
+        "max_steps": max_steps,
+        "confidence": confidence,
+        "deterministic": deterministic,
+        "best": best,
+        "estimates": estimates
+    }
@@ -0,0 +1,88 @@
+import os
+import sys
+import uuid
+
+import networkx as nx
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'algorithms')))
+
+import checkpoint
+import celf as celf_module
+import classic_greedy
+from propagation_models import IndependentCascadeModel
+
+CRASH_AFTER_STAGE = 3
+
+class Crash(Exception):
+    pass
+
+@pytest.fixture
+def graph():
+    G = nx.barabasi_albert_graph(150, 2, seed=7)
+    nodes, edges = list(G.nodes()), list(G.edges())
+    model = IndependentCascadeModel(nodes, edges, propagation_probability=0.1, seed=7)
+    model._model_id = uuid.uuid4().hex
+    return nodes, edges, model
+
+@pytest.fixture(autouse=True)
+def isolated_checkpoints(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint, 'CHECKPOINT_DIR', str(tmp_path))
+    celf_module.mc_cache.clear()
+    classic_greedy.monte_carlo_cache.clear()
+
+def crash_after(monkeypatch, completed_stages):
+    """Opreste rularea imediat dupa checkpoint-ul scris la finalul etapei date"""
+    original_save = checkpoint.CheckpointTimer.save
+
+    def save(self, state):
+        original_save(self, state)
+        if len(state.get("stages", [])) == completed_stages:
+            raise Crash()
+    monkeypatch.setattr(checkpoint.CheckpointTimer, 'save', save)
+
+def stage_outcomes(stages):
+    return [(stage["selected_nodes"], sorted(stage["propagated_nodes"]), stage["total_activated"]) for stage in stages]
+
+def run_crashed_then_resumed(monkeypatch, run, params):
+    with monkeypatch.context() as patch:
+        crash_after(patch, CRASH_AFTER_STAGE)
+        with pytest.raises(Crash):
+            run({**params, 'resume': False})
+    return run(params)
+
+def test_celf_resume_matches_uninterrupted_run(graph, monkeypatch):
+    nodes, edges, model = graph
+    params = {
+        'seedSize': 6, 'numSimulations': 20, 'randomSeed': 3, 'numProcesses': 1,
+        'warmStart': False, 'checkpointInterval': 0
+    }
+    run = lambda run_params: celf_module.celf(nodes, edges, model, run_params)
+
+    clean = run({**params, 'checkpoint': False})
+    celf_module.mc_cache.clear()
+    resumed = run_crashed_then_resumed(monkeypatch, run, params)
+
+    assert stage_outcomes(resumed) == stage_outcomes(clean)
+
+def test_greedy_resume_matches_uninterrupted_run(graph, monkeypatch):
+    nodes, edges, model = graph
+    run_ids = [f'test_{uuid.uuid4().hex}' for _ in range(2)]
+    params = {
+        'seedSize': 6, 'numSimulations': 10, 'randomSeed': 3, 'numProcesses': 1, 'checkpointInterval': 0
+    }
+    run = lambda run_params: classic_greedy.greedy_influence_maximization(nodes, edges, model, run_params)
+
+    try:
+        clean = run({**params, 'runId': run_ids[0], 'checkpoint': False})
+        classic_greedy.monte_carlo_cache.clear()
+        resumed = run_crashed_then_resumed(monkeypatch, run, {**params, 'runId': run_ids[1]})
+    finally:
+        for run_id in run_ids:
+            classic_greedy.previous_seed_sets.pop(run_id, None)
+            seed_cache_file = os.path.join(os.path.dirname(classic_greedy.__file__), 'seed_cache', f'{run_id}_seed_sets.json')
+            if os.path.exists(seed_cache_file):
+                os.unlink(seed_cache_file)
+
+    assert stage_outcomes(resumed) == stage_outcomes(clean)
@@ -0,0 +1,44 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from graph_lod import reduce_structure, stage_nodes
+
+def path_structure(num_nodes):
+    """Un lant 0-1-...-n, cu nodurile mai mici considerate mai importante"""
+    return {
+        "nodes": pd.Index(range(num_nodes)),
+        "source": np.arange(num_nodes - 1, dtype=np.int64),
+        "target": np.arange(1, num_nodes, dtype=np.int64),
+        "rank": np.arange(num_nodes, dtype=np.int64)
+    }
+
+def test_forced_nodes_are_capped_to_the_node_budget():
+    structure = path_structure(100)
+    forced = np.arange(99, 39, -1)  # 60 de noduri fortate, primele activate sunt la coada lantului
+
+    reduced = reduce_structure(structure, forced, max_nodes=20, max_edges=100)
+
+    assert len(reduced["node_index"]) == 20
+    assert set(reduced["node_index"]) == set(forced[:20])
+    assert reduced["lod"]["dropped_forced_nodes"] == 40
+
+def test_forced_nodes_within_budget_are_all_kept():
+    structure = path_structure(100)
+    forced = np.array([90, 70, 50])
+
+    reduced = reduce_structure(structure, forced, max_nodes=10, max_edges=100)
+
+    assert len(reduced["node_index"]) == 10
+    assert set(forced) <= set(reduced["node_index"])
+    assert reduced["lod"]["dropped_forced_nodes"] == 0
+
+def test_stage_nodes_follow_activation_order():
+    first = [{"selected_nodes": [5], "propagated_nodes": [7, 8]}, {"selected_nodes": [1], "propagated_nodes": [8, 2]}]
+    second = [{"selected_nodes": [9], "propagated_nodes": [5]}]
+
+    assert stage_nodes(first, second) == [5, 7, 8, 9, 1, 2]
@@ -7,6 +7,8 @@ import '../css/Main.css';
 import StatisticsComparison from './StatisticsComparison';
 import { BarChartOutlined, LineChartOutlined } from '@ant-design/icons';
 import InfluenceSpreadChart from './InfluenceSpreadChart';
+import expandCompactResponse from '../utils/compactResponse';
+import mergeGraphViews from '../utils/graphViews';
 
 
 const Main = () => {
@@ -20,6 +22,31 @@ const Main = () => {
   const [isShowingSavedRun, setIsShowingSavedRun] = useState(false);
 
 
+  // toate seed set-urile rularii sunt evaluate impreuna, pe aceleasi simulari
+  const attachSpreadEstimates = async (selectedDataset, selectedModel, parameters, responses) => {
+    const successful = Object.entries(responses).flatMap(([algorithm, data]) =>
+      data.results.filter(result => result.status === 'success').map(result => ({ algorithm, result }))
+    );
+    if (successful.length === 0) return;
+
+    try {
+      const response = await axios.post("http://localhost:5000/evaluate", {
+        dataset: selectedDataset,
+        model: selectedModel,
+        propagationProbability: parameters.propagationProbability,
+        probabilityModel: parameters.probabilityModel,
+        seedSets: successful.map(({ result }) => result.metrics.seed_nodes),
+        numSimulations: 1000
+      });
+      response.data.estimates.forEach((estimate, i) => {
+        successful[i].result.evaluation = estimate;
+      });
+    } catch (error) {
+      // tabelul ramane cu spread-ul raportat de algoritm
+      console.error("Error evaluating seed sets:", error.response?.data || error.message);
+    }
+  };
+
   const handleSubmit = async (selectedDataset, selectedModel, selectedAlgorithms, parameters) => {
     setGraphData(null);
     setError(null);
@@ -34,17 +61,22 @@ const Main = () => {
           model: selectedModel,
           algorithm: algorithm,
           propagationProbability: parameters.propagationProbability,
-          parameters: parameters[algorithm] || {}
+          probabilityModel: parameters.probabilityModel,
+          parameters: parameters[algorithm] || {},
+          compact: true,
+          view: 'lod'
         });
   
-        console.log(`Algorithm: ${algorithm}`, response.data);
+        const data = expandCompactResponse(response.data);
+        console.log(`Algorithm: ${algorithm}`, data);
   
-        responses[algorithm] = response.data;
+        responses[algorithm] = data;
       }
       
+      await attachSpreadEstimates(selectedDataset, selectedModel, parameters, responses);
+
       setGraphData({
-        nodes: responses[selectedAlgorithms[0]].nodes,
-        edges: responses[selectedAlgorithms[0]].edges,
+        ...mergeGraphViews(selectedAlgorithms.map(algorithm => responses[algorithm])),
         algorithm_results: responses
       });
   
@@ -5,6 +5,7 @@ import  {SavedRunAnimator} from './SavedRunAnimator';
 import axios from 'axios';
 import "../css/PreviewComponent.css";
 import networkLabels from '../utils/networkLabels';
+import applyPositions from '../utils/graphLayout';
 
 const PreviewComponent = ({ graphData, isLoading, selectedAlgorithms,isShowingSavedRun,setIsShowingSavedRun }) => {
   const graphRef = useRef();
@@ -35,6 +36,7 @@ const PreviewComponent = ({ graphData, isLoading, selectedAlgorithms,isShowingSa
   const [savedRuns, setSavedRuns] = useState([]);
   const [processedGraphData, setProcessedGraphData] = useState({ nodes: [], links: [] });
   const [originalGraphData, setOriginalGraphData] = useState({ nodes: [], links: [] });
+  const [hasPresetLayout, setHasPresetLayout] = useState(false);
   const [currentSavedRunData, setCurrentSavedRunData] = useState(null);
   const [showModal, setShowModal] = useState(false);
   const [filterNetwork, setFilterNetwork] = useState("");
@@ -65,9 +67,12 @@ const PreviewComponent = ({ graphData, isLoading, selectedAlgorithms,isShowingSa
   useEffect(() => {
     if (!graphData) return;
 
+    // in vederea redusa un nod mai mare tine locul vecinilor ascunsi
+    const absorbed = graphData.lod?.absorbed;
     const formatted = {
-      nodes: graphData.nodes.map((id) => ({
+      nodes: graphData.nodes.map((id, i) => ({
         id,
+        val: absorbed ? 1 + Math.log2(1 + absorbed[i]) : 1,
         color: "#4682B4",
         __highlighted: false,
         __algorithm: null
@@ -75,6 +80,7 @@ const PreviewComponent = ({ graphData, isLoading, selectedAlgorithms,isShowingSa
       links: graphData.edges.map(([source, target]) => ({ source, target }))
     };
 
+    setHasPresetLayout(applyPositions(formatted.nodes, graphData.positions));
     setOriginalGraphData(formatted);
     setProcessedGraphData(formatted);
     graphDataRef.current = formatted;
@@ -117,10 +123,12 @@ const PreviewComponent = ({ graphData, isLoading, selectedAlgorithms,isShowingSa
       const response = await axios.get(`http://localhost:5000/saved-runs/${runId}`);
       const data = response.data;
 
-      if (!data || !data.stages || !data.seed_nodes || !data.algorithm || !data.graph_data) {
+      if (!data || !data.stages || !data.seed_nodes || !data.algorithm || !data.network_name) {
         throw new Error('Incomplete saved run data structure');
       }
 
+      const graph = await savedRunAnimator.current.fetchGraph(data.network_name);
+
       const stages = typeof data.stages === 'string' ? JSON.parse(data.stages) : data.stages;
       const seedNodes = typeof data.seed_nodes === 'string' ? JSON.parse(data.seed_nodes) : data.seed_nodes;
 
@@ -128,14 +136,15 @@ const PreviewComponent = ({ graphData, isLoading, selectedAlgorithms,isShowingSa
       const uniqueSeedNodes = [...new Set(seedNodes)];
 
       const formattedGraphData = {
-        nodes: data.graph_data.nodes.map(id => ({
+        nodes: graph.nodes.map(id => ({
           id,
           color: "#4682B4",
           __highlighted: false,
           __algorithm: null
         })),
-        links: data.graph_data.edges.map(([source, target]) => ({ source, target }))
+        links: graph.edges.map(([source, target]) => ({ source, target }))
       };
+      setHasPresetLayout(applyPositions(formattedGraphData.nodes, graph.positions));
       
       graphDataRef.current = formattedGraphData;
       setProcessedGraphData(formattedGraphData);
@@ -188,6 +197,7 @@ const PreviewComponent = ({ graphData, isLoading, selectedAlgorithms,isShowingSa
         })),
         links: [...originalGraphData.links]
       };
+      setHasPresetLayout(applyPositions(restoredData.nodes, graphData?.positions));
       
       graphDataRef.current = restoredData;
       setProcessedGraphData(restoredData);
@@ -360,6 +370,8 @@ const PreviewComponent = ({ graphData, isLoading, selectedAlgorithms,isShowingSa
               enableNodeDrag={false}
               enableNavigationControls={true}
               showNavInfo={false}
+              // cu pozitiile venite de la server nu mai rulam simularea de forte
+              cooldownTicks={hasPresetLayout ? 0 : Infinity}
 
               onEngineStop={() => {
                 const count = ++engineStoppedCountRef.current;
@@ -4,8 +4,39 @@ export class SavedRunAnimator extends AnimationController {
   constructor(graphRef, graphDataRef, stateSetters) {
     super(graphRef, graphDataRef);
     this.stateSetters = stateSetters;
+    this.graphCache = new Map(); // retea -> { etag, graph }
   }
 
+  // graful retelei e cerut o singura data; la rulari ulterioare doar il revalidam prin ETag
+  fetchGraph = async (networkName) => {
+    const cached = this.graphCache.get(networkName);
+    const response = await fetch(
+      `http://localhost:5000/graph-payload/${encodeURIComponent(networkName)}`,
+      {
+        cache: 'no-store',
+        headers: cached ? { 'If-None-Match': cached.etag } : {}
+      }
+    );
+
+    if (response.status === 304 && cached) {
+      return cached.graph;
+    }
+    if (!response.ok) {
+      throw new Error(`Error fetching graph for ${networkName}`);
+    }
+
+    const payload = await response.json();
+    // muchiile vin ca perechi de indici intr-o lista plata
+    const edges = [];
+    for (let i = 0; i < payload.edges.length; i += 2) {
+      edges.push([payload.nodes[payload.edges[i]], payload.nodes[payload.edges[i + 1]]]);
+    }
+    const graph = { nodes: payload.nodes, edges, positions: payload.positions };
+
+    this.graphCache.set(networkName, { etag: response.headers.get('ETag'), graph });
+    return graph;
+  };
+
   clearAnimationData = () => {
     this.stateSetters.setHighlightedNodes(new Set());
     this.stateSetters.setCurrentStage(null);
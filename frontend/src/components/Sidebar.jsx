@@ -29,6 +29,9 @@ const [datasets] = useState([
     { value: 'degree_heuristic', label: 'Degree Heuristic' },
     { value: 'centrality_heuristic', label: 'Centrality Heuristic' },
     { value: 'celf', label: 'CELF' },
+    { value: 'community_celf', label: 'Community CELF' },
+    { value: 'sketch_im', label: 'Sketch IM (SKIM)' },
+    { value: 'stop_and_stare', label: 'Stop-and-Stare (D-SSA)' },
   ]);
 
   const algorithmParameters = {
@@ -46,9 +49,21 @@ const [datasets] = useState([
     ],
     celf: [
       { name: "seedSize", label: "Number of Seeds", type: "checkbox-group", options: [3, 5, 10, 15, 20] }
+    ],
+    community_celf: [
+      { name: "seedSize", label: "Number of Seeds", type: "checkbox-group", options: [3, 5, 10, 15, 20] }
+    ],
+    sketch_im: [
+      { name: "seedSize", label: "Number of Seeds", type: "checkbox-group", options: [3, 5, 10, 15, 20] }
+    ],
+    stop_and_stare: [
+      { name: "seedSize", label: "Number of Seeds", type: "checkbox-group", options: [3, 5, 10, 15, 20] }
     ]
   };
 
+// algoritmii care esantioneaza LT prin varianta live-edge, nu prin pragurile fixe ale modelului
+const LIVE_EDGE_ALGORITHMS = ['sketch_im', 'stop_and_stare'];
+
 const modelParams = {
   independent_cascade: [
     {
@@ -59,6 +74,18 @@ const modelParams = {
       max: 1,
       step: 0.01,
       default: 0.1
+    },
+    {
+      name: "probabilityModel",
+      label: "Edge Probabilities",
+      type: "select",
+      options: [
+        { value: "uniform", label: "Uniform" },
+        { value: "weighted_cascade", label: "Weighted Cascade (1/in-degree)" },
+        { value: "trivalency", label: "Trivalency (0.1, 0.01, 0.001)" },
+        { value: "edge_weight", label: "Edge Weights (from dataset)" }
+      ],
+      default: "uniform"
     }
   ]
 };
@@ -201,19 +228,37 @@ const handleSubmit = (e) => {
             {modelParams[selectedModel]?.map(param => (
               <div key={param.name} className="param-control">
                 <label>{param.label}:</label>
-                <input
-                  type={param.type}
-                  value={modelParameters[param.name] ?? param.default}
-                  min={param.min}
-                  max={param.max}
-                  step={param.step}
-                  onChange={(e) => 
-                    setModelParameters(prev => ({
-                      ...prev,
-                      [param.name]: Number(e.target.value)
-                    }))
-                  }
-                />
+                {param.type === "select" ? (
+                  <select
+                    value={modelParameters[param.name] ?? param.default}
+                    onChange={(e) =>
+                      setModelParameters(prev => ({
+                        ...prev,
+                        [param.name]: e.target.value
+                      }))
+                    }
+                  >
+                    {param.options.map(option => (
+                      <option key={option.value} value={option.value}>
+                        {option.label}
+                      </option>
+                    ))}
+                  </select>
+                ) : (
+                  <input
+                    type={param.type}
+                    value={modelParameters[param.name] ?? param.default}
+                    min={param.min}
+                    max={param.max}
+                    step={param.step}
+                    onChange={(e) => 
+                      setModelParameters(prev => ({
+                        ...prev,
+                        [param.name]: Number(e.target.value)
+                      }))
+                    }
+                  />
+                )}
               </div>
             ))}
           </div>
@@ -242,6 +287,13 @@ const handleSubmit = (e) => {
             {selectedAlgorithms.map(algorithm => (
               <div key={algorithm} className="algorithm-params">
                 <h4>{algorithms.find(a => a.value === algorithm)?.label}</h4>
+                {selectedModel === "linear_threshold" && LIVE_EDGE_ALGORITHMS.includes(algorithm) && (
+                  <p className="model-note">
+                    Selects seeds on the live-edge LT model (uniform [0, 1] thresholds redrawn
+                    every cascade), not on the fixed thresholds of this LT model. The reported
+                    spread is still simulated with the fixed thresholds.
+                  </p>
+                )}
                 {algorithmParameters[algorithm]?.map(param => (
                   <div key={`${algorithm}-${param.name}`} className="param-control">
                     <label>{param.label}:</label>
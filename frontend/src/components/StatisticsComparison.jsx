@@ -54,6 +54,16 @@ const columns = [
     ),
     sorter: (a, b) => a.metrics.spread - b.metrics.spread,
   },
+  {
+    title: 'Expected spread (95% CI)',
+    key: 'expectedSpread',
+    render: (_, record) => record.evaluation ? (
+      <Tooltip title={`${record.evaluation.ci_low.toFixed(1)} – ${record.evaluation.ci_high.toFixed(1)}`}>
+        {record.evaluation.spread.toFixed(1)} ± {((record.evaluation.ci_high - record.evaluation.ci_low) / 2).toFixed(1)}
+      </Tooltip>
+    ) : '—',
+    sorter: (a, b) => (a.evaluation?.spread ?? -1) - (b.evaluation?.spread ?? -1),
+  },
   {
     title: 'Runtime (ms)',
     key: 'runtime',
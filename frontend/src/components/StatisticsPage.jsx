@@ -57,107 +57,117 @@ const getAlgorithmColor = (algorithm) => {
     };
 
 
+const API_URL = 'http://127.0.0.1:5000';
+const RUNS_PAGE_SIZE = 50;
+
+// media ponderata cu numarul de rulari din fiecare grup
+const weightedMean = (groups, field) => {
+  const totalRuns = _.sumBy(groups, 'runs');
+  return totalRuns ? _.sumBy(groups, group => group.runs * (group[field] || 0)) / totalRuns : 0;
+};
+
+const filterQuery = (network, algorithm) => {
+  const params = new URLSearchParams();
+  if (network !== 'all') params.set('network', network);
+  if (algorithm !== 'all') params.set('algorithm', algorithm);
+  return params;
+};
+
 const StatisticsPage = () => {
-  const [algorithmRuns, setAlgorithmRuns] = useState([]);
+  const [aggregates, setAggregates] = useState([]);
   const [networks, setNetworks] = useState([]);
-  const [networkStats, setNetworkStats] = useState([]);
   const [loading, setLoading] = useState(true);
   const [selectedTab, setSelectedTab] = useState('coverage');
   const [selectedNetwork, setSelectedNetwork] = useState('all');
   const [selectedAlgorithm, setSelectedAlgorithm] = useState('all');
   const [modelComparisonMode, setModelComparisonMode] = useState('coverage'); // 'coverage' or 'runtime'
+  const [runs, setRuns] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingRuns, setLoadingRuns] = useState(false);
 
   useEffect(() => {
-    const fetchStats = async () => {
+    const fetchAggregates = async () => {
       try {
-        const response = await fetch('http://127.0.0.1:5000/statistics');
+        const response = await fetch(`${API_URL}/statistics/aggregates`);
         if (!response.ok) throw new Error('Error fetching statistics');
 
         const data = await response.json();
-        console.log("Fetched data:", data);
-        
-        if (!data.stats || data.stats.length === 0) {
+        if (!data.aggregates || data.aggregates.length === 0) {
           console.error("No statistics data available");
           setLoading(false);
           return;
         }
-        
-        setAlgorithmRuns(data.stats);
-        setNetworks([...new Set(data.stats.map(stat => stat.network_name))]);
-        
-        const networkStatsMap = {};
-        data.stats.forEach(stat => {
-          if (stat.network_name && !networkStatsMap[stat.network_name]) {
-            networkStatsMap[stat.network_name] = {
-              name: stat.network_name,
-              num_nodes: stat.num_nodes,
-              num_edges: stat.num_edges,
-              average_degree: stat.average_degree,
-              clustering_coeff: stat.clustering_coeff
-            };
-          }
-        });
-        
-        setNetworkStats(Object.values(networkStatsMap));
+
+        setAggregates(data.aggregates);
+        setNetworks(_.uniq(data.aggregates.map(group => group.network_name)));
         setLoading(false);
       } catch (error) {
-        console.error("Error in fetchStats:", error);
+        console.error("Error in fetchAggregates:", error);
         setLoading(false);
       }
     };
 
-    fetchStats();
+    fetchAggregates();
   }, []);
 
-// grupam simularile in functie de model ic(pe fiecare prob) si lt
-const processRunsWithCoverage = () => {
-  const maxSpread = Math.max(...algorithmRuns.map(run => run.spread || 0));
-  const maxRuntime = Math.max(...algorithmRuns.map(run => run.runtime || 1));
-
-  const uniqueModels = [...new Set(algorithmRuns.map(run => run.diffusion_model))];
-  console.log("All diffusion models in data:", uniqueModels);
-
-  return algorithmRuns.map(run => {
-    let avgPropagationProb = null;
+  // rularile individuale se incarca pe pagini, doar pentru tabel
+  const fetchRuns = async (cursor, reset) => {
+    setLoadingRuns(true);
     try {
-      let modelParams = run.model_params || '{}';
-      
-      // parsam parametrii modelelor de 2 ori
-      if (typeof modelParams === 'string' && modelParams.startsWith('"')) {
-        modelParams = JSON.parse(modelParams);
-      }
-      
-      const params = JSON.parse(modelParams);
-      
-      if (run.diffusion_model === 'IndependentCascadeModel' && params.probabilities) {
-        const probs = Object.values(params.probabilities);
-        if (probs.length > 0) {
-          avgPropagationProb = probs.reduce((a, b) => a + b, 0) / probs.length;
-          const probLabel = avgPropagationProb.toFixed(3);
-          run.diffusion_model = `IndependentCascadeModel (p=${probLabel})`;
-          console.log(`IC Model - avgPropagationProb: ${avgPropagationProb}`);
-        }
-       }
-   
-    } catch (err) {
-      console.warn(`Error parsing model_params for run ${run.id} (${run.diffusion_model}):`, err);
-      console.warn("model_params value:", run.model_params);
+      const params = filterQuery(selectedNetwork, selectedAlgorithm);
+      params.set('limit', RUNS_PAGE_SIZE);
+      if (cursor) params.set('cursor', cursor);
+
+      const response = await fetch(`${API_URL}/statistics?${params}`);
+      if (!response.ok) throw new Error('Error fetching runs');
+
+      const data = await response.json();
+      setRuns(previous => reset ? data.stats : [...previous, ...data.stats]);
+      setNextCursor(data.next_cursor);
+    } catch (error) {
+      console.error("Error in fetchRuns:", error);
     }
+    setLoadingRuns(false);
+  };
 
-    const totalNodes = run.num_nodes || 1;
-    const coverage = (run.spread / totalNodes) * 100;
-
-    const spreadNorm = (run.spread || 0) / maxSpread;
-    const runtimeNorm = (run.runtime || 1) / maxRuntime;
+  useEffect(() => {
+    fetchRuns(null, true);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [selectedNetwork, selectedAlgorithm]);
+
+// un grup = (algoritm, retea, seed_size, model, probabilitate IC), cu mediile calculate pe server
+const processAggregates = () => {
+  const maxSpread = Math.max(...aggregates.map(group => group.spread?.mean || 0));
+  const maxRuntime = Math.max(...aggregates.map(group => group.runtime?.mean || 1));
+
+  return aggregates.map(group => {
+    const avgPropagationProb = group.propagation_probability;
+    const isIC = group.diffusion_model === 'IndependentCascadeModel';
+    const diffusion_model = isIC && avgPropagationProb !== null
+      ? `IndependentCascadeModel (p=${avgPropagationProb.toFixed(3)})`
+      : group.diffusion_model;
+
+    const spread = group.spread?.mean || 0;
+    const runtime = group.runtime?.mean || 0;
+    const totalNodes = group.num_nodes || 1;
+    const coverage = (spread / totalNodes) * 100;
+    const coverageStd = ((group.spread?.std || 0) / totalNodes) * 100;
+
+    const spreadNorm = spread / maxSpread;
+    const runtimeNorm = (runtime || 1) / maxRuntime;
 
     const alpha = 2;
     const beta = 0.1;
     const enhancedEfficiency = Math.pow(spreadNorm, alpha) / Math.pow(runtimeNorm, beta);
 
     return {
-      ...run,
+      ...group,
+      diffusion_model,
+      spread,
+      runtime,
       totalNodes,
       coverage,
+      coverageStd,
       efficiency: enhancedEfficiency,
       avgPropagationProb
     };
@@ -165,11 +175,11 @@ const processRunsWithCoverage = () => {
 };
 
 
-  const processedRuns = processRunsWithCoverage();
+  const processedGroups = processAggregates();
   
-  const filteredRuns = processedRuns.filter(run => {
-    const networkMatch = selectedNetwork === 'all' || run.network_name === selectedNetwork;
-    const algorithmMatch = selectedAlgorithm === 'all' || run.algorithm === selectedAlgorithm;
+  const filteredRuns = processedGroups.filter(group => {
+    const networkMatch = selectedNetwork === 'all' || group.network_name === selectedNetwork;
+    const algorithmMatch = selectedAlgorithm === 'all' || group.algorithm === selectedAlgorithm;
     return networkMatch && algorithmMatch;
   });
 
@@ -184,7 +194,7 @@ const tabCharts = {
       labels: uniqueAlgorithms,
       datasets: [{
         label: 'Coverage (%)',
-        data: _.map(_.groupBy(filteredRuns, 'algorithm'), runs => _.meanBy(runs, 'coverage')),
+        data: _.map(_.groupBy(filteredRuns, 'algorithm'), groups => weightedMean(groups, 'coverage')),
         backgroundColor: uniqueAlgorithms.map(algo => getAlgorithmColor(algo)),
         borderColor: uniqueAlgorithms.map(algo => getAlgorithmColor(algo)),
         borderWidth: 1
@@ -220,7 +230,7 @@ const tabCharts = {
       labels: uniqueAlgorithms,
       datasets: [{
         label: 'Efficiency',
-        data: _.map(_.groupBy(filteredRuns, 'algorithm'), runs => _.meanBy(runs, 'efficiency')),
+        data: _.map(_.groupBy(filteredRuns, 'algorithm'), groups => weightedMean(groups, 'efficiency')),
         backgroundColor: uniqueAlgorithms.map(algo => getAlgorithmColor(algo)),
         borderColor: uniqueAlgorithms.map(algo => getAlgorithmColor(algo)),
         borderWidth: 1
@@ -256,9 +266,6 @@ modelCoverage: {
       if (probMatch) {
         return parseFloat(probMatch[1]);
       }
-      if (run.avgPropagationProb) {
-        return Math.round(run.avgPropagationProb * 1000) / 1000;
-      }
       return 'unknown';
     });
     
@@ -289,12 +296,10 @@ modelCoverage: {
         
         // Switch between coverage and runtime data
         if (modelComparisonMode === 'coverage') {
-          data.push(_.meanBy(icByProb[prob], 'coverage') || 0);
+          data.push(weightedMean(icByProb[prob], 'coverage'));
         } else {
-          // Calculate runtime per simulation
-          const totalRuntime = _.sumBy(icByProb[prob], 'runtime') || 0;
-          const numSimulations = icByProb[prob].length || 1;
-          data.push(totalRuntime / numSimulations);
+          // runtime mediu pe rulare
+          data.push(weightedMean(icByProb[prob], 'runtime'));
         }
         
         const shadeIndex = Math.min(index, redShades.length - 1);
@@ -306,12 +311,9 @@ modelCoverage: {
     if (ltRuns.length > 0) {
       labels.push('LT');
       if (modelComparisonMode === 'coverage') {
-        data.push(_.meanBy(ltRuns, 'coverage') || 0);
+        data.push(weightedMean(ltRuns, 'coverage'));
       } else {
-        // Calculate runtime per simulation for LT
-        const totalRuntime = _.sumBy(ltRuns, 'runtime') || 0;
-        const numSimulations = ltRuns.length || 1;
-        data.push(totalRuntime / numSimulations);
+        data.push(weightedMean(ltRuns, 'runtime'));
       }
       backgroundColors.push('rgba(54, 162, 235, 0.6)');
       borderColors.push('rgba(54, 162, 235, 1)');
@@ -362,15 +364,13 @@ modelCoverage: {
                 const probMatch = label.match(/p=([0-9.]+)/);
                 if (probMatch) {
                   const prob = parseFloat(probMatch[1]);
-                  const runsForThisProb = icRuns.filter(run => {
-                    const runProbFromLabel = run.diffusion_model.match(/p=([0-9.]+)/);
-                    const runProb = runProbFromLabel ? parseFloat(runProbFromLabel[1]) : run.avgPropagationProb;
-                    return runProb && Math.abs(runProb - prob) < 1e-4;
-                  });
-                  return `Number of runs: ${runsForThisProb.length}`;
+                  const groupsForThisProb = icRuns.filter(run =>
+                    run.avgPropagationProb !== null && Math.abs(run.avgPropagationProb - prob) < 1e-4
+                  );
+                  return `Number of runs: ${_.sumBy(groupsForThisProb, 'runs')}`;
                 }
               } else if (label === 'LT') {
-                return `Number of runs: ${ltRuns.length}`;
+                return `Number of runs: ${_.sumBy(ltRuns, 'runs')}`;
               }
               return null;
             }
@@ -450,21 +450,24 @@ modelCoverage: {
         const algoRuns = filteredRuns.filter(run => run.algorithm === algo);
         const color = getAlgorithmColor(algo);
 
-          const avgCoverage = _.meanBy(algoRuns, 'coverage') / 100;
-          const avgRuntime = _.meanBy(algoRuns, 'runtime');
+          const avgCoverage = weightedMean(algoRuns, 'coverage') / 100;
+          const avgRuntime = weightedMean(algoRuns, 'runtime');
           const maxRuntime = _.max(filteredRuns.map(run => run.runtime)) || 1;
           const logAvg = Math.log(avgRuntime + 1);
           const logMax = Math.log(maxRuntime + 1);
           const runtimeEff = 1 - (logAvg / logMax);
-          const runtimePerNode = avgRuntime / _.meanBy(algoRuns, 'num_nodes');
-          const logScalability = 1 - (Math.log(runtimePerNode + 1) / Math.log(_.max(filteredRuns.map(r => r.runtime / r.num_nodes)) + 1));
-          const avgSpread = _.meanBy(algoRuns, 'spread');
-          const avgNumNodes = _.meanBy(algoRuns, 'num_nodes') || 1;
-          const maxSaturation = _.max(filteredRuns.map(run => run.spread / (run.num_nodes || 1))) || 1;
+          const runtimePerNode = avgRuntime / weightedMean(algoRuns, 'totalNodes');
+          const logScalability = 1 - (Math.log(runtimePerNode + 1) / Math.log(_.max(filteredRuns.map(r => r.runtime / r.totalNodes)) + 1));
+          const avgSpread = weightedMean(algoRuns, 'spread');
+          const avgNumNodes = weightedMean(algoRuns, 'totalNodes') || 1;
+          const maxSaturation = _.max(filteredRuns.map(run => run.spread / run.totalNodes)) || 1;
           const saturationScore = (avgSpread / avgNumNodes) / maxSaturation;
 
-          const coverageStdDev = Math.sqrt(_.sumBy(algoRuns, run => 
-                                Math.pow(run.coverage - _.meanBy(algoRuns, 'coverage'), 2)) / algoRuns.length);
+          // deviatia standard cumulata: varianta din fiecare grup plus abaterea mediei grupului
+          const meanCoverage = weightedMean(algoRuns, 'coverage');
+          const coverageStdDev = Math.sqrt(_.sumBy(algoRuns, run =>
+                                run.runs * (Math.pow(run.coverageStd, 2) + Math.pow(run.coverage - meanCoverage, 2))) /
+                                _.sumBy(algoRuns, 'runs'));
           const consistency = coverageStdDev === 0 ? 1 : 1 - (coverageStdDev / 100);
           
           const scores = [
@@ -515,7 +518,7 @@ modelCoverage: {
         <label>Algorithm:
           <select value={selectedAlgorithm} onChange={e => setSelectedAlgorithm(e.target.value)}>
             <option value="all">All</option>
-            {_.uniq(algorithmRuns.map(run => run.algorithm)).map(algo => (
+            {_.uniq(aggregates.map(group => group.algorithm)).map(algo => (
               <option key={algo} value={algo}>{algoLabels[algo]}</option>
             ))}
           </select>
@@ -677,6 +680,45 @@ modelCoverage: {
           </div>
         )}
 
+      <div className="runs-table-container">
+        <h2>Runs</h2>
+        <table className="runs-table">
+          <thead>
+            <tr>
+              <th>Date</th>
+              <th>Network</th>
+              <th>Algorithm</th>
+              <th>Model</th>
+              <th>Seed Size</th>
+              <th>Spread</th>
+              <th>Runtime</th>
+            </tr>
+          </thead>
+          <tbody>
+            {runs.map(run => (
+              <tr key={run.id}>
+                <td>{new Date(run.timestamp).toLocaleString()}</td>
+                <td>{networkLabels[run.network_name] || run.network_name}</td>
+                <td>{algoLabels[run.algorithm] || run.algorithm}</td>
+                <td>{run.diffusion_model}</td>
+                <td>{run.seed_size}</td>
+                <td>{run.spread}</td>
+                <td>{run.runtime?.toFixed(4)}</td>
+              </tr>
+            ))}
+          </tbody>
+        </table>
+        {nextCursor && (
+          <button
+            className="load-more"
+            disabled={loadingRuns}
+            onClick={() => fetchRuns(nextCursor, false)}
+          >
+            {loadingRuns ? 'Loading...' : 'Load more'}
+          </button>
+        )}
+      </div>
+
     </div>
   );
 };
@@ -0,0 +1,24 @@
+// src/utils/compactResponse.js
+// refacem forma obisnuita a raspunsului /run-algorithm din forma compacta
+const expandCompactResponse = (data) => {
+  if (!data) return data;
+
+  let edges = data.edges;
+  if (data.edges_format === 'index_pairs') {
+    edges = [];
+    for (let i = 0; i < data.edges.length; i += 2) {
+      edges.push([data.nodes[data.edges[i]], data.nodes[data.edges[i + 1]]]);
+    }
+  }
+
+  // etapele vin o singura data, in results
+  const stagesBySeed = data.stages_by_seed || Object.fromEntries(
+    (data.results || [])
+      .filter(result => result.status === 'success')
+      .map(result => [result.seed_size, result.stages])
+  );
+
+  return { ...data, edges, stages_by_seed: stagesBySeed };
+};
+
+export default expandCompactResponse;
@@ -0,0 +1,14 @@
+// src/utils/graphLayout.js
+// pozitiile precalculate de backend vin ca lista plata x, y, z in ordinea nodurilor
+const applyPositions = (nodes, positions) => {
+  if (!positions || positions.length !== nodes.length * 3) return false;
+
+  nodes.forEach((node, i) => {
+    node.x = positions[3 * i];
+    node.y = positions[3 * i + 1];
+    node.z = positions[3 * i + 2];
+  });
+  return true;
+};
+
+export default applyPositions;
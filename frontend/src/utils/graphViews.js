@@ -0,0 +1,57 @@
+// src/utils/graphViews.js
+// fiecare algoritm primeste o vedere redusa in jurul nodurilor lui; pentru desen le reunim
+const mergeGraphViews = (views) => {
+  const [first] = views;
+  if (!views.some(view => view.lod?.reduced)) {
+    return { nodes: first.nodes, edges: first.edges, positions: first.positions, lod: first.lod };
+  }
+
+  const nodeIndex = new Map();
+  const nodes = [];
+  const absorbed = [];
+  const positions = [];
+  const edgeIndex = new Map();
+  const edges = [];
+  const edgeWeights = [];
+
+  views.forEach(view => {
+    view.nodes.forEach((id, i) => {
+      const key = String(id);
+      if (!nodeIndex.has(key)) {
+        nodeIndex.set(key, nodes.length);
+        nodes.push(id);
+        absorbed.push(view.lod?.absorbed?.[i] || 0);
+        if (view.positions) positions.push(...view.positions.slice(3 * i, 3 * i + 3));
+      }
+    });
+    view.edges.forEach(([source, target], j) => {
+      const key = `${source}|${target}`;
+      // ponderea vine din vederea proprie, aliniata cu muchiile ei; la duplicate o pastram pe cea mai mare
+      const weight = view.lod?.edge_weights?.[j] || 1;
+      if (!edgeIndex.has(key)) {
+        edgeIndex.set(key, edges.length);
+        edges.push([source, target]);
+        edgeWeights.push(weight);
+      } else {
+        const index = edgeIndex.get(key);
+        edgeWeights[index] = Math.max(edgeWeights[index], weight);
+      }
+    });
+  });
+
+  return {
+    nodes,
+    edges,
+    positions: positions.length === nodes.length * 3 ? positions : undefined,
+    lod: {
+      ...first.lod,
+      reduced: true,
+      shown_nodes: nodes.length,
+      shown_edges: edges.length,
+      absorbed,
+      edge_weights: edgeWeights
+    }
+  };
+};
+
+export default mergeGraphViews;